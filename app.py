@@ -1,16 +1,21 @@
+import hmac
 import os
 from datetime import datetime
+from functools import lru_cache
+from importlib.util import find_spec
 
 import streamlit as st
 
+from modules.ai import BACKENDS as AI_BACKENDS, DEFAULT_MODEL, get_assistant
 from modules.database import get_database
+from modules.instrumentation import enable_instrumentation
 from modules.config import get_config
 
-# Optional AI
-try:
-    import anthropic  # type: ignore
-except Exception:
-    anthropic = None
+
+# Optional AI: το anthropic (~1.5s import) φορτώνεται μόνο στην πρώτη ερώτηση
+@lru_cache(maxsize=1)
+def anthropic_available() -> bool:
+    return find_spec("anthropic") is not None
 
 
 # ======================
@@ -35,45 +40,38 @@ def sget(path: str, default=None):
         return env_val if env_val is not None else default
 
 
+def ai_backend() -> str:
+    return str(sget("AI.BACKEND", "anthropic")).strip().lower()
+
+
 def ai_enabled() -> bool:
-    return anthropic is not None and bool(sget("AI.ANTHROPIC_API_KEY"))
+    backend = ai_backend()
+    if backend not in AI_BACKENDS:
+        return False  # λάθος τιμή στα secrets: AI ανενεργό, όχι crash
+    if backend == "stub":
+        return True
+    return anthropic_available() and bool(sget("AI.ANTHROPIC_API_KEY"))
 
 
 def email_enabled() -> bool:
     return bool(sget("EMAIL.ENABLED", False)) and bool(sget("EMAIL.SMTP_HOST"))
 
 
-def call_ai(prompt: str) -> str:
+def ai_stream(prompt: str):
+    """Κομμάτια απάντησης για st.write_stream (κοινός client + cache, modules/ai.py)"""
+    if ai_backend() not in AI_BACKENDS:
+        yield f"Άγνωστο AI.BACKEND '{ai_backend()}' (επιτρέπονται: {', '.join(AI_BACKENDS)})."
+        return
     if not ai_enabled():
-        return "AI δεν είναι ενεργό. Πρόσθεσε AI.ANTHROPIC_API_KEY στα Streamlit Secrets."
-    if anthropic is None:
-        return "Λείπει το package 'anthropic' από requirements.txt."
-
-    api_key = sget("AI.ANTHROPIC_API_KEY")
-    model = sget("AI.MODEL", "claude-3-5-sonnet-latest")
-
-    client = anthropic.Anthropic(api_key=api_key)
-    system = (
-        "Είσαι βοηθός για τον Γραμματέα μιας στοάς. "
-        "Απαντάς στα Ελληνικά, πρακτικά και σύντομα. "
-        "Όταν ζητούνται πρότυπα κειμένων, δίνεις έτοιμα templates."
-    )
+        yield "AI δεν είναι ενεργό. Πρόσθεσε AI.ANTHROPIC_API_KEY στα Streamlit Secrets."
+        return
 
-    try:
-        msg = client.messages.create(
-            model=model,
-            max_tokens=700,
-            system=system,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        if isinstance(msg.content, list) and msg.content:
-            for block in msg.content:
-                if getattr(block, "type", None) == "text":
-                    return block.text
-            return str(msg.content[0])
-        return str(msg)
-    except Exception as e:
-        return f"Σφάλμα AI: {e}"
+    assistant = get_assistant(
+        api_key=sget("AI.ANTHROPIC_API_KEY"),
+        model=sget("AI.MODEL", DEFAULT_MODEL),
+        backend=ai_backend(),
+    )
+    yield from assistant.stream(prompt)
 
 
 # ======================
@@ -120,7 +118,20 @@ st.markdown(
 # ======================
 # INIT DATA
 # ======================
+# Κρυφή σελίδα diagnostics (εκτός πλοήγησης): /?diagnostics=<DIAGNOSTICS.TOKEN>
+# Οι μετρήσεις κρατούνται μόνο όταν υπάρχει token (πριν ανοίξει το pool)
+diag_token = sget("DIAGNOSTICS.TOKEN")
+if diag_token:
+    enable_instrumentation()
+
 db = get_database()
+
+if diag_token and hmac.compare_digest(str(st.query_params.get("diagnostics", "")), str(diag_token)):
+    from modules.diagnostics import render_diagnostics
+
+    render_diagnostics(db)
+    st.stop()
+
 stats = db.get_member_statistics()
 total = int(stats.get("total", 0))
 active = int(stats.get("active", 0))
@@ -179,6 +190,14 @@ with st.sidebar:
 
     with st.expander("⚙️ Ρυθμίσεις / Secrets"):
         st.write("AI key:", "✅" if ai_enabled() else "❌")
+        if ai_backend() not in AI_BACKENDS:
+            st.warning(f"Άγνωστο AI.BACKEND '{ai_backend()}' (επιτρέπονται: {', '.join(AI_BACKENDS)})")
+        if ai_enabled():
+            ai_stats = get_assistant(sget("AI.ANTHROPIC_API_KEY"), sget("AI.MODEL", DEFAULT_MODEL), ai_backend()).stats()
+            st.caption(
+                f"AI ({ai_stats['backend']}): cache {ai_stats['hits']}/{ai_stats['hits'] + ai_stats['misses']} "
+                f"hits ({ai_stats['hit_rate']:.0%}), πρώτο token ~{ai_stats['avg_first_token_ms']:.0f} ms"
+            )
         st.write("Email:", "✅" if email_enabled() else "❌")
         st.caption("Τα κλειδιά μπαίνουν στο Streamlit Cloud → Manage app → Secrets.")
 
@@ -263,8 +282,11 @@ with right:
 
     if send:
         st.session_state.ai_chat.append({"role": "user", "content": prompt.strip()})
-        with st.spinner("Σύνταξη απάντησης..."):
-            reply = call_ai(prompt.strip())
+        st.markdown(f"**Εσύ:** {prompt.strip()}")
+        st.markdown("**AI:**")
+        reply = st.write_stream(ai_stream(prompt.strip()))
+        if not isinstance(reply, str):
+            reply = "".join(str(part) for part in reply)
         st.session_state.ai_chat.append({"role": "assistant", "content": reply})
         st.rerun()
 
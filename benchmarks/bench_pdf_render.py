@@ -0,0 +1,90 @@
+"""
+Microbenchmark: κόστος ανά καρτέλα PDF με/χωρίς κοινό RenderContext
+
+    python -m benchmarks.bench_pdf_render [--cards 1000]
+
+"before": νέο RenderContext σε κάθε καρτέλα (όπως πριν: stylesheet,
+ParagraphStyles, TableStyle και header ξανά ανά κλήση).
+"after": το cached RenderContext του process.
+"""
+
+import argparse
+import io
+import time
+
+from modules.pdf_generator import RenderContext, get_render_context, render_member_card
+
+SAMPLE_MEMBER = {
+    "member_id": 1,
+    "last_name": "ΠΑΠΑΔΟΠΟΥΛΟΣ",
+    "first_name": "ΓΕΩΡΓΙΟΣ",
+    "fathers_name": "ΙΩΑΝΝΗΣ",
+    "birth_date": "1970-05-12",
+    "birth_place": "ΑΘΗΝΑ",
+    "profession": "ΜΗΧΑΝΙΚΟΣ",
+    "tax_id": "123456789",
+    "address": "ΠΑΝΕΠΙΣΤΗΜΙΟΥ 10",
+    "postal_code": "10671",
+    "city": "ΑΘΗΝΑ",
+    "mobile_phone": "6944123456",
+    "email": "g.papadopoulos@example.gr",
+    "initiation_date": "2005-03-01",
+    "current_degree": "Δάσκαλος",
+    "lodge_reg_no": "84-117",
+    "grand_lodge_reg_no": "12345",
+    "member_status": "Ενεργό",
+    "financial_status": "Ναι",
+    "notes": "Δείγμα για benchmark",
+}
+
+
+def bench(cards: int, shared: bool) -> float:
+    """Συνολικός χρόνος (sec) για `cards` καρτέλες"""
+    ctx = get_render_context()
+    fonts = (ctx.font_name, ctx.font_name_bold)
+    start = time.perf_counter()
+    for _ in range(cards):
+        render_member_card(SAMPLE_MEMBER, io.BytesIO(), ctx if shared else RenderContext(fonts=fonts))
+    return time.perf_counter() - start
+
+
+def bench_context(n: int = 1000) -> float:
+    """Κόστος (sec) για το χτίσιμο ενός RenderContext (αυτό που γλιτώνει κάθε καρτέλα)"""
+    ctx = get_render_context()
+    fonts = (ctx.font_name, ctx.font_name_bold)
+    start = time.perf_counter()
+    for _ in range(n):
+        RenderContext(fonts=fonts)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5, help="εναλλασσόμενοι γύροι before/after")
+    args = parser.parse_args()
+
+    bench(5, shared=True)  # warm-up (fonts, imports)
+
+    # Εναλλάξ γύροι ώστε θόρυβος/θερμοκρασία CPU να επηρεάζει και τα δύο εξίσου
+    per_round = max(1, args.cards // args.rounds)
+    before = after = 0.0
+    for _ in range(args.rounds):
+        before += bench(per_round, shared=False)
+        after += bench(per_round, shared=True)
+    cards = per_round * args.rounds
+
+    # Χωρίς το C extension το reportlab χρησιμοποιεί την pure-Python fp_str
+    from reportlab.lib.rl_accel import fp_str
+    accel = fp_str.__module__ != "reportlab.lib.rl_accel"
+
+    print(f"cards:   {cards}")
+    print(f"context: {bench_context() * 1000:.3f} ms/build")
+    print(f"before:  {before / cards * 1000:.2f} ms/card ({before:.1f}s)")
+    print(f"after:   {after / cards * 1000:.2f} ms/card ({after:.1f}s)")
+    print(f"saved:   {(1 - after / before) * 100:.1f}%")
+    print(f"rl_accel C extension: {'yes' if accel else 'no (pip install reportlab[accel])'}")
+
+
+if __name__ == "__main__":
+    main()
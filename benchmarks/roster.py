@@ -0,0 +1,158 @@
+"""
+Συνθετικό μητρώο για benchmarks: ρεαλιστικά ελληνικά στοιχεία σε όλες τις
+στήλες του members, ντετερμινιστικά (seed) και σε οποιοδήποτε μέγεθος
+
+    python -m benchmarks.roster bench.db --members 100000
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator
+
+from modules.database import Database
+
+LAST_NAMES = (
+    "ΠΑΠΑΔΟΠΟΥΛΟΣ", "ΓΕΩΡΓΙΟΥ", "ΙΩΑΝΝΟΥ", "ΝΙΚΟΛΑΟΥ", "ΠΑΠΑΓΕΩΡΓΙΟΥ", "ΟΙΚΟΝΟΜΟΥ",
+    "ΚΩΝΣΤΑΝΤΙΝΙΔΗΣ", "ΒΑΣΙΛΕΙΟΥ", "ΔΗΜΗΤΡΙΟΥ", "ΑΘΑΝΑΣΙΟΥ", "ΧΡΙΣΤΟΔΟΥΛΟΥ", "ΜΑΚΡΗΣ",
+    "ΑΛΕΞΙΟΥ", "ΠΑΠΑΝΙΚΟΛΑΟΥ", "ΚΑΡΑΓΙΑΝΝΗΣ", "ΣΤΑΥΡΟΠΟΥΛΟΣ", "ΑΝΤΩΝΙΟΥ", "ΜΙΧΑΗΛΙΔΗΣ",
+    "ΘΕΟΔΩΡΟΥ", "ΠΕΤΡΟΠΟΥΛΟΣ", "ΚΟΥΤΣΟΥΚΟΣ", "ΤΣΑΚΙΡΗΣ", "ΑΝΑΣΤΑΣΙΟΥ", "ΜΑΥΡΙΔΗΣ",
+    "ΣΑΡΡΗΣ", "ΛΑΜΠΡΟΠΟΥΛΟΣ", "ΖΑΧΑΡΙΟΥ", "ΠΑΝΑΓΙΩΤΟΠΟΥΛΟΣ", "ΧΑΤΖΗΔΑΚΗΣ", "ΜΠΟΥΡΑΣ",
+    "ΦΩΤΟΠΟΥΛΟΣ", "ΣΠΥΡΟΠΟΥΛΟΣ", "ΚΑΛΟΓΕΡΟΠΟΥΛΟΣ", "ΔΡΟΣΟΣ", "ΡΑΛΛΗΣ", "ΒΛΑΧΟΣ",
+)
+FIRST_NAMES = (
+    "ΓΕΩΡΓΙΟΣ", "ΙΩΑΝΝΗΣ", "ΚΩΝΣΤΑΝΤΙΝΟΣ", "ΔΗΜΗΤΡΙΟΣ", "ΝΙΚΟΛΑΟΣ", "ΠΑΝΑΓΙΩΤΗΣ",
+    "ΒΑΣΙΛΕΙΟΣ", "ΧΡΗΣΤΟΣ", "ΑΘΑΝΑΣΙΟΣ", "ΜΙΧΑΗΛ", "ΕΥΑΓΓΕΛΟΣ", "ΣΠΥΡΙΔΩΝ",
+    "ΑΝΤΩΝΙΟΣ", "ΑΝΑΣΤΑΣΙΟΣ", "ΘΕΟΔΩΡΟΣ", "ΕΜΜΑΝΟΥΗΛ", "ΑΛΕΞΑΝΔΡΟΣ", "ΣΤΑΥΡΟΣ",
+    "ΗΛΙΑΣ", "ΠΕΤΡΟΣ", "ΣΤΥΛΙΑΝΟΣ", "ΑΡΙΣΤΕΙΔΗΣ", "ΛΕΩΝΙΔΑΣ", "ΦΙΛΙΠΠΟΣ",
+)
+CITIES = (
+    ("ΑΘΗΝΑ", "10"), ("ΘΕΣΣΑΛΟΝΙΚΗ", "54"), ("ΠΕΙΡΑΙΑΣ", "18"), ("ΠΑΤΡΑ", "26"),
+    ("ΗΡΑΚΛΕΙΟ", "71"), ("ΛΑΡΙΣΑ", "41"), ("ΒΟΛΟΣ", "38"), ("ΙΩΑΝΝΙΝΑ", "45"),
+    ("ΧΑΝΙΑ", "73"), ("ΚΑΛΑΜΑΤΑ", "24"), ("ΜΑΡΟΥΣΙ", "15"), ("Ν. ΣΜΥΡΝΗ", "17"),
+)
+STREETS = (
+    "ΠΑΝΕΠΙΣΤΗΜΙΟΥ", "ΕΓΝΑΤΙΑΣ", "ΒΑΣ. ΣΟΦΙΑΣ", "ΑΚΑΔΗΜΙΑΣ", "ΕΡΜΟΥ", "ΤΣΙΜΙΣΚΗ",
+    "ΚΗΦΙΣΙΑΣ", "ΣΤΑΔΙΟΥ", "ΜΗΤΡΟΠΟΛΕΩΣ", "ΑΓ. ΔΗΜΗΤΡΙΟΥ",
+)
+PROFESSIONS = (
+    "ΜΗΧΑΝΙΚΟΣ", "ΙΑΤΡΟΣ", "ΔΙΚΗΓΟΡΟΣ", "ΛΟΓΙΣΤΗΣ", "ΕΚΠΑΙΔΕΥΤΙΚΟΣ", "ΕΜΠΟΡΟΣ",
+    "ΣΥΝΤΑΞ. ΤΡΑΠΕΖΙΚΟΣ", "ΙΔΙΩΤΙΚΟΣ ΥΠΑΛΛΗΛΟΣ", "ΑΡΧΙΤΕΚΤΩΝ", "ΦΑΡΜΑΚΟΠΟΙΟΣ",
+    "ΣΤΡΑΤΙΩΤΙΚΟΣ", "ΕΠΙΧΕΙΡΗΜΑΤΙΑΣ",
+)
+OFFICES = ("Σεβάσμιος", "Α' Επιτηρητής", "Β' Επιτηρητής", "Ρήτωρ", "Γραμματεύς", "Ταμίας", "Τελετάρχης")
+COMMITTEES = ("Φιλανθρωπίας", "Οικονομικών", "Εκδηλώσεων", "Βιβλιοθήκης")
+
+# Κατανομή (τιμή, βάρος) για τα φίλτρα/στατιστικά
+DEGREES = (("Μαθητής", 30), ("Εταίρος", 20), ("Δάσκαλος", 50))
+STATUSES = (("Ενεργό", 70), ("Ανενεργό", 20), ("Αποχωρήσαν", 7), ("Διαγραφέν", 3))
+FINANCIAL = (("Ναι", 80), ("Όχι", 20))
+
+
+def _pick(rng: random.Random, weighted) -> str:
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+def _day(rng: random.Random, start_year: int, end_year: int) -> str:
+    start = date(start_year, 1, 1)
+    return (start + timedelta(days=rng.randrange((date(end_year, 12, 31) - start).days))).isoformat()
+
+
+def generate_member(rng: random.Random, n: int) -> Dict:
+    """Ένα συνθετικό μέλος με όλες τις στήλες (n: αύξων, για μοναδικά κλειδιά)"""
+    last = rng.choice(LAST_NAMES)
+    first = rng.choice(FIRST_NAMES)
+    city, zip_prefix = rng.choice(CITIES)
+    degree = _pick(rng, DEGREES)
+    status = _pick(rng, STATUSES)
+    initiation = _day(rng, 1975, 2023)
+    married = rng.random() < 0.7
+    return {
+        "last_name": last,
+        "first_name": first,
+        "fathers_name": rng.choice(FIRST_NAMES),
+        "birth_date": _day(rng, 1940, 1995),
+        "birth_place": rng.choice(CITIES)[0],
+        "profession": rng.choice(PROFESSIONS),
+        "tax_id": f"{100000000 + n:09d}",
+        "id_number": f"{rng.choice('ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ')}{rng.choice('ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ')}{rng.randrange(100000, 999999)}",
+        "address": f"{rng.choice(STREETS)} {rng.randrange(1, 200)}",
+        "postal_code": f"{zip_prefix}{rng.randrange(100, 999)}",
+        "city": city,
+        "home_phone": f"2{rng.randrange(100000000, 999999999)}",
+        "mobile_phone": f"69{rng.randrange(10000000, 99999999)}",
+        "email": f"member{n}@example.gr",
+        "initiation_date": initiation,
+        "initiation_diploma": str(rng.randrange(1000, 99999)),
+        "second_degree_date": _day(rng, int(initiation[:4]), 2024) if degree != "Μαθητής" else None,
+        "second_degree_diploma": str(rng.randrange(1000, 99999)) if degree != "Μαθητής" else None,
+        "third_degree_date": _day(rng, int(initiation[:4]), 2024) if degree == "Δάσκαλος" else None,
+        "third_degree_diploma": str(rng.randrange(1000, 99999)) if degree == "Δάσκαλος" else None,
+        "current_degree": degree,
+        "initiation_lodge": "ΑΚΡΟΠΟΛΙΣ",
+        "initiation_lodge_number": "84",
+        "sponsor": f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)}",
+        "guarantor": f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)}",
+        "entry_date": initiation,
+        "offices_held": ", ".join(rng.sample(OFFICES, rng.randrange(0, 3))) or None,
+        "honors": "Τιμητικό δίπλωμα" if rng.random() < 0.1 else None,
+        "committees": ", ".join(rng.sample(COMMITTEES, rng.randrange(0, 2))) or None,
+        "marital_status": "Έγγαμος" if married else "Άγαμος",
+        "spouse_name": rng.choice(("ΜΑΡΙΑ", "ΕΛΕΝΗ", "ΑΙΚΑΤΕΡΙΝΗ", "ΒΑΣΙΛΙΚΗ", "ΣΟΦΙΑ")) if married else None,
+        "children_names": ", ".join(rng.sample(FIRST_NAMES, rng.randrange(1, 3))) if married and rng.random() < 0.6 else None,
+        "emergency_contact": f"{last} {rng.choice(FIRST_NAMES)}",
+        "emergency_phone": f"69{rng.randrange(10000000, 99999999)}",
+        "member_status": status,
+        "status_change_date": _day(rng, 2010, 2024) if status != "Ενεργό" else None,
+        "status_change_reason": "Αίτηση μέλους" if status != "Ενεργό" else None,
+        "financial_status": _pick(rng, FINANCIAL),
+        "last_payment_date": _day(rng, 2020, 2024),
+        "notes": "Συνθετικό μέλος για benchmark" if rng.random() < 0.2 else None,
+        "lodge_reg_no": f"84-{n}",
+        "grand_lodge_reg_no": f"ΜΣ{200000 + n}",
+        "afm": f"{100000000 + n:09d}",
+    }
+
+
+def generate_roster(count: int, seed: int = 84, start: int = 1) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for n in range(start, start + count):
+        yield generate_member(rng, n)
+
+
+def build_roster_db(db_path: str, count: int, seed: int = 84, batch: int = 5000) -> Database:
+    """
+    Νέα βάση (μέσω migrations) με count συνθετικά μέλη. Γράφει σε batches
+    με executemany μέσα σε ένα transaction· τα triggers (FTS, member_stats)
+    τρέχουν κανονικά, όπως στην παραγωγή.
+    """
+    db = Database(db_path)
+    columns = list(generate_member(random.Random(0), 0))
+    query = f"INSERT INTO members ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    with db.connection() as conn:
+        conn.execute("BEGIN")
+        rows = []
+        for member in generate_roster(count, seed):
+            rows.append([member[c] for c in columns])
+            if len(rows) >= batch:
+                conn.executemany(query, rows)
+                rows = []
+        if rows:
+            conn.executemany(query, rows)
+    db._invalidate()
+    return db
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Δημιουργία συνθετικής βάσης μελών")
+    parser.add_argument("db_path")
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=84)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    build_roster_db(args.db_path, args.members, args.seed)
+    print(f"{args.members} members -> {args.db_path} in {time.perf_counter() - t0:.1f}s")
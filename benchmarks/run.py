@@ -0,0 +1,245 @@
+"""
+Benchmark suite: βάση, import/export και PDF πάνω σε συνθετικό μητρώο
+
+    python -m benchmarks.run --sizes 10000 100000 --out bench.json
+    python -m benchmarks.run --compare before.json after.json
+
+Για κάθε μέγεθος χτίζεται (μία φορά, στο --data-dir) βάση με το
+benchmarks.roster και κάθε run δουλεύει σε φρέσκο αντίγραφό της.
+Τα αποτελέσματα (min/median ανά μέτρηση, μαζί με commit, εκδόσεις
+Python/SQLite) γράφονται σε JSON για σύγκριση ανάμεσα σε commits.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.roster import build_roster_db
+from modules.database import Database, get_query_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(fn: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict:
+    """Εκτελεί το fn repeat φορές (με setup πριν από κάθε μία, εκτός χρόνου)"""
+    runs = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        fn(i)
+        runs.append(time.perf_counter() - start)
+    return {
+        "runs": [round(r, 6) for r in runs],
+        "min": round(min(runs), 6),
+        "median": round(statistics.median(runs), 6),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def prepare_db(size: int, seed: int, data_dir: str) -> str:
+    """Φρέσκο αντίγραφο εργασίας της συνθετικής βάσης του μεγέθους size"""
+    os.makedirs(data_dir, exist_ok=True)
+    pristine = os.path.join(data_dir, f"roster_{size}_{seed}.db")
+    if not os.path.exists(pristine):
+        t0 = time.perf_counter()
+        build_roster_db(pristine, size, seed)
+        with sqlite3.connect(pristine) as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        print(f"  built {size} members in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+    work = os.path.join(data_dir, f"work_{size}.db")
+    for ext in ("", "-wal", "-shm"):
+        if os.path.exists(work + ext):
+            os.remove(work + ext)
+    shutil.copy(pristine, work)
+    return work
+
+
+def _import_files(db_path: str, data_dir: str, changed_every: int = 100) -> List[Dict[str, str]]:
+    """
+    Δύο παραλλαγές αρχείου import (csv + xlsx) από το export, με ~1% των
+    γραμμών να αλλάζουν πόλη. Εναλλάσσονται ώστε κάθε επανάληψη να έχει
+    πραγματικές αλλαγές να γράψει.
+    """
+    import xlsxwriter
+    from modules.import_export import export_members
+
+    source, _ = export_members("csv", db_path=db_path)
+    with open(source, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    os.remove(source)
+    city = rows[0].index("Πόλη")
+
+    variants = []
+    for n, value in enumerate(("ΠΑΤΡΑ-BENCH", "ΒΟΛΟΣ-BENCH")):
+        for i in range(1, len(rows), changed_every):
+            rows[i][city] = value
+        paths = {"csv": os.path.join(data_dir, f"import_{n}.csv"), "xlsx": os.path.join(data_dir, f"import_{n}.xlsx")}
+        with open(paths["csv"], "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows(rows)
+        workbook = xlsxwriter.Workbook(paths["xlsx"], {"constant_memory": True})
+        sheet = workbook.add_worksheet()
+        for r, row in enumerate(rows):
+            sheet.write_row(r, 0, row)
+        workbook.close()
+        variants.append(paths)
+    return variants
+
+
+def run_size(size: int, args) -> Dict:
+    db_path = prepare_db(size, args.seed, args.data_dir)
+    db = Database(db_path)
+    cache = get_query_cache()
+    ids = db.query_members(sort="id", limit=max(args.writes, args.cards))["member_id"].tolist()
+    results: Dict[str, Dict] = {}
+
+    def wanted(name: str) -> bool:
+        return not args.only or any(name.startswith(o) for o in args.only)
+
+    def bench(name: str, fn: Callable, repeat: int = args.repeat, setup: Optional[Callable] = None):
+        if not wanted(name):
+            return
+        results[name] = timed(fn, repeat, setup)
+        print(f"  {size:>8} {name:<32} median {results[name]['median'] * 1000:>10.1f} ms", file=sys.stderr)
+
+    cold = lambda i: cache.clear()  # noqa: E731
+
+    # ---------------- Reads ----------------
+    bench("get_all_members.cold", lambda i: db.get_all_members(), setup=cold)
+    bench("get_all_members.warm", lambda i: db.get_all_members())
+    for term in ("παπα", "ΓΕΩΡΓΙΟΣ ΑΘΗΝΑ", "6944"):
+        bench(f"search_members[{term}]", lambda i, t=term: db.search_members(t), setup=cold)
+    bench("query_members.page", lambda i: db.query_members({"member_status": "Ενεργό"}, limit=50), setup=cold)
+    bench("count_members", lambda i: db.count_members({"member_status": "Ενεργό"}), setup=cold)
+    bench("get_member_statistics.cold", lambda i: db.get_member_statistics(), setup=cold)
+
+    # ---------------- Writes ----------------
+    write_ids = ids[:args.writes]
+    value = lambda i: f"BENCH-{i}"  # noqa: E731 (διαφορετική τιμή ανά επανάληψη = πραγματική εγγραφή)
+
+    def update_loop(i):
+        for mid in write_ids:
+            db.update_member(mid, {"city": value(i)})
+
+    bench(f"update_member.loop[{len(write_ids)}]", update_loop)
+    bench(
+        f"bulk_update_members.batch[{len(write_ids)}]",
+        lambda i: db.bulk_update_members([{"member_id": mid, "city": value(i)} for mid in write_ids]),
+    )
+
+    # ---------------- Export / import ----------------
+    from modules.import_export import export_members, import_members
+
+    for fmt in ("xlsx", "csv"):
+        bench(f"export.{fmt}", lambda i, f=fmt: os.remove(export_members(f, db_path=db_path)[0]))
+
+    if wanted("import."):
+        variants = _import_files(db_path, args.data_dir)
+        for fmt in ("csv", "xlsx"):
+            def do_import(i, f=fmt):
+                path = variants[i % 2][f]
+                with open(path, "rb") as fh:
+                    import_members(db, fh, path)
+            bench(f"import.{fmt}[1% changed]", do_import)
+
+    # ---------------- PDF ----------------
+    from modules.pdf_generator import (
+        create_member_card_pdf, create_member_cards_booklet, generate_member_cards,
+    )
+
+    card_ids = ids[:args.cards]
+    bench("pdf.single", lambda i: create_member_card_pdf(card_ids[0], db_path=db_path, use_cache=False))
+    bench(
+        f"pdf.bulk[{len(card_ids)}]",
+        lambda i: sum(1 for _ in generate_member_cards(
+            card_ids, db_path=db_path, max_workers=args.pdf_workers, use_cache=False
+        )),
+        repeat=1,
+    )
+    bench(f"pdf.booklet[{len(card_ids)}]", lambda i: create_member_cards_booklet(card_ids, db_path=db_path), repeat=1)
+
+    return results
+
+
+def compare(before_path: str, after_path: str):
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    for size, results in after["results"].items():
+        old = before["results"].get(size, {})
+        print(f"\n{size} members")
+        for name, r in results.items():
+            if name not in old:
+                print(f"  {name:<34} {r['median'] * 1000:>10.1f} ms   (new)")
+                continue
+            ratio = old[name]["median"] / r["median"] if r["median"] else float("inf")
+            print(
+                f"  {name:<34} {old[name]['median'] * 1000:>10.1f} -> {r['median'] * 1000:>10.1f} ms"
+                f"   x{ratio:.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000], help="π.χ. 10000 100000 1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=84)
+    parser.add_argument("--writes", type=int, default=200, help="μέλη στο update_member loop / batch")
+    parser.add_argument("--cards", type=int, default=100, help="καρτέλες στο bulk/booklet")
+    parser.add_argument("--pdf-workers", type=int, default=None)
+    parser.add_argument("--only", nargs="*", help="μόνο μετρήσεις που ξεκινούν έτσι (π.χ. search export)")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, ".bench_data"))
+    parser.add_argument("--out", help="αρχείο JSON (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    os.environ.setdefault("CARD_CACHE_DIR", os.path.join(args.data_dir, "card_cache"))
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": {str(size): run_size(size, args) for size in args.sizes},
+    }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
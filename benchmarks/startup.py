@@ -0,0 +1,144 @@
+"""
+Startup report: χρόνος εκτέλεσης και imports ανά σελίδα (τύπου -X importtime)
+
+    python -m benchmarks.startup [--top 8] [--check] [--budget-ms 1500]
+
+Κάθε σελίδα τρέχει σε ξεχωριστό process (ψυχρό), σε bare mode του
+Streamlit, πάνω σε αντίγραφο της βάσης σε temp φάκελο. Το streamlit
+φορτώνεται πριν τη μέτρηση (ο server το έχει ήδη φορτωμένο), οπότε
+μετράει μόνο ό,τι φέρνει η ίδια η σελίδα.
+
+--check: αποτυγχάνει (exit 1) αν μια σελίδα φορτώνει στην εκκίνηση κάποιο
+βαρύ package που πρέπει να φορτώνεται μόνο όταν χρησιμοποιηθεί, ή αν το
+app.py ξεπερνά το --budget-ms.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRIES = [
+    "app.py",
+    "pages/1_registry.py",
+    "pages/2_edit.py",
+    "pages/3_bulk.py",
+    "pages/4_cards.py",
+    "pages/5_stats.py",
+    "pages/6_tasks.py",
+]
+
+# Packages που δεν πρέπει να φορτώνονται στο πρώτο άνοιγμα της σελίδας
+DEFERRED = {
+    "app.py": ("anthropic", "reportlab", "plotly", "openpyxl", "xlsxwriter"),
+    "pages/1_registry.py": ("anthropic", "reportlab", "openpyxl", "xlsxwriter"),
+    "pages/3_bulk.py": ("anthropic", "reportlab", "openpyxl", "xlsxwriter", "xlrd"),
+    "pages/4_cards.py": ("anthropic", "reportlab"),
+    "pages/5_stats.py": ("anthropic", "reportlab", "openpyxl", "xlsxwriter"),
+}
+
+_MARKER = "--- startup: page ---"
+
+_RUNNER = f"""
+import logging, runpy, sys, time
+logging.disable(logging.WARNING)
+import streamlit, pandas
+sys.path.insert(0, {ROOT!r})
+sys.stderr.write({_MARKER!r} + "\\n"); sys.stderr.flush()
+start = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="__main__")
+print(time.perf_counter() - start)
+"""
+
+
+def _parse_importtime(stderr: str) -> Dict[str, float]:
+    """Cumulative ms ανά top-level package που φορτώθηκε μετά το marker"""
+    packages: Dict[str, float] = {}
+    lines = stderr.split(_MARKER, 1)[-1].splitlines()
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit() or name.startswith("  "):
+            continue  # επικεφαλίδα ή nested import (μετράει ήδη στον γονέα)
+        top = name.strip().split(".")[0]
+        packages[top] = packages.get(top, 0.0) + int(cumulative) / 1000
+    return packages
+
+
+def measure(entry: str, workdir: str) -> Dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RUNNER, os.path.join(ROOT, entry)],
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return {"entry": entry, "error": proc.stderr.strip().splitlines()[-1:]}
+    packages = _parse_importtime(proc.stderr)
+    return {
+        "entry": entry,
+        "total_ms": round(float(proc.stdout.strip().splitlines()[-1]) * 1000, 1),
+        "import_ms": round(sum(packages.values()), 1),
+        "packages": dict(sorted(packages.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def check(results: List[Dict], budget_ms: float) -> List[str]:
+    problems = []
+    for r in results:
+        if "error" in r:
+            problems.append(f"{r['entry']}: {r['error']}")
+            continue
+        loaded = [p for p in DEFERRED.get(r["entry"], ()) if p in r["packages"]]
+        if loaded:
+            problems.append(f"{r['entry']}: imports {', '.join(loaded)} at startup")
+        if r["entry"] == "app.py" and r["total_ms"] > budget_ms:
+            problems.append(f"app.py: {r['total_ms']} ms > budget {budget_ms} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entries", nargs="*", default=ENTRIES)
+    parser.add_argument("--top", type=int, default=8, help="packages ανά σελίδα στην αναφορά")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="startup_")
+    try:
+        db = os.path.join(ROOT, "lodge_members.db")
+        if os.path.exists(db):
+            shutil.copy(db, workdir)
+        results = [measure(entry, workdir) for entry in args.entries]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for r in results:
+            if "error" in r:
+                print(f"{r['entry']:<22} ERROR {r['error']}")
+                continue
+            print(f"{r['entry']:<22} {r['total_ms']:>8.1f} ms  (imports {r['import_ms']:.1f} ms)")
+            for name, ms in list(r["packages"].items())[:args.top]:
+                print(f"    {name:<24} {ms:>8.1f} ms")
+
+    if args.check:
+        problems = check(results, args.budget_ms)
+        for p in problems:
+            print(f"FAIL {p}", file=sys.stderr)
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
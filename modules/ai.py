@@ -0,0 +1,238 @@
+"""
+AI Assistant
+Βοηθός Γραμματέα πάνω στο Anthropic API: ένας client ανά process,
+απάντηση σε κομμάτια (streaming) και τοπική cache απαντήσεων με
+κλειδί (model, system prompt, κανονικοποιημένο prompt).
+
+Ρυθμίσεις (env):
+    AI_BACKEND=anthropic   ή "stub" για offline δοκιμές (χωρίς κλειδί/δίκτυο)
+    AI_CACHE_TTL=86400     δευτερόλεπτα ζωής μιας απάντησης στην cache
+    AI_CACHE_SIZE=256      μέγιστες απαντήσεις (LRU)
+    AI_STUB_DELAY_MS=400   καθυστέρηση πρώτου token του stub
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+
+SYSTEM_PROMPT = (
+    "Είσαι βοηθός για τον Γραμματέα μιας στοάς. "
+    "Απαντάς στα Ελληνικά, πρακτικά και σύντομα. "
+    "Όταν ζητούνται πρότυπα κειμένων, δίνεις έτοιμα templates."
+)
+DEFAULT_MODEL = "claude-3-5-sonnet-latest"
+BACKENDS = ("anthropic", "stub")
+MAX_TOKENS = 700
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Ίδιο αίτημα με διαφορετικά κενά/κεφαλαία/τόνους-NFC -> ίδιο κλειδί cache"""
+    text = unicodedata.normalize("NFC", prompt).casefold()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(model: str, system: str, prompt: str) -> str:
+    raw = "\x00".join((model, system, normalize_prompt(prompt)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Απαντήσεις στη μνήμη με TTL και όριο πλήθους (LRU)"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries or int(os.getenv("AI_CACHE_SIZE", "256"))
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else os.getenv("AI_CACHE_TTL", "86400"))
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# ==================== BACKENDS ====================
+
+class AnthropicBackend:
+    """Anthropic API· ο client (και το import, ~1.5s) δημιουργείται μία φορά"""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                import anthropic
+
+                self._client = anthropic.Anthropic(api_key=self.api_key)
+            return self._client
+
+    def stream(self, model: str, system: str, prompt: str, max_tokens: int) -> Iterator[str]:
+        with self.client.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
+        ) as response:
+            yield from response.text_stream
+
+
+class StubBackend:
+    """
+    Τοπικό backend για δοκιμές χωρίς δίκτυο: ντετερμινιστική απάντηση
+    ανά prompt, με καθυστέρηση πρώτου token και ανά λέξη όπως ένα API
+    """
+
+    name = "stub"
+
+    def __init__(self, first_token_ms: Optional[float] = None, token_ms: float = 15.0):
+        self.first_token_ms = float(
+            first_token_ms if first_token_ms is not None else os.getenv("AI_STUB_DELAY_MS", "400")
+        )
+        self.token_ms = token_ms
+        self.calls = 0
+
+    def stream(self, model: str, system: str, prompt: str, max_tokens: int) -> Iterator[str]:
+        self.calls += 1
+        time.sleep(self.first_token_ms / 1000)
+        reply = (
+            f"[stub · {model}] Πρόχειρη απάντηση για: «{prompt.strip()}».\n\n"
+            "1. Σύντομη εισαγωγή.\n2. Τα κύρια σημεία.\n3. Κλείσιμο με υπογραφή Γραμματέα."
+        )
+        words = reply.split(" ")[:max_tokens]
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.token_ms / 1000)
+            yield word if i == len(words) - 1 else word + " "
+
+
+# ==================== ASSISTANT ====================
+
+class AIAssistant:
+    """Streaming απαντήσεις με cache· κοινό για όλα τα sessions"""
+
+    def __init__(self, backend, model: str = DEFAULT_MODEL, system: str = SYSTEM_PROMPT,
+                 max_tokens: int = MAX_TOKENS, cache: Optional[ResponseCache] = None):
+        self.backend = backend
+        self.model = model
+        self.system = system
+        self.max_tokens = max_tokens
+        self.cache = cache or ResponseCache()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._first_token_total = 0.0
+        self._total = 0.0
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Κομμάτια της απάντησης καθώς φτάνουν (για st.write_stream). Από
+        cache επιστρέφεται ολόκληρη μονομιάς· σφάλματα δεν αποθηκεύονται.
+        """
+        key = cache_key(self.model, self.system, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        start = time.perf_counter()
+        first_token = None
+        parts = []
+        try:
+            for chunk in self.backend.stream(self.model, self.system, prompt, self.max_tokens):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            yield ("\n\n" if parts else "") + f"Σφάλμα AI: {e}"
+            return
+
+        if parts:
+            self.cache.set(key, "".join(parts))
+        with self._lock:
+            self._calls += 1
+            self._first_token_total += first_token or 0.0
+            self._total += time.perf_counter() - start
+
+    def ask(self, prompt: str) -> str:
+        """Ολόκληρη η απάντηση (χωρίς streaming)"""
+        return "".join(self.stream(prompt))
+
+    def stats(self) -> Dict:
+        """Cache hits/misses και μέση καθυστέρηση κλήσεων στο backend (ms)"""
+        with self._lock:
+            calls = self._calls
+            latency = {
+                "backend": self.backend.name,
+                "calls": calls,
+                "avg_first_token_ms": 1000 * self._first_token_total / calls if calls else 0.0,
+                "avg_total_ms": 1000 * self._total / calls if calls else 0.0,
+            }
+        return {**latency, **self.cache.stats()}
+
+
+_assistants: Dict[Tuple, AIAssistant] = {}
+_assistants_lock = threading.Lock()
+
+
+def get_assistant(api_key: Optional[str] = None, model: Optional[str] = None,
+                  backend: Optional[str] = None) -> AIAssistant:
+    """Κοινός AIAssistant ανά (backend, κλειδί, model) (process-wide, επιβιώνει τα reruns)"""
+    backend = backend or os.getenv("AI_BACKEND", "anthropic")
+    model = model or DEFAULT_MODEL
+    key = (backend, api_key, model)
+    with _assistants_lock:
+        assistant = _assistants.get(key)
+        if assistant is None:
+            if backend == "stub":
+                impl = StubBackend()
+            elif backend == "anthropic":
+                if not api_key:
+                    raise ValueError("Λείπει το AI.ANTHROPIC_API_KEY")
+                impl = AnthropicBackend(api_key)
+            else:
+                raise ValueError(f"Άγνωστο AI backend: {backend}")
+            assistant = AIAssistant(impl, model=model)
+            _assistants[key] = assistant
+        return assistant
@@ -0,0 +1,157 @@
+"""
+Card Cache
+Cache στο δίσκο για έτοιμες καρτέλες PDF, με κλειδί το hash της γραμμής
+του μέλους + έκδοση template + ημερομηνία έκδοσης
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional
+
+from modules.database import on_members_changed
+
+
+class CardCache:
+    """
+    Content-addressed cache: αν άλλαξε οτιδήποτε στο μέλος, αλλάζει το
+    κλειδί και η παλιά καρτέλα απλώς δεν ξαναχρησιμοποιείται. Τα αρχεία
+    είναι `m<member_id>_<hash>.pdf`, ώστε να σβήνονται ανά μέλος όταν αυτό
+    αλλάξει, και το μέγεθος φράσσεται με LRU eviction (mtime = τελευταία
+    χρήση). Καρτέλες του ίδιου μέλους με άλλη ημερομηνία έκδοσης συνυπάρχουν.
+    """
+
+    def __init__(self, cache_dir: str = ".card_cache", max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(member: Dict, template_version: str, issue_date: str) -> str:
+        payload = json.dumps(
+            {"member": member, "template": template_version, "issue_date": issue_date},
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, member_id, key: str) -> str:
+        return os.path.join(self.cache_dir, f"m{member_id}_{key}.pdf")
+
+    def get(self, member_id, key: str) -> Optional[bytes]:
+        path = self._path(member_id, key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU: σημειώνουμε τη χρήση
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, member_id, key: str, data: bytes):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(member_id, key)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data) - replaced
+            over = self._current_size() > self.max_bytes
+        if over:
+            self._evict()
+
+    def invalidate(self, member_ids: Optional[Iterable] = None):
+        """Σβήνει τις καρτέλες των member_ids (None = όλες)"""
+        patterns = ["m*_*.pdf"] if member_ids is None else [f"m{mid}_*.pdf" for mid in member_ids]
+        removed = 0
+        for pattern in patterns:
+            for path in glob.glob(os.path.join(self.cache_dir, pattern)):
+                try:
+                    removed += os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    pass
+        if removed:
+            with self._lock:
+                if self._size is not None:
+                    self._size -= removed
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(
+                os.path.getsize(p) for p in glob.glob(os.path.join(self.cache_dir, "m*_*.pdf"))
+            )
+        return self._size
+
+    def _evict(self):
+        """LRU: σβήνει τα λιγότερο πρόσφατα χρησιμοποιημένα ως το 90% του ορίου"""
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, "m*_*.pdf")):
+            try:
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+            except OSError:
+                pass
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._size = total
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "dir": self.cache_dir,
+                "bytes": self._current_size(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_card_cache: Optional[CardCache] = None
+
+
+def get_card_cache() -> CardCache:
+    """Get or create το cache καρτελών (CARD_CACHE_DIR / CARD_CACHE_MAX_MB στο env)"""
+    global _card_cache
+    if _card_cache is None:
+        _card_cache = CardCache(
+            cache_dir=os.environ.get("CARD_CACHE_DIR", ".card_cache"),
+            max_bytes=int(os.environ.get("CARD_CACHE_MAX_MB", "256")) * 1024 * 1024,
+        )
+    return _card_cache
+
+
+# Αλλαγές μελών μέσω Database -> σβήσιμο των παλιών καρτελών τους
+on_members_changed(lambda member_ids: get_card_cache().invalidate(member_ids))
@@ -0,0 +1,82 @@
+"""
+Change Detection
+Εντοπισμός αλλαγών ανάμεσα σε πίνακες μελών (π.χ. st.data_editor)
+χωρίς βρόχο ανά γραμμή
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+# (member_id, στήλη, νέα τιμή)
+Change = Tuple[int, str, object]
+
+
+def _py(value):
+    """numpy/pandas τιμή -> απλός Python τύπος (NaN/NaT -> None)"""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        return value.item()
+    return value
+
+
+def diff_frames(
+    original: pd.DataFrame,
+    edited: pd.DataFrame,
+    key: str = "member_id",
+    columns: Optional[Iterable[str]] = None,
+) -> List[Change]:
+    """
+    Όλες οι αλλαγές κελιών από original σε edited, με ένα vectorized
+    boolean mask πάνω σε όλο τον πίνακα. Οι γραμμές αντιστοιχίζονται με
+    το key (όχι με τη θέση)· κενό σε κενό (None/NaN) δεν είναι αλλαγή.
+    """
+    if columns is None:
+        columns = [c for c in edited.columns if c != key and c in original.columns]
+    columns = list(columns)
+    if edited.empty or not columns:
+        return []
+
+    after = edited.set_index(key)[columns]
+    before = original.set_index(key)[columns].reindex(after.index)
+
+    mask = before.ne(after) & ~(before.isna() & after.isna())
+    changed = mask.stack()
+    changed = changed[changed]
+    return [(_py(mid), col, _py(after.at[mid, col])) for mid, col in changed.index]
+
+
+def editor_changes(
+    original: pd.DataFrame,
+    editor_state: Dict,
+    key: str = "member_id",
+) -> List[Change]:
+    """
+    Αλλαγές από το delta του st.data_editor (st.session_state[<key του editor>]):
+    το edited_rows έχει μόνο τα κελιά που άγγιξε ο χρήστης, ανά θέση γραμμής
+    του original. Όσα ξαναγύρισαν στην αρχική τιμή αγνοούνται.
+    """
+    changes: List[Change] = []
+    for position, cells in (editor_state.get("edited_rows") or {}).items():
+        row = original.iloc[int(position)]
+        for col, value in cells.items():
+            if col == key or col not in original.columns:
+                continue
+            old, new = _py(row[col]), _py(value)
+            if old != new:
+                changes.append((_py(row[key]), col, new))
+    return changes
+
+
+def changes_to_rows(changes: Iterable[Change], key: str = "member_id") -> List[Dict]:
+    """Τριάδες αλλαγών -> ένα dict ανά μέλος για το Database.bulk_update_members"""
+    rows: Dict = {}
+    for mid, col, value in changes:
+        rows.setdefault(mid, {key: mid})[col] = value
+    return list(rows.values())
@@ -3,6 +3,7 @@ Configuration Manager - Feature Detection & Settings
 Ανιχνεύει αυτόματα ποια features είναι διαθέσιμα βάσει secrets
 """
 
+import os
 import streamlit as st
 from typing import Dict, Optional
 
@@ -16,6 +17,18 @@ class Config:
         
         # Feature detection
         self.features = self._detect_features()
+        
+        # Processes για μαζική δημιουργία PDF ([pdf] WORKERS στα secrets)
+        self.pdf_workers = self._detect_pdf_workers()
+    
+    def _detect_pdf_workers(self) -> int:
+        """Πλήθος workers για bulk PDF (default: όσοι πυρήνες)"""
+        try:
+            if hasattr(st, 'secrets') and 'pdf' in st.secrets and 'WORKERS' in st.secrets['pdf']:
+                return max(1, int(st.secrets['pdf']['WORKERS']))
+        except Exception:
+            pass
+        return os.cpu_count() or 1
     
     def _detect_features(self) -> Dict[str, bool]:
         """Αυτόματη ανίχνευση διαθέσιμων features"""
@@ -55,7 +68,8 @@ class Config:
                 'smtp_server': st.secrets['email']['SMTP_SERVER'],
                 'smtp_port': int(st.secrets['email']['SMTP_PORT']),
                 'sender_email': st.secrets['email']['SENDER_EMAIL'],
-                'sender_password': st.secrets['email']['SENDER_PASSWORD']
+                'sender_password': st.secrets['email']['SENDER_PASSWORD'],
+                'use_tls': str(st.secrets['email'].get('USE_TLS', True)).lower() not in ('0', 'false', 'no'),
             }
         except Exception:
             return None
@@ -3,201 +3,790 @@ Database Operations Module
 Όλες οι database λειτουργίες σε ένα module
 """
 
+import copy
+import os
+import queue
+import re
 import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
 import pandas as pd
-from typing import Dict, Optional
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+from modules.instrumentation import connection_factory, get_instrumentation, instrumented
+from modules.migrations import UNIQUE_KEY_COLUMNS, migrate
+from modules.statistics import MemberStatistics, compute_member_statistics, rebuild_stats
+
+
+# ==================== SEARCH NORMALIZATION ====================
+
+def fold_greek(text) -> Optional[str]:
+    """
+    Κανονικοποίηση για αναζήτηση: πεζά, χωρίς τόνους/διαλυτικά, ς -> σ.
+    "ΠΑΠΑΔΟΠΟΎΛΟΣ" και "Παπαδοπουλος" δίνουν το ίδιο "παπαδοπουλοσ".
+    """
+    if text is None:
+        return None
+    decomposed = unicodedata.normalize("NFD", str(text))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.casefold().replace("ς", "σ")
+
+
+def fts_query(search_term: str) -> str:
+    """Όροι αναζήτησης -> FTS5 MATCH (prefix σε κάθε λέξη, για search-as-you-type)"""
+    tokens = re.findall(r"\w+", fold_greek(search_term) or "")
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+# ==================== CONNECTION POOL ====================
+
+class ConnectionPool:
+    """
+    Thread-aware pool συνδέσεων SQLite.
+    Κάθε thread (άρα και κάθε Streamlit session/rerun) κρατά μία σύνδεση
+    για όσο διαρκεί το `with pool.connection()`, και τα nested blocks
+    του ίδιου thread ξαναχρησιμοποιούν την ίδια σύνδεση (ίδιο transaction).
+    """
+
+    def __init__(self, db_path: str, max_size: int = 8, timeout: float = 30.0,
+                 mmap_size: int = 64 * 1024 * 1024, cache_size_kb: int = 16 * 1024):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._created = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._returns = 0
+        self._waits = 0
+        self._wait_time = 0.0
+
+    def connect(self) -> sqlite3.Connection:
+        """Νέα ρυθμισμένη σύνδεση (WAL, synchronous=NORMAL, mmap, cache)"""
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False, factory=connection_factory()
+        )
+        # Χρησιμοποιείται από τα triggers του members_fts
+        conn.create_function("fold_greek", 1, fold_greek, deterministic=True)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.max_size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self.connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f"connection pool exhausted ({self.max_size} connections busy)"
+                    )
+                with self._lock:
+                    self._waits += 1
+                    self._wait_time += time.perf_counter() - start
+
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        get_instrumentation().record_wait(time.perf_counter() - start)
+        return conn
+
+    def _return(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._returns += 1
+            self._in_use -= 1
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Checkout σύνδεσης. Στο τέλος του εξωτερικού block γίνεται commit
+        (ή rollback σε exception) και η σύνδεση επιστρέφει στο pool.
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._checkout()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._return(conn)
+
+    def stats(self) -> Dict:
+        """Metrics checkout/return (πόσες συνδέσεις είναι απασχολημένες κτλ.)"""
+        with self._lock:
+            return {
+                "size": self._created,
+                "max_size": self.max_size,
+                "idle": self._idle.qsize(),
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": self._checkouts,
+                "returns": self._returns,
+                "waits": self._waits,
+                "wait_time_ms": round(self._wait_time * 1000, 3),
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str = "lodge_members.db") -> ConnectionPool:
+    """Κοινό pool ανά αρχείο βάσης (Database, pdf_generator κτλ.)"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[key] = pool
+        return pool
+
+
+# ==================== QUERY CACHE ====================
+
+class QueryCache:
+    """
+    Process-wide LRU cache αποτελεσμάτων ερωτημάτων.
+    Κάθε βάση έχει generation counter που αυξάνεται σε κάθε εγγραφή·
+    οι εγγραφές του cache είναι versioned με αυτόν, οπότε μετά από
+    αλλαγή δεδομένων οι παλιές τιμές απλώς δεν ξαναχρησιμοποιούνται.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, object]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str) -> int:
+        """Νέα generation (μετά από εγγραφή) + καθάρισμα παλιών εγγραφών"""
+        with self._lock:
+            gen = self._generations.get(namespace, 0) + 1
+            self._generations[namespace] = gen
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+            return gen
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable):
+        with self._lock:
+            gen = self._generations.get(namespace, 0)
+            full_key = (namespace, gen, key)
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return self._entries[full_key]
+            self.misses += 1
+
+        value = loader()
+
+        with self._lock:
+            # Αν έγινε εγγραφή όσο φορτώναμε, δεν αποθηκεύουμε (πιθανώς παλιά δεδομένα)
+            if self._generations.get(namespace, 0) == gen:
+                self._entries[full_key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "generations": dict(self._generations),
+            }
+
+
+_query_cache = QueryCache()
+
+# Callbacks(member_ids) που καλούνται μετά από αλλαγές μελών (π.χ. cache καρτελών)
+_member_listeners: List[Callable[[List], None]] = []
+
+
+def on_members_changed(callback: Callable[[List], None]):
+    """Καταχώριση callback για αλλαγές μελών μέσω Database"""
+    _member_listeners.append(callback)
+
+
+def get_query_cache() -> QueryCache:
+    """Το κοινό (process-wide) query cache"""
+    return _query_cache
+
+
+# ==================== DATABASE ====================
+
+# Στήλες της λίστας μελών (μητρώο, αναζήτηση, query_members)
+MEMBER_LIST_COLUMNS = (
+    "member_id", "last_name", "first_name", "fathers_name",
+    "birth_date", "mobile_phone", "email",
+    "initiation_date", "current_degree", "member_status",
+    "financial_status",
+)
+
+# Φίλτρα που εφαρμόζονται στη βάση (με indexes) από το query_members
+MEMBER_FILTER_COLUMNS = ("member_status", "current_degree", "financial_status")
+
+# Κλειδιά με τα οποία ταιριάζουν οι γραμμές στο upsert_members. Τα φυσικά
+# κλειδιά έχουν partial unique index (μόνο για μη κενές τιμές).
+MEMBER_UPSERT_KEYS = ("member_id",) + UNIQUE_KEY_COLUMNS
+
+# Ταξινομήσεις για keyset pagination· πάντα τελειώνουν σε member_id (μοναδικό)
+MEMBER_SORT_KEYS = {
+    "name": ("last_name", "first_name", "member_id"),
+    "id": ("member_id",),
+}
+
 
 class Database:
     """Διαχείριση βάσης δεδομένων"""
 
     def __init__(self, db_path: str = "lodge_members.db"):
         self.db_path = db_path
-        self._init_tables()
-        self._ensure_member_columns()  # ✅ migration columns
-
-    def _init_tables(self):
-        """Δημιουργία πινάκων αν δεν υπάρχουν"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                task_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                due_date TEXT,
-                priority TEXT DEFAULT 'Μεσαία',
-                status TEXT DEFAULT 'Εκκρεμής',
-                category TEXT,
-                assigned_to TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                completed_at TEXT
-            )
-        """)
-
-        conn.commit()
-        conn.close()
+        self.pool = get_pool(db_path)
+        with self.connection() as conn:
+            migrate(conn)  # ✅ schema migrations (PRAGMA user_version)
+        self._member_columns = self._load_member_columns()
+        self._fts_enabled, self._upsert_keys = self._load_schema_features()
+
+    def connection(self):
+        """Pooled σύνδεση: `with db.connection() as conn: ...`"""
+        return self.pool.connection()
+
+    def pool_stats(self) -> Dict:
+        """Metrics του connection pool"""
+        return self.pool.stats()
+
+    def cache_stats(self) -> Dict:
+        """Hits/misses του query cache"""
+        return _query_cache.stats()
+
+    def _cached(self, key: Hashable, loader: Callable):
+        """
+        Ανάγνωση μέσω του query cache. Επιστρέφεται αντίγραφο ώστε οι
+        σελίδες να μπορούν να τροποποιούν ελεύθερα το DataFrame/dict.
+        """
+        value = _query_cache.get_or_load(os.path.abspath(self.db_path), key, loader)
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        return copy.deepcopy(value)
+
+    def _invalidate(self, member_ids: Iterable = ()):
+        """
+        Καλείται μετά από κάθε εγγραφή: νέα generation στο query cache και
+        ειδοποίηση των listeners (on_members_changed) για τα μέλη που άλλαξαν.
+        """
+        _query_cache.bump(os.path.abspath(self.db_path))
+        member_ids = list(member_ids)
+        if member_ids:
+            for callback in list(_member_listeners):
+                try:
+                    callback(member_ids)
+                except Exception:
+                    pass
 
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Get database connection (εκτός pool — ο caller κάνει close)"""
+        return self.pool.connect()
 
-    def _ensure_member_columns(self):
+    def _load_schema_features(self) -> Tuple[bool, set]:
         """
-        Προσθέτει columns στο members αν λείπουν.
-        Ασφαλές: αν υπάρχει ήδη column, το αγνοεί.
+        Τι δημιούργησαν τα migrations σε αυτή τη βάση: αν υπάρχει το
+        members_fts (FTS5) και ποια φυσικά κλειδιά έχουν unique index.
         """
-        conn = self.get_connection()
-        cur = conn.cursor()
+        with self.connection() as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        keys = {"member_id"} | {c for c in UNIQUE_KEY_COLUMNS if f"ux_members_{c}" in names}
+        return "members_fts" in names, keys
 
-        def add_col(name: str, coltype: str = "TEXT"):
-            try:
-                cur.execute(f"ALTER TABLE members ADD COLUMN {name} {coltype}")
-            except Exception:
-                pass
-
-        # ✅ Μόνο 2 αριθμοί μητρώου
-        add_col("lodge_reg_no")
-        add_col("grand_lodge_reg_no")
-
-        # ✅ Τεκτονικές πληροφορίες / βαθμοί
-        add_col("initiation_diploma")
-        add_col("second_degree_date")
-        add_col("second_degree_diploma")
-        add_col("third_degree_date")
-        add_col("third_degree_diploma")
-        add_col("initiation_lodge_number")
-        add_col("sponsor")
-
-        # ✅ Ιστορικό στοάς
-        add_col("entry_date")
-        add_col("offices_held")
-        add_col("honors")
-        add_col("committees")
-
-        # ✅ Οικογενειακά
-        add_col("marital_status")
-        add_col("spouse_name")
-        add_col("children_names")
-        add_col("emergency_phone")
-        add_col("emergency_contact")
-
-        # ✅ Διοικητικά
-        add_col("status_change_date")
-        add_col("status_change_reason")
-        add_col("last_payment_date")
-        add_col("notes")
-
-        # ✅ Συμβατότητα για ΑΦΜ (PDF χρησιμοποιεί tax_id)
-        add_col("tax_id")
-        add_col("afm")
-
-        conn.commit()
-        conn.close()
+    def upsert_keys(self) -> List[str]:
+        """Τα κλειδιά που μπορούν να χρησιμοποιηθούν στο upsert_members"""
+        return [k for k in MEMBER_UPSERT_KEYS if k in self._upsert_keys]
+
+    def member_columns(self) -> set:
+        """Οι στήλες του πίνακα members"""
+        return set(self._member_columns)
+
+    def _load_member_columns(self) -> set:
+        """Ονόματα στηλών του members (για έλεγχο πεδίων στα bulk updates)"""
+        with self.connection() as conn:
+            return {row[1] for row in conn.execute("PRAGMA table_info(members)")}
 
     # ==================== MEMBERS ====================
 
+    @instrumented
     def get_all_members(self) -> pd.DataFrame:
         """Λήψη όλων των μελών (λίστα/μητρώο)"""
-        conn = self.get_connection()
-        df = pd.read_sql_query("""
-            SELECT
-                member_id, last_name, first_name, fathers_name,
-                birth_date, mobile_phone, email,
-                initiation_date, current_degree, member_status,
-                financial_status
-            FROM members
-            ORDER BY last_name, first_name
-        """, conn)
-        conn.close()
-        return df
-
+        def load():
+            with self.connection() as conn:
+                return pd.read_sql_query("""
+                    SELECT
+                        member_id, last_name, first_name, fathers_name,
+                        birth_date, mobile_phone, email,
+                        initiation_date, current_degree, member_status,
+                        financial_status
+                    FROM members
+                    ORDER BY last_name, first_name
+                """, conn)
+
+        return self._cached(("get_all_members",), load)
+
+    def _member_filter_sql(self, filters: Optional[Dict], search: bool = True) -> Tuple[List[str], List]:
+        """
+        filters -> (WHERE clauses, params).
+        Κλειδιά: member_status, current_degree, financial_status (τιμή ή λίστα τιμών)
+        και search (όροι αναζήτησης, μέσω members_fts). None = χωρίς φίλτρο.
+        """
+        clauses: List[str] = []
+        params: List = []
+        filters = filters or {}
+
+        unknown = set(filters) - set(MEMBER_FILTER_COLUMNS) - {"search"}
+        if unknown:
+            raise ValueError(f"Άγνωστα φίλτρα: {', '.join(sorted(unknown))}")
+
+        for col in MEMBER_FILTER_COLUMNS:
+            value = filters.get(col)
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"m.{col} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                clauses.append(f"m.{col} = ?")
+                params.append(value)
+
+        term = filters.get("search") if search else None
+        match = fts_query(term) if term else ""
+        if match and self._fts_enabled:
+            clauses.append("m.member_id IN (SELECT rowid FROM members_fts WHERE members_fts MATCH ?)")
+            params.append(match)
+        elif match:
+            clauses.append("(m.last_name LIKE ? OR m.first_name LIKE ? OR m.mobile_phone LIKE ?)")
+            params.extend([f"%{term}%"] * 3)
+
+        return clauses, params
+
+    @instrumented
+    def query_members(self, filters: Optional[Dict] = None, sort: str = "name",
+                      limit: Optional[int] = None, offset: int = 0,
+                      after: Optional[Tuple] = None) -> pd.DataFrame:
+        """
+        Λίστα μελών με φίλτρα/ταξινόμηση/σελιδοποίηση στη βάση.
+        sort: "name" ή "id" (keyset) ή "relevance" (συνάφεια αναζήτησης, μόνο με offset).
+        after: τιμές των MEMBER_SORT_KEYS[sort] της τελευταίας γραμμής της
+        προηγούμενης σελίδας (keyset pagination — σταθερό κόστος ανά σελίδα).
+        """
+        columns = ", ".join(f"m.{c}" for c in MEMBER_LIST_COLUMNS)
+        match = fts_query((filters or {}).get("search") or "")
+
+        if sort == "relevance" and match and self._fts_enabled:
+            if after is not None:
+                raise ValueError("Η ταξινόμηση κατά συνάφεια υποστηρίζει μόνο offset")
+            clauses, params = self._member_filter_sql(filters, search=False)
+            query = f"""
+                SELECT {columns} FROM members_fts
+                JOIN members m ON m.member_id = members_fts.rowid
+                WHERE {' AND '.join(["members_fts MATCH ?"] + clauses)}
+                ORDER BY members_fts.rank, m.last_name, m.first_name
+            """
+            params = [match] + params
+        else:
+            clauses, params = self._member_filter_sql(filters)
+            keys = MEMBER_SORT_KEYS["name" if sort == "relevance" else sort]
+            if after is not None:
+                after = tuple(after)
+                if len(after) != len(keys):
+                    raise ValueError(f"Το after πρέπει να έχει {len(keys)} τιμές {keys}")
+                clauses.append(f"({', '.join(f'm.{k}' for k in keys)}) > ({', '.join('?' * len(keys))})")
+                params.extend(_sql_value(v) for v in after)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            query = f"""
+                SELECT {columns} FROM members m
+                {where}
+                ORDER BY {', '.join(f'm.{k}' for k in keys)}
+            """
+
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([int(limit), int(offset)])
+        elif offset:
+            query += " LIMIT -1 OFFSET ?"
+            params.append(int(offset))
+
+        def load():
+            with self.connection() as conn:
+                return pd.read_sql_query(query, conn, params=params)
+
+        return self._cached(("query_members", query, tuple(params)), load)
+
+    @instrumented
+    def count_members(self, filters: Optional[Dict] = None) -> int:
+        """Πλήθος μελών που ταιριάζουν στα filters (ίδια σημασία με query_members)"""
+        clauses, params = self._member_filter_sql(filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT COUNT(*) FROM members m {where}"
+
+        def load():
+            with self.connection() as conn:
+                return conn.execute(query, params).fetchone()[0]
+
+        return self._cached(("count_members", query, tuple(params)), load)
+
+    @instrumented
     def get_member_by_id(self, member_id: int) -> Optional[Dict]:
         """Λήψη μέλους με ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM members WHERE member_id = ?", (member_id,))
-        row = cursor.fetchone()
-        columns = [desc[0] for desc in cursor.description] if cursor.description else []
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM members WHERE member_id = ?", (member_id,))
+            row = cursor.fetchone()
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
         return dict(zip(columns, row)) if row else None
 
+    @instrumented
     def update_member(self, member_id: int, data: Dict):
         """Ενημέρωση μέλους"""
         if not data:
             return
 
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         fields = ", ".join([f"{k} = ?" for k in data.keys()])
         values = list(data.values()) + [member_id]
 
         query = f"UPDATE members SET {fields} WHERE member_id = ?"
-        cursor.execute(query, values)
-
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            conn.execute(query, values)
+        self._invalidate([member_id])
 
-    def search_members(self, search_term: str) -> pd.DataFrame:
-        """Αναζήτηση μελών"""
-        conn = self.get_connection()
-        query = """
-            SELECT
-                member_id, last_name, first_name, fathers_name,
-                birth_date, mobile_phone, email,
-                initiation_date, current_degree, member_status,
-                financial_status
-            FROM members
-            WHERE last_name LIKE ? OR first_name LIKE ? OR mobile_phone LIKE ?
-            ORDER BY last_name, first_name
+    @instrumented
+    def bulk_update_members(self, rows: List[Dict]) -> List[Tuple]:
         """
-        pattern = f"%{search_term}%"
-        df = pd.read_sql_query(query, conn, params=(pattern, pattern, pattern))
-        conn.close()
-        return df
-
+        Μαζική ενημέρωση μελών σε ένα transaction.
+        rows: dicts με member_id + τα πεδία προς ενημέρωση. Οι γραμμές με
+        ίδιο σύνολο πεδίων γράφονται μαζί με executemany.
+        Επιστρέφει [(member_id, success, message), ...] με τη σειρά των rows.
+        """
+        results: List[Optional[Tuple]] = [None] * len(rows)
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+
+        for i, row in enumerate(rows):
+            member_id = _sql_value(row.get("member_id"))
+            fields = tuple(k for k in row if k != "member_id")
+            unknown = [k for k in fields if k not in self._member_columns]
+            if member_id is None:
+                results[i] = (None, False, "Λείπει member_id")
+            elif unknown:
+                results[i] = (member_id, False, f"Άγνωστα πεδία: {', '.join(unknown)}")
+            elif not fields:
+                results[i] = (member_id, True, "Καμία αλλαγή")
+            else:
+                groups.setdefault(fields, []).append(i)
+
+        if not groups:
+            return results
+
+        with self.connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+
+            wanted = [_sql_value(rows[i]["member_id"]) for idxs in groups.values() for i in idxs]
+            existing = _existing_ids(conn, "members", "member_id", wanted)
+
+            for fields, idxs in groups.items():
+                query = f"UPDATE members SET {', '.join(f'{k} = ?' for k in fields)} WHERE member_id = ?"
+                found, params = [], []
+                for i in idxs:
+                    member_id = _sql_value(rows[i]["member_id"])
+                    if member_id not in existing:
+                        results[i] = (member_id, False, "Δεν βρέθηκε μέλος")
+                        continue
+                    found.append(i)
+                    params.append([_sql_value(rows[i][k]) for k in fields] + [member_id])
+
+                if not found:
+                    continue
+
+                conn.execute("SAVEPOINT bulk_group")
+                try:
+                    conn.executemany(query, params)
+                    conn.execute("RELEASE bulk_group")
+                    for i, p in zip(found, params):
+                        results[i] = (p[-1], True, "OK")
+                except sqlite3.Error:
+                    # Κάποια γραμμή απέτυχε: ξανά ανά γραμμή για να βρούμε ποια
+                    conn.execute("ROLLBACK TO bulk_group")
+                    conn.execute("RELEASE bulk_group")
+                    for i, p in zip(found, params):
+                        try:
+                            conn.execute(query, p)
+                            results[i] = (p[-1], True, "OK")
+                        except sqlite3.Error as e:
+                            results[i] = (p[-1], False, str(e))
+
+        self._invalidate(r[0] for r in results if r and r[1])
+        return results
+
+    @instrumented
+    def bulk_set_field(self, member_ids: Iterable[int], field: str, value) -> List[Tuple]:
+        """Ίδια τιμή σε ένα πεδίο για πολλά μέλη (ένα transaction)"""
+        return self.bulk_update_members([{"member_id": mid, field: value} for mid in member_ids])
+
+    @instrumented
+    def upsert_members(self, rows: List[Dict], key: str = "member_id") -> List[Tuple]:
+        """
+        Μαζικό INSERT ... ON CONFLICT DO UPDATE σε ένα transaction.
+        key: member_id ή φυσικό κλειδί (lodge_reg_no, grand_lodge_reg_no,
+        tax_id). Γραμμή με τιμή κλειδιού που υπάρχει ήδη ενημερώνει μόνο τα
+        πεδία που δίνει· διαφορετικά (ή χωρίς τιμή κλειδιού) γίνεται νέο μέλος.
+        Γραμμή χωρίς κλειδί που έχει ίδιο ονοματεπώνυμο/πατρώνυμο/γέννηση με
+        υπάρχον μέλος (ή με προηγούμενη γραμμή) απορρίπτεται ως διπλότυπο,
+        ώστε η επανάληψη του ίδιου import να μη διπλασιάζει μέλη.
+        Επιστρέφει [(member_id, action, message), ...] με τη σειρά των rows,
+        action = "insert" / "update" / "unchanged" / None (σφάλμα).
+        """
+        if key not in self._upsert_keys:
+            raise ValueError(f"Το {key} δεν είναι διαθέσιμο κλειδί upsert (λείπει unique index)")
+
+        results: List[Tuple] = []
+        valid: List[Tuple[int, Dict]] = []
+        for i, row in enumerate(rows):
+            row = {k: _sql_value(v) for k, v in row.items()}
+            if key != "member_id":
+                row.pop("member_id", None)
+            row[key] = _key_value(key, row.get(key))
+            unknown = [k for k in row if k not in self._member_columns]
+            if unknown:
+                results.append((row.get("member_id"), None, f"Άγνωστα πεδία: {', '.join(unknown)}"))
+            else:
+                results.append(None)
+                valid.append((i, row))
+
+        if not valid:
+            return results
+
+        changed = []
+        with self.connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+
+            existing = _existing_keys(conn, key, [row.get(key) for _, row in valid])
+            identities = _existing_identities(conn, [row for _, row in valid if row.get(key) is None])
+
+            for i, row in valid:
+                key_value = row.get(key)
+                fields = [k for k in row if k not in (key, "member_id")]
+
+                if key_value is None:
+                    identity = _identity(row)
+                    if identity in identities:
+                        duplicate = identities[identity]
+                        results[i] = (duplicate, None, (
+                            f"Υπάρχει ήδη μέλος με ίδια στοιχεία (#{duplicate})" if duplicate
+                            else "Διπλή γραμμή νέου μέλους"
+                        ))
+                        continue
+                    identities[identity] = None  # νέο μέλος αυτού του batch
+
+                if key_value in existing:
+                    # Υπάρχον μέλος: UPDATE μόνο των πεδίων της γραμμής (ένα
+                    # INSERT θα έπεφτε πρώτα στα NOT NULL πριν το ON CONFLICT)
+                    if not fields:
+                        results[i] = (existing[key_value], "unchanged", "Καμία αλλαγή")
+                        continue
+                    query = (
+                        f"UPDATE members SET {', '.join(f'{k} = ?' for k in fields)} "
+                        f"WHERE member_id = ? RETURNING member_id"
+                    )
+                    values = [row[k] for k in fields] + [existing[key_value]]
+                    action = "update"
+                else:
+                    # Νέο μέλος· το ON CONFLICT καλύπτει διπλή εμφάνιση του
+                    # ίδιου κλειδιού που γράφτηκε στο μεταξύ
+                    columns = list(row)
+                    conflict = f"ON CONFLICT({key})" + (f" WHERE {key} <> ''" if key != "member_id" else "")
+                    action_sql = (
+                        "DO UPDATE SET " + ", ".join(f"{k} = excluded.{k}" for k in fields)
+                        if fields else "DO NOTHING"
+                    )
+                    query = (
+                        f"INSERT INTO members ({', '.join(columns)}) "
+                        f"VALUES ({', '.join('?' * len(columns))}) "
+                        + (f"{conflict} {action_sql} " if key_value is not None else "")
+                        + "RETURNING member_id"
+                    )
+                    values = [row[k] for k in columns]
+                    action = "insert"
+
+                try:
+                    returned = conn.execute(query, values).fetchone()
+                except sqlite3.Error as e:
+                    results[i] = (row.get("member_id"), None, str(e))
+                    continue
+                if returned is None:  # DO NOTHING: υπάρχει ήδη, χωρίς πεδία προς αλλαγή
+                    results[i] = (None, "unchanged", "Καμία αλλαγή")
+                    continue
+
+                results[i] = (returned[0], action, "OK")
+                changed.append(returned[0])
+                if key_value is not None:
+                    existing[key_value] = returned[0]
+
+        self._invalidate(changed)
+        return results
+
+    @instrumented
+    def search_members(self, search_term: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Αναζήτηση μελών (FTS5, ταξινόμηση κατά συνάφεια).
+        Χωρίς διάκριση τόνων/πεζών-κεφαλαίων· κάθε λέξη ταιριάζει ως πρόθεμα,
+        σε επώνυμο, όνομα, κινητό, πόλη, επάγγελμα, εισηγητή και σημειώσεις.
+        """
+        match = fts_query(search_term)
+        if not match:
+            return self.get_all_members()
+
+        # Το FTS βγάζει ίδια αποτελέσματα για ίδιο match· το LIKE εξαρτάται από
+        # τον ακριβή όρο (τόνοι, πεζά/κεφαλαία), άρα κλειδί ο όρος ως έχει
+        if self._fts_enabled:
+            cache_key = ("search_members", "fts", match, limit)
+            query = """
+                SELECT
+                    m.member_id, m.last_name, m.first_name, m.fathers_name,
+                    m.birth_date, m.mobile_phone, m.email,
+                    m.initiation_date, m.current_degree, m.member_status,
+                    m.financial_status
+                FROM members_fts
+                JOIN members m ON m.member_id = members_fts.rowid
+                WHERE members_fts MATCH ?
+                ORDER BY members_fts.rank, m.last_name, m.first_name
+            """
+            params: List = [match]
+        else:
+            query = """
+                SELECT
+                    member_id, last_name, first_name, fathers_name,
+                    birth_date, mobile_phone, email,
+                    initiation_date, current_degree, member_status,
+                    financial_status
+                FROM members
+                WHERE last_name LIKE ? OR first_name LIKE ? OR mobile_phone LIKE ?
+                ORDER BY last_name, first_name
+            """
+            pattern = f"%{search_term}%"
+            params = [pattern, pattern, pattern]
+            cache_key = ("search_members", "like", search_term, limit)
+
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        def load():
+            with self.connection() as conn:
+                return pd.read_sql_query(query, conn, params=params)
+
+        return self._cached(cache_key, load)
+
+    @instrumented
+    def get_statistics(self) -> MemberStatistics:
+        """Όλα τα στατιστικά μελών (counts, cross-tabs, ποσοστά) με ένα πέρασμα"""
+        def load():
+            with self.connection() as conn:
+                return compute_member_statistics(conn)
+
+        return self._cached(("get_statistics",), load)
+
+    @instrumented
     def get_member_statistics(self) -> Dict:
         """Στατιστικά μελών"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        stats: Dict = {}
-
-        cursor.execute("SELECT COUNT(*) FROM members")
-        stats["total"] = cursor.fetchone()[0]
-
-        cursor.execute("SELECT member_status, COUNT(*) FROM members GROUP BY member_status")
-        stats["by_status"] = dict(cursor.fetchall())
-
-        cursor.execute("SELECT current_degree, COUNT(*) FROM members GROUP BY current_degree")
-        stats["by_degree"] = dict(cursor.fetchall())
-
-        cursor.execute("SELECT COUNT(*) FROM members WHERE member_status = 'Ενεργό'")
-        stats["active"] = cursor.fetchone()[0]
-
-        conn.close()
-        return stats
+        return self.get_statistics().to_dict()
+
+    @instrumented
+    def rebuild_stats(self) -> int:
+        """Ξαναχτίζει το member_stats· επιστρέφει πόσοι συνδυασμοί διορθώθηκαν"""
+        with self.connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            drift = rebuild_stats(conn)
+        self._invalidate()
+        return drift
 
     # ==================== TASKS ====================
 
+    @instrumented
     def add_task(self, title: str, description: str, due_date: str,
                  priority: str = "Μεσαία", category: str = "Γενικά"):
         """Προσθήκη εργασίας"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO tasks (title, description, due_date, priority, category)
-            VALUES (?, ?, ?, ?, ?)
-        """, (title, description, due_date, priority, category))
-        conn.commit()
-        conn.close()
-
+        with self.connection() as conn:
+            conn.execute("""
+                INSERT INTO tasks (title, description, due_date, priority, category)
+                VALUES (?, ?, ?, ?, ?)
+            """, (title, description, due_date, priority, category))
+        self._invalidate()
+
+    @instrumented
     def get_all_tasks(self, status_filter: Optional[str] = None) -> pd.DataFrame:
         """Λήψη όλων των εργασιών"""
-        conn = self.get_connection()
         query = "SELECT * FROM tasks"
         params = []
 
@@ -206,38 +795,34 @@ class Database:
             params.append(status_filter)
 
         query += " ORDER BY due_date ASC"
-        df = pd.read_sql_query(query, conn, params=params if params else None)
-        conn.close()
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query(query, conn, params=params if params else None)
 
+    @instrumented
     def update_task_status(self, task_id: int, new_status: str):
         """Ενημέρωση κατάστασης εργασίας"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         completed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S") if new_status == "Ολοκληρωμένη" else None
 
-        cursor.execute("""
-            UPDATE tasks
-            SET status = ?, completed_at = ?
-            WHERE task_id = ?
-        """, (new_status, completed_at, task_id))
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            conn.execute("""
+                UPDATE tasks
+                SET status = ?, completed_at = ?
+                WHERE task_id = ?
+            """, (new_status, completed_at, task_id))
+        self._invalidate()
 
+    @instrumented
     def delete_task(self, task_id: int):
         """Διαγραφή εργασίας"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+        self._invalidate()
 
+    @instrumented
     def get_upcoming_tasks(self, days: int = 7) -> pd.DataFrame:
         """Εργασίες που πλησιάζουν"""
         from datetime import timedelta
 
-        conn = self.get_connection()
         today = datetime.now().date()
         future = today + timedelta(days=days)
 
@@ -247,13 +832,12 @@ class Database:
             AND due_date BETWEEN ? AND ?
             ORDER BY due_date ASC
         """
-        df = pd.read_sql_query(query, conn, params=(str(today), str(future)))
-        conn.close()
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query(query, conn, params=(str(today), str(future)))
 
+    @instrumented
     def get_overdue_tasks(self) -> pd.DataFrame:
         """Εργασίες που καθυστερούν"""
-        conn = self.get_connection()
         today = datetime.now().date()
 
         query = """
@@ -262,9 +846,86 @@ class Database:
             AND due_date < ?
             ORDER BY due_date ASC
         """
-        df = pd.read_sql_query(query, conn, params=(str(today),))
-        conn.close()
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query(query, conn, params=(str(today),))
+
+
+def _sql_value(v):
+    """numpy/pandas τιμές -> απλοί Python τύποι για το sqlite3 (NaN -> None)"""
+    if v is None:
+        return None
+    if hasattr(v, "item") and not isinstance(v, (str, bytes)):
+        v = v.item()
+    if isinstance(v, float) and v != v:
+        return None
+    return v
+
+
+def _existing_ids(conn: sqlite3.Connection, table: str, column: str, ids: List, chunk: int = 500) -> set:
+    """Ποια από τα ids υπάρχουν ήδη (ένα SELECT ... IN ανά chunk)"""
+    found = set()
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    for start in range(0, len(ids), chunk):
+        part = ids[start:start + chunk]
+        marks = ", ".join("?" * len(part))
+        found.update(r[0] for r in conn.execute(
+            f"SELECT {column} FROM {table} WHERE {column} IN ({marks})", part
+        ))
+    return found
+
+
+def _key_value(column: str, value):
+    """
+    Κανονική μορφή τιμής κλειδιού upsert: member_id ακέραιος, φυσικά κλειδιά
+    κείμενο (12345678 / 12345678.0 από Excel -> "12345678"), κενό -> None
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if column == "member_id":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value  # θα απορριφθεί από το SQLite
+    value = str(value).strip()
+    return value or None
+
+
+def _existing_keys(conn: sqlite3.Connection, column: str, values: List, chunk: int = 500) -> Dict:
+    """Τιμή κλειδιού (κανονική μορφή, βλ. _key_value) -> member_id για όσες υπάρχουν ήδη"""
+    found = {}
+    values = list(dict.fromkeys(v for v in values if v is not None))
+    for start in range(0, len(values), chunk):
+        part = values[start:start + chunk]
+        marks = ", ".join("?" * len(part))
+        for value, member_id in conn.execute(
+            f"SELECT {column}, member_id FROM members WHERE {column} IN ({marks})", part
+        ):
+            found[_key_value(column, value)] = member_id
+    return found
+
+
+# Στοιχεία που ταυτίζουν ένα μέλος όταν η γραμμή δεν έχει κλειδί
+IDENTITY_COLUMNS = ("last_name", "first_name", "fathers_name", "birth_date")
+
+
+def _identity(row: Dict) -> Tuple:
+    return tuple(str(row.get(c) or "").strip().casefold() for c in IDENTITY_COLUMNS)
+
+
+def _existing_identities(conn: sqlite3.Connection, rows: List[Dict]) -> Dict[Tuple, int]:
+    """Ταυτότητα (_identity) -> member_id για υπάρχοντα μέλη με ίδιο επώνυμο με κάποια από τις rows"""
+    found: Dict[Tuple, int] = {}
+    names = list(dict.fromkeys(row.get("last_name") for row in rows if row.get("last_name")))
+    for start in range(0, len(names), 500):
+        part = names[start:start + 500]
+        for member in conn.execute(
+            f"SELECT member_id, {', '.join(IDENTITY_COLUMNS)} FROM members "
+            f"WHERE last_name IN ({', '.join('?' * len(part))})", part
+        ):
+            found.setdefault(_identity(dict(zip(IDENTITY_COLUMNS, member[1:]))), member[0])
+    return found
 
 
 _db_instance = None
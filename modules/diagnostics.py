@@ -0,0 +1,84 @@
+"""
+Diagnostics
+Κρυφή σελίδα με τις μετρήσεις του instrumentation (p50/p95/p99 ανά
+μέθοδο και SQL, αργά queries με EXPLAIN QUERY PLAN, pool/cache).
+Δεν εμφανίζεται στην πλοήγηση· ανοίγει από το app.py με
+/?diagnostics=<DIAGNOSTICS.TOKEN> όταν έχει οριστεί token στα secrets.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from modules.instrumentation import get_instrumentation
+
+_COLUMNS = ["name", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms", "total_ms", "avg_rows"]
+
+
+def _summary_frame(kind: str) -> pd.DataFrame:
+    rows = get_instrumentation().summary(kind)
+    return pd.DataFrame(rows, columns=["kind"] + _COLUMNS)[_COLUMNS]
+
+
+def render_diagnostics(db):
+    instr = get_instrumentation()
+
+    st.title("🩺 Diagnostics")
+    st.caption(f"Μετρήσεις από {instr.started_at.strftime('%d/%m/%Y %H:%M:%S')} (μνήμη του process)")
+
+    if not instr.enabled:
+        st.warning("Το instrumentation είναι απενεργοποιημένο (DB_INSTRUMENTATION=0).")
+
+    c1, c2, c3 = st.columns([1, 1, 1])
+    with c1:
+        instr.trace = st.toggle("Trace (EXPLAIN QUERY PLAN)", value=instr.trace, key="diag_trace")
+    with c2:
+        instr.slow_ms = st.number_input(
+            "Όριο αργού SQL (ms)", min_value=0.0, value=float(instr.slow_ms), step=10.0, key="diag_slow_ms"
+        )
+    with c3:
+        if st.button("🧹 Μηδενισμός μετρήσεων", key="diag_reset"):
+            instr.reset()
+            st.rerun()
+
+    tab_methods, tab_sql, tab_slow, tab_recent, tab_pool = st.tabs(
+        ["Μέθοδοι", "SQL", "Αργά queries", "Πρόσφατα", "Pool / Cache"]
+    )
+
+    with tab_methods:
+        st.dataframe(_summary_frame("method"), use_container_width=True, hide_index=True)
+
+    with tab_sql:
+        st.dataframe(_summary_frame("sql"), use_container_width=True, hide_index=True)
+
+    with tab_slow:
+        slow = instr.slow_queries()
+        if not slow:
+            st.info(f"Κανένα statement πάνω από {instr.slow_ms:g} ms.")
+        for entry in slow:
+            when = datetime.fromtimestamp(entry["ts"]).strftime("%H:%M:%S")
+            with st.expander(f"{entry['ms']:.1f} ms · {when} · {entry['sql'][:90]}"):
+                st.code(entry["sql"], language="sql")
+                st.write(f"Γραμμές: {entry['rows'] if entry['rows'] is not None else '—'}")
+                if entry["plan"]:
+                    st.code("\n".join(entry["plan"]), language="text")
+                elif not instr.trace:
+                    st.caption("Ενεργοποίησε το trace για EXPLAIN QUERY PLAN.")
+
+    with tab_recent:
+        kind = st.selectbox("Είδος", ["method", "sql", "pool"], key="diag_recent_kind")
+        recent = pd.DataFrame(instr.recent(200, kind))
+        if not recent.empty:
+            recent["ts"] = pd.to_datetime(recent["ts"], unit="s")
+        st.dataframe(recent, use_container_width=True, hide_index=True)
+
+    with tab_pool:
+        left, right = st.columns(2)
+        with left:
+            st.subheader("Connection pool")
+            st.json(db.pool_stats())
+            st.dataframe(_summary_frame("pool"), use_container_width=True, hide_index=True)
+        with right:
+            st.subheader("Query cache")
+            st.json(db.cache_stats())
@@ -1,83 +1,609 @@
 """
 Email Notifications Module (Optional)
 Λειτουργεί μόνο αν υπάρχουν email secrets
+
+Τα μαζικά μηνύματα μπαίνουν στο email_outbox της βάσης και τα στέλνει
+στο background το DeliveryEngine: λίγοι workers, ο καθένας με μία
+ανοιχτή (authenticated) SMTP σύνδεση για πολλά μηνύματα, και retry με
+exponential backoff για προσωρινά σφάλματα.
 """
 
+import hashlib
+import random
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import socket
+import sqlite3
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
+from email.header import Header
+from email.mime.text import MIMEText
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import formatdate, make_msgid
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from modules.database import get_pool
+from modules.email_templates import EmailTemplate, get_template
+from modules.migrations import migrate
+
+
+# ==================== SMTP ====================
+
+class DeliveryUnavailable(Exception):
+    """
+    Ο server δεν δέχεται κανένα μήνυμα αυτή τη στιγμή (σύνδεση, HELO,
+    STARTTLS, login ή άρνηση αποστολέα): δεν φταίει ο παραλήπτης
+    """
+
+
+class SMTPSender:
+    """
+    Μία SMTP σύνδεση που ανοίγει στο πρώτο μήνυμα (STARTTLS + login μία
+    φορά) και ξαναχρησιμοποιείται. Αν ο server την έκλεισε στο μεταξύ,
+    ξανασυνδέεται και ξαναστέλνει μία φορά.
+
+    config: smtp_server, smtp_port, sender_email, sender_password,
+    προαιρετικά use_tls (default True) και timeout.
+    """
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self._smtp: Optional[smtplib.SMTP] = None
+        self.connections = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        try:
+            smtp = smtplib.SMTP(
+                self.config['smtp_server'], int(self.config['smtp_port']), timeout=self.config.get('timeout', 30)
+            )
+        except (smtplib.SMTPException, OSError) as e:
+            raise DeliveryUnavailable(f"{type(e).__name__}: {e}") from e
+        try:
+            if self.config.get('use_tls', True):
+                smtp.starttls()
+            if self.config.get('sender_password'):
+                smtp.login(self.config['sender_email'], self.config['sender_password'])
+        except (smtplib.SMTPException, OSError) as e:
+            smtp.close()
+            raise DeliveryUnavailable(f"{type(e).__name__}: {e}") from e
+        except BaseException:
+            smtp.close()
+            raise
+        self.connections += 1
+        return smtp
+
+    def _sendmail(self, to_email: str, data: bytes):
+        try:
+            self._smtp.sendmail(self.config['sender_email'], [to_email], data)
+        except smtplib.SMTPSenderRefused as e:
+            raise DeliveryUnavailable(f"{type(e).__name__}: {e}") from e
+
+    def send(self, to_email: str, data: bytes):
+        """
+        Αποστολή έτοιμου (encode_message) μηνύματος. DeliveryUnavailable
+        για ό,τι αφορά τον server/λογαριασμό, smtplib σφάλματα για το μήνυμα.
+        """
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._sendmail(to_email, data)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._smtp = self._connect()
+            self._sendmail(to_email, data)
+
+    def close(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Σταθερό boundary: το base64 body δεν μπορεί να περιέχει "===" στη μέση γραμμής
+_BOUNDARY = "===============" + "".join(random.choice("0123456789") for _ in range(19)) + "=="
+
+
+@lru_cache(maxsize=64)
+def _html_part(body: str) -> bytes:
+    """
+    Το HTML part (headers + base64) έτοιμο σε bytes. Ίδιο body (π.χ. ίδια
+    ανακοίνωση σε όλο το μητρώο) κωδικοποιείται μία φορά για όλους.
+    """
+    return MIMEText(body, 'html', 'utf-8').as_bytes(policy=SMTP_POLICY)
+
+
+@lru_cache(maxsize=256)
+def _header(value: str) -> str:
+    if '\r' in value or '\n' in value:
+        raise ValueError(f"Μη έγκυρη τιμή header: {value!r}")
+    if value.isascii():
+        return value
+    return Header(value, 'utf-8').encode(linesep='\r\n')
+
+
+@lru_cache(maxsize=16)
+def _msgid_domain(sender: str) -> str:
+    """Domain του Message-ID: του αποστολέα (το make_msgid χωρίς domain κάνει DNS lookup κάθε φορά)"""
+    domain = sender.rpartition('@')[2].strip('> ')
+    return domain or socket.getfqdn()
+
+
+def encode_message(sender: str, to_email: str, subject: str, body: str) -> bytes:
+    """HTML μήνυμα (utf-8, multipart/mixed όπως το MIMEMultipart) σε bytes για SMTP"""
+    head = (
+        f'Content-Type: multipart/mixed; boundary="{_BOUNDARY}"\r\n'
+        "MIME-Version: 1.0\r\n"
+        f"Date: {formatdate(localtime=True)}\r\n"
+        f"Message-ID: {make_msgid(domain=_msgid_domain(sender))}\r\n"
+        f"From: {_header(sender)}\r\n"
+        f"To: {_header(to_email)}\r\n"
+        f"Subject: {_header(subject)}\r\n"
+        "\r\n"
+        f"--{_BOUNDARY}\r\n"
+    )
+    return b"".join((head.encode('ascii'), _html_part(body), f"\r\n--{_BOUNDARY}--\r\n".encode('ascii')))
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """
+    5xx για το ίδιο το μήνυμα (RCPT/DATA): δεν έχει νόημα νέα προσπάθεια.
+    Σφάλματα σύνδεσης/login/αποστολέα (DeliveryUnavailable) δεν είναι ποτέ
+    μόνιμα για το μήνυμα· τα χειρίζεται το DeliveryEngine.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return bool(error.recipients) and all(
+            500 <= code < 600 for code, _ in error.recipients.values()
+        )
+    if isinstance(error, smtplib.SMTPDataError):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+# ==================== OUTBOX ====================
+
+class Outbox:
+    """
+    Ο πίνακας email_outbox: pending -> sending -> sent / failed.
+    Τα μηνύματα "κλειδώνονται" (claim) ατομικά με UPDATE ... RETURNING,
+    οπότε πολλοί workers/processes δεν στέλνουν ποτέ το ίδιο μήνυμα.
+    """
+
+    def __init__(self, db_path: str = "lodge_members.db"):
+        self.pool = get_pool(db_path)
+        with self.pool.connection() as conn:
+            migrate(conn)  # email_outbox
+
+    def enqueue(self, messages: Iterable[Tuple], kind: Optional[str] = None,
+                retry_failed: bool = False) -> List[Optional[int]]:
+        """
+        (to_email, subject, body[, dedupe_key]) -> outbox_id ανά μήνυμα.
+        Μήνυμα με dedupe_key που υπάρχει ήδη στο outbox παραλείπεται (None),
+        οπότε η επανάληψη είναι ασφαλής. retry_failed=True: αν το υπάρχον
+        είχε αποτύχει οριστικά, ξαναμπαίνει στην ουρά (με το νέο περιεχόμενο).
+        """
+        on_conflict = (
+            "ON CONFLICT(dedupe_key) WHERE dedupe_key IS NOT NULL DO UPDATE SET "
+            "to_email = excluded.to_email, subject = excluded.subject, body = excluded.body, "
+            "status = 'pending', attempts = 0, last_error = NULL, next_attempt_at = datetime('now') "
+            "WHERE email_outbox.status = 'failed'"
+            if retry_failed else "ON CONFLICT DO NOTHING"
+        )
+        ids = []
+        with self.pool.connection() as conn:
+            for to_email, subject, body, *rest in messages:
+                row = conn.execute(
+                    "INSERT INTO email_outbox (to_email, subject, body, kind, dedupe_key) "
+                    f"VALUES (?, ?, ?, ?, ?) {on_conflict} RETURNING outbox_id",
+                    (to_email, subject, body, kind, rest[0] if rest else None),
+                ).fetchone()
+                ids.append(row[0] if row else None)
+        return ids
+
+    def claim(self, limit: int) -> List[Tuple]:
+        """Έως limit μηνύματα που πρέπει να σταλούν τώρα, σε κατάσταση sending"""
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                UPDATE email_outbox
+                SET status = 'sending', claimed_at = datetime('now'), attempts = attempts + 1
+                WHERE outbox_id IN (
+                    SELECT outbox_id FROM email_outbox
+                    WHERE status = 'pending' AND next_attempt_at <= datetime('now')
+                    ORDER BY next_attempt_at, outbox_id
+                    LIMIT ?
+                )
+                RETURNING outbox_id, to_email, subject, body, attempts
+            """, (limit,)).fetchall()
+
+    def mark_sent(self, outbox_id: int):
+        with self.pool.connection() as conn:
+            conn.execute(
+                "UPDATE email_outbox SET status = 'sent', sent_at = datetime('now'), last_error = NULL "
+                "WHERE outbox_id = ?",
+                (outbox_id,),
+            )
+
+    def mark_failed(self, outbox_id: int, error: str):
+        with self.pool.connection() as conn:
+            conn.execute(
+                "UPDATE email_outbox SET status = 'failed', last_error = ? WHERE outbox_id = ?",
+                (error, outbox_id),
+            )
+
+    def retry_later(self, outbox_id: int, error: str, delay_seconds: float):
+        with self.pool.connection() as conn:
+            conn.execute(
+                "UPDATE email_outbox SET status = 'pending', last_error = ?, "
+                "next_attempt_at = datetime('now', ?) WHERE outbox_id = ?",
+                (error, f"+{int(delay_seconds)} seconds", outbox_id),
+            )
+
+    def release(self, outbox_ids: List[int], error: str, delay_seconds: float):
+        """
+        Κλειδωμένα μηνύματα πίσω σε pending χωρίς να μετρήσει η προσπάθεια
+        (ο server δεν ήταν διαθέσιμος, όχι πρόβλημα του μηνύματος)
+        """
+        if not outbox_ids:
+            return
+        with self.pool.connection() as conn:
+            conn.execute(
+                "UPDATE email_outbox SET status = 'pending', attempts = MAX(attempts - 1, 0), last_error = ?, "
+                f"next_attempt_at = datetime('now', ?) WHERE outbox_id IN ({', '.join('?' * len(outbox_ids))}) "
+                "AND status = 'sending'",
+                (error, f"+{int(delay_seconds)} seconds", *outbox_ids),
+            )
+
+    def requeue_stale(self, older_than_minutes: int = 10) -> int:
+        """Μηνύματα που έμειναν 'sending' (π.χ. restart στη μέση) ξανά σε pending"""
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "UPDATE email_outbox SET status = 'pending' "
+                "WHERE status = 'sending' AND claimed_at <= datetime('now', ?)",
+                (f"-{int(older_than_minutes)} minutes",),
+            ).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Πλήθος μηνυμάτων ανά κατάσταση"""
+        with self.pool.connection() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM email_outbox GROUP BY status").fetchall())
+
+    def due_count(self) -> int:
+        """Μηνύματα pending που μπορούν να σταλούν τώρα"""
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM email_outbox WHERE status = 'pending' AND next_attempt_at <= datetime('now')"
+            ).fetchone()[0]
+
+    def recent(self, status: Optional[str] = None, limit: int = 20) -> List[Tuple]:
+        """Τελευταία μηνύματα (outbox_id, kind, to_email, subject, status, attempts, last_error, sent_at)"""
+        query = (
+            "SELECT outbox_id, kind, to_email, subject, status, attempts, last_error, sent_at FROM email_outbox"
+        )
+        params: List = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY outbox_id DESC LIMIT ?"
+        params.append(limit)
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchall()
+
+
+# ==================== DELIVERY ENGINE ====================
+
+class DeliveryEngine:
+    """
+    Background αποστολή του outbox με `workers` threads. Κάθε worker
+    παίρνει μηνύματα σε batches και τα στέλνει από τη δική του SMTP
+    σύνδεση, την οποία κλείνει όταν δεν έχει άλλη δουλειά.
+
+    Αν ο server/λογαριασμός δεν δέχεται τίποτα (λάθος κωδικός, άρνηση
+    αποστολέα, server εκτός), το batch επιστρέφει στην ουρά χωρίς να
+    χρεωθεί προσπάθεια και όλοι οι workers σταματούν με αυξανόμενο backoff.
+    """
+
+    def __init__(self, config: Dict, outbox: Outbox, workers: int = 2, batch_size: int = 20,
+                 max_attempts: int = 5, backoff_base: float = 30.0, backoff_max: float = 3600.0,
+                 poll_interval: float = 5.0):
+        self.config = config
+        self.outbox = outbox
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.outages = 0
+        self.last_outage: Optional[str] = None
+        self._consecutive_outages = 0
+        self._paused_until = 0.0
+
+    def backoff(self, attempts: int) -> float:
+        """Καθυστέρηση πριν την επόμενη προσπάθεια (exponential + jitter)"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(1.0, 1.1)
+
+    @property
+    def paused(self) -> float:
+        """Δευτερόλεπτα μέχρι να ξαναδοκιμάσει ο server μετά από διακοπή (0 = ενεργό)"""
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    def _outage(self, error: str) -> float:
+        with self._lock:
+            self.outages += 1
+            self._consecutive_outages += 1
+            self.last_outage = error
+            delay = self.backoff(self._consecutive_outages)
+            self._paused_until = time.monotonic() + delay
+            return delay
+
+    def deliver(self, sender: SMTPSender, item) -> bool:
+        """
+        Αποστολή ενός κλειδωμένου μηνύματος και ενημέρωση του outbox.
+        DeliveryUnavailable περνά στον caller (το μήνυμα μένει κλειδωμένο).
+        """
+        outbox_id, to_email, subject, body, attempts = item
+        try:
+            sender.send(to_email, encode_message(self.config['sender_email'], to_email, subject, body))
+        except DeliveryUnavailable:
+            sender.close()
+            raise
+        except Exception as e:
+            sender.close()  # η σύνδεση μπορεί να έμεινε σε άγνωστη κατάσταση
+            error = f"{type(e).__name__}: {e}"
+            if is_permanent_error(e) or attempts >= self.max_attempts:
+                self.outbox.mark_failed(outbox_id, error)
+                with self._lock:
+                    self.failed += 1
+            else:
+                self.outbox.retry_later(outbox_id, error, self.backoff(attempts))
+                with self._lock:
+                    self.retried += 1
+            return False
+        self.outbox.mark_sent(outbox_id)
+        with self._lock:
+            self.sent += 1
+            self._consecutive_outages = 0
+        return True
+
+    def deliver_batch(self, sender: SMTPSender, batch: List[Tuple]) -> int:
+        """
+        Αποστολή ενός batch· σε DeliveryUnavailable ό,τι δεν στάλθηκε
+        επιστρέφει στην ουρά, το engine μπαίνει σε παύση και το σφάλμα περνά
+        """
+        sent = 0
+        for n, item in enumerate(batch):
+            try:
+                sent += self.deliver(sender, item)
+            except DeliveryUnavailable as e:
+                delay = self._outage(str(e))
+                self.outbox.release([rest[0] for rest in batch[n:]], str(e), delay)
+                raise
+        return sent
+
+    def drain(self, limit: Optional[int] = None) -> int:
+        """
+        Σύγχρονη αποστολή (στο τρέχον thread) όσων είναι due· επιστρέφει
+        πόσα στάλθηκαν. Σταματά αμέσως αν ο server δεν είναι διαθέσιμος.
+        """
+        sent = 0
+        processed = 0
+        with SMTPSender(self.config) as sender:
+            while (limit is None or processed < limit) and not self.paused:
+                size = self.batch_size if limit is None else min(self.batch_size, limit - processed)
+                batch = self.outbox.claim(size)
+                if not batch:
+                    break
+                try:
+                    sent += self.deliver_batch(sender, batch)
+                except DeliveryUnavailable:
+                    break
+                processed += len(batch)
+        return sent
+
+    def _worker(self):
+        sender = SMTPSender(self.config)
+        try:
+            while not self._stop.is_set():
+                pause = self.paused
+                if pause:
+                    self._stop.wait(pause)
+                    continue
+                try:
+                    batch = self.outbox.claim(self.batch_size)
+                except sqlite3.OperationalError:
+                    batch = []  # π.χ. database locked: ξανά στο επόμενο poll
+                if not batch:
+                    sender.close()
+                    if self._wake.wait(self.poll_interval):
+                        self._wake.clear()
+                    continue
+                try:
+                    self.deliver_batch(sender, batch)
+                except DeliveryUnavailable:
+                    pass  # παύση όλων των workers (self.paused)
+        finally:
+            sender.close()
+
+    def start(self):
+        """Εκκίνηση των workers (μία φορά)"""
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if self._threads:
+                return
+            self._stop.clear()
+            self.outbox.requeue_stale()
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"email-delivery-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def wake(self):
+        """Νέα μηνύματα στο outbox: ξεκίνα/ξύπνα τους workers"""
+        self.start()
+        self._wake.set()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": sum(t.is_alive() for t in self._threads),
+                "sent": self.sent,
+                "failed": self.failed,
+                "retried": self.retried,
+                "outages": self.outages,
+                "last_outage": self.last_outage,
+                "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+                "outbox": self.outbox.stats(),
+            }
+
+
+_engines: Dict[str, DeliveryEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_delivery_engine(config: Dict, db_path: str = "lodge_members.db") -> DeliveryEngine:
+    """Κοινό engine ανά βάση (οι workers ξεκινούν στο πρώτο wake)"""
+    with _engines_lock:
+        engine = _engines.get(db_path)
+        if engine is None:
+            engine = DeliveryEngine(config, Outbox(db_path))
+            _engines[db_path] = engine
+        return engine
+
+
+# ==================== EMAIL MANAGER ====================
+
+def task_reminder_message(task_title, due_date) -> Tuple[str, str]:
+    """(subject, body) υπενθύμισης εργασίας"""
+    return get_template("task_reminder").render({"task_title": task_title, "due_date": due_date})
+
 
 class EmailManager:
     """Διαχείριση email notifications (προαιρετικό)"""
-    
-    def __init__(self, config):
+
+    def __init__(self, config, db_path: str = "lodge_members.db"):
         """
         config: dict με keys smtp_server, smtp_port, sender_email, sender_password
+        (προαιρετικά use_tls)
         """
         self.config = config
         self.enabled = config is not None
-    
+        self.db_path = db_path
+
+    @property
+    def engine(self) -> DeliveryEngine:
+        return get_delivery_engine(self.config, self.db_path)
+
     def send_notification(self, to_email, subject, body):
-        """Αποστολή email"""
+        """Αποστολή email (άμεσα, με δική του σύνδεση)"""
         if not self.enabled:
             return False, "Email not configured"
-        
+
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.config['sender_email']
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'html', 'utf-8'))
-            
-            server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'])
-            server.starttls()
-            server.login(self.config['sender_email'], self.config['sender_password'])
-            server.send_message(msg)
-            server.quit()
-            
+            with SMTPSender(self.config) as sender:
+                sender.send(to_email, encode_message(self.config['sender_email'], to_email, subject, body))
             return True, "Email sent successfully"
         except Exception as e:
             return False, str(e)
-    
+
+    def queue_notifications(self, messages: Iterable[Tuple], kind: Optional[str] = None,
+                            wake: bool = True, retry_failed: bool = False) -> List[Optional[int]]:
+        """
+        (to_email, subject, body[, dedupe_key]) στο outbox· η αποστολή γίνεται
+        στο background (wake=False: μόνο καταχώριση, π.χ. από τον scheduler).
+        Επιστρέφει outbox_id ανά μήνυμα (None αν υπήρχε ήδη).
+        """
+        if not self.enabled:
+            return []
+        ids = self.engine.outbox.enqueue(messages, kind=kind, retry_failed=retry_failed)
+        if wake and any(ids):
+            self.engine.wake()
+        return ids
+
+    def queue_task_reminders(self, tasks: Iterable[Dict], default_to: str, day: Optional[str] = None,
+                             wake: bool = True) -> List[int]:
+        """
+        Υπενθυμίσεις για εργασίες (γραμμές του tasks), το πολύ μία ανά εργασία
+        ανά ημέρα. Παραλήπτης το assigned_to αν είναι email, αλλιώς default_to.
+        """
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        messages = []
+        for task in tasks:
+            assigned = str(task.get('assigned_to') or '').strip()
+            to_email = assigned if '@' in assigned else default_to
+            if not to_email:
+                continue
+            subject, body = task_reminder_message(task['title'], task['due_date'])
+            messages.append((to_email, subject, body, f"task:{task['task_id']}:{day}"))
+        ids = self.queue_notifications(messages, kind='task_reminder', wake=wake)
+        return [outbox_id for outbox_id in ids if outbox_id]
+
     def send_task_reminder(self, to_email, task_title, due_date):
         """Υπενθύμιση για εργασία"""
-        subject = f"Υπενθύμιση: {task_title}"
-        body = f"""
-        <html>
-        <body>
-            <h2>Υπενθύμιση Εργασίας</h2>
-            <p><strong>Εργασία:</strong> {task_title}</p>
-            <p><strong>Προθεσμία:</strong> {due_date}</p>
-            <p>Η εργασία πλησιάζει την προθεσμία της.</p>
-            <br>
-            <p>Στοά ΑΚΡΟΠΟΛΙΣ</p>
-        </body>
-        </html>
-        """
+        subject, body = task_reminder_message(task_title, due_date)
         return self.send_notification(to_email, subject, body)
-    
+
     def send_meeting_reminder(self, to_emails, meeting_date, agenda):
-        """Υπενθύμιση για συνεδρία"""
-        subject = "Υπενθύμιση Συνεδρίας ΑΚΡΟΠΟΛΙΣ"
-        body = f"""
-        <html>
-        <body>
-            <h2>Προσεχής Συνεδρία</h2>
-            <p><strong>Ημερομηνία:</strong> {meeting_date}</p>
-            <p><strong>Θέματα Ημερήσιας Διάταξης:</strong></p>
-            <p>{agenda}</p>
-            <br>
-            <p>Στοά ΑΚΡΟΠΟΛΙΣ Υπ ΑΡΙΘΜ 84</p>
-        </body>
-        </html>
-        """
-        
-        results = []
-        for email in to_emails:
-            success, msg = self.send_notification(email, subject, body)
-            results.append((email, success, msg))
-        
-        return results
+        """
+        Υπενθύμιση για συνεδρία: όλοι οι παραλήπτες μπαίνουν στο outbox και
+        η συνάρτηση επιστρέφει αμέσως (email, True, "queued #id"). Το ίδιο
+        μήνυμα (συνεδρία + περιεχόμενο) στον ίδιο παραλήπτη δεν ξαναμπαίνει
+        στην ουρά: (email, False, "already queued/sent"). Διορθωμένη ατζέντα
+        είναι νέο μήνυμα, και ό,τι είχε αποτύχει ξαναδοκιμάζεται.
+        """
+        if not self.enabled:
+            return [(email, False, "Email not configured") for email in to_emails]
 
+        subject, body = get_template("meeting_reminder").render({"meeting_date": meeting_date, "agenda": agenda})
+        to_emails = list(to_emails)
+        digest = hashlib.sha256(f"{subject}\x00{body}".encode("utf-8")).hexdigest()[:16]
+        ids = self.queue_notifications(
+            ((email, subject, body, f"meeting:{meeting_date}:{digest}:{email}") for email in to_emails),
+            kind='meeting_reminder', retry_failed=True,
+        )
+        return [
+            (email, True, f"queued #{outbox_id}") if outbox_id else (email, False, "already queued/sent")
+            for email, outbox_id in zip(to_emails, ids)
+        ]
+
+    def queue_member_merge(self, template: Union[str, EmailTemplate], members: pd.DataFrame,
+                           kind: str = "member_merge", dedupe: Optional[str] = None) -> int:
+        """
+        Mail merge σε μέλη (π.χ. db.query_members(...)): ένα μήνυμα ανά μέλος
+        με email, με τα πεδία του (όνομα, βαθμός, οικονομική τακτοποίηση).
+        Με dedupe (π.χ. "dues-2026") το ίδιο μέλος δεν ξαναπαίρνει το ίδιο μήνυμα.
+        Επιστρέφει πόσα μπήκαν στο outbox.
+        """
+        if isinstance(template, str):
+            template = get_template(template)
+        messages = template.merge(members)
+        if dedupe:
+            messages = [(email, subject, body, f"{kind}:{dedupe}:{email}") for email, subject, body in messages]
+        return sum(1 for outbox_id in self.queue_notifications(messages, kind=kind) if outbox_id)
@@ -0,0 +1,212 @@
+"""
+Email Templates
+Πρότυπα email που μεταγλωττίζονται μία φορά (string.Template) και
+γεμίζουν με πεδία μέλους (mail merge) σε ένα πέρασμα πάνω σε DataFrame.
+Τα πεδία μέλους (MERGE_FIELDS, στοιχεία από το μητρώο) μπαίνουν στο HTML
+body με escaping· τα υπόλοιπα (ατζέντα, τίτλος εργασίας, ημερομηνίες) τα
+γράφει ο Γραμματέας και μπαίνουν ως HTML, όπως πάντα. Στο subject ως έχουν.
+"""
+
+import html
+from string import Template
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+# Πεδία merge που παράγονται από μια γραμμή μέλους (στήλες του query_members)
+MERGE_FIELDS = ("full_name", "first_name", "last_name", "degree", "financial_status", "member_status", "email")
+
+
+class CompiledText:
+    """
+    Κείμενο με ${name} χωρισμένο μία φορά σε σταθερά κομμάτια και πεδία,
+    ώστε η απόδοση να είναι απλό "".join (χωρίς regex ανά παραλήπτη)
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        literals: List[str] = []
+        fields: List[str] = []
+        current = []
+        position = 0
+        for match in Template.pattern.finditer(text):
+            current.append(text[position:match.start()])
+            position = match.end()
+            if match.group("escaped") is not None:
+                current.append("$")
+            elif match.group("named") or match.group("braced"):
+                literals.append("".join(current))
+                current = []
+                fields.append(match.group("named") or match.group("braced"))
+            else:
+                raise ValueError(f"Μη έγκυρο placeholder στη θέση {match.start()}: {text[match.start():match.start() + 20]!r}")
+        current.append(text[position:])
+        literals.append("".join(current))
+        self.literals = tuple(literals)
+        self.fields = tuple(fields)
+        self.static = "".join(literals) if not fields else None
+
+    def render(self, values) -> str:
+        """values: μία τιμή (str) ανά θέση του self.fields"""
+        if self.static is not None:
+            return self.static
+        parts = [""] * (2 * len(self.fields) + 1)
+        parts[0::2] = self.literals
+        parts[1::2] = values
+        return "".join(parts)
+
+
+class EmailTemplate:
+    """Subject + HTML body με πεδία ${name}, μεταγλωττισμένα μία φορά"""
+
+    def __init__(self, subject: str, body: str):
+        self.subject = CompiledText(subject)
+        self.body = CompiledText(body)
+        self.fields = frozenset(self.subject.fields + self.body.fields)
+
+    def render(self, values: Dict) -> Tuple[str, str]:
+        """(subject, body) για ένα σύνολο τιμών"""
+        missing = self.fields - set(values)
+        if missing:
+            raise KeyError(f"Λείπουν πεδία template: {', '.join(sorted(missing))}")
+        subject = self.subject.render([_text(values[k]) for k in self.subject.fields])
+        body = self.body.render([_body_value(k, values[k]) for k in self.body.fields])
+        return subject, body
+
+    def partial(self, **values) -> "EmailTemplate":
+        """Νέο template με κάποια πεδία ήδη συμπληρωμένα (π.χ. ημερομηνία συνεδρίας)"""
+        subject = Template(self.subject.text).safe_substitute({k: _dollar(_text(v)) for k, v in values.items()})
+        body = Template(self.body.text).safe_substitute(
+            {k: _dollar(_body_value(k, v)) for k, v in values.items()}
+        )
+        return EmailTemplate(subject, body)
+
+    def merge(self, members: pd.DataFrame) -> List[Tuple[str, str, str]]:
+        """
+        (email, subject, body) για κάθε μέλος με έγκυρο email. Το escaping
+        γίνεται μία φορά ανά διαφορετική τιμή κάθε στήλης, και αν το
+        template δεν έχει πεδία μέλους το κείμενο αποδίδεται μία φορά.
+        """
+        unknown = self.fields - set(MERGE_FIELDS)
+        if unknown:
+            raise KeyError(f"Άγνωστα πεδία merge: {', '.join(sorted(unknown))}")
+        frame = merge_frame(members)
+        frame = frame[frame["email"].str.contains("@", regex=False)]
+
+        if not self.fields:
+            subject, body = self.render({})
+            return [(email, subject, body) for email in frame["email"]]
+
+        escaped = {f: _escaped(frame[f]) for f in set(self.body.fields)}
+        subject_cols = [frame[f].tolist() for f in self.subject.fields]
+        body_cols = [escaped[f].tolist() for f in self.body.fields]
+        n_subject = len(subject_cols)
+        render_subject, render_body = self.subject.render, self.body.render
+
+        return [
+            (email, render_subject(values[:n_subject]), render_body(values[n_subject:]))
+            for email, *values in zip(frame["email"].tolist(), *subject_cols, *body_cols)
+        ]
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _body_value(name: str, value) -> str:
+    """Τιμή για το HTML body: escaping μόνο στα πεδία μέλους"""
+    text = _text(value)
+    return html.escape(text) if name in MERGE_FIELDS else text
+
+
+def _dollar(text: str) -> str:
+    """Τιμή που μπαίνει μέσα σε template (partial): τα $ να μη γίνουν placeholders"""
+    return text.replace("$", "$$")
+
+
+def _escaped(column: pd.Series) -> pd.Series:
+    mapping = {value: html.escape(value) for value in column.unique()}
+    return column.map(mapping)
+
+
+def merge_frame(members: pd.DataFrame) -> pd.DataFrame:
+    """Στήλες MERGE_FIELDS (κείμενο, χωρίς NaN) από DataFrame μελών"""
+    def column(name: str) -> pd.Series:
+        if name in members.columns:
+            return members[name].fillna("").astype(str).str.strip()
+        return pd.Series("", index=members.index)
+
+    frame = pd.DataFrame({
+        "first_name": column("first_name"),
+        "last_name": column("last_name"),
+        "degree": column("current_degree"),
+        "financial_status": column("financial_status"),
+        "member_status": column("member_status"),
+        "email": column("email"),
+    })
+    frame["full_name"] = (frame["last_name"] + " " + frame["first_name"]).str.strip()
+    return frame[list(MERGE_FIELDS)]
+
+
+# ==================== TEMPLATES ====================
+
+TEMPLATES: Dict[str, EmailTemplate] = {
+    "task_reminder": EmailTemplate(
+        "Υπενθύμιση: ${task_title}",
+        """
+        <html>
+        <body>
+            <h2>Υπενθύμιση Εργασίας</h2>
+            <p><strong>Εργασία:</strong> ${task_title}</p>
+            <p><strong>Προθεσμία:</strong> ${due_date}</p>
+            <p>Η εργασία πλησιάζει την προθεσμία της.</p>
+            <br>
+            <p>Στοά ΑΚΡΟΠΟΛΙΣ</p>
+        </body>
+        </html>
+        """,
+    ),
+    "meeting_reminder": EmailTemplate(
+        "Υπενθύμιση Συνεδρίας ΑΚΡΟΠΟΛΙΣ",
+        """
+        <html>
+        <body>
+            <h2>Προσεχής Συνεδρία</h2>
+            <p><strong>Ημερομηνία:</strong> ${meeting_date}</p>
+            <p><strong>Θέματα Ημερήσιας Διάταξης:</strong></p>
+            <p>${agenda}</p>
+            <br>
+            <p>Στοά ΑΚΡΟΠΟΛΙΣ Υπ ΑΡΙΘΜ 84</p>
+        </body>
+        </html>
+        """,
+    ),
+    "member_status": EmailTemplate(
+        "Στοά ΑΚΡΟΠΟΛΙΣ: ενημέρωση στοιχείων (${full_name})",
+        """
+        <html>
+        <body>
+            <h2>Ενημέρωση Στοιχείων Μέλους</h2>
+            <p>Αγαπητέ Αδελφέ ${full_name},</p>
+            <p><strong>Βαθμός:</strong> ${degree}</p>
+            <p><strong>Οικονομική Τακτοποίηση:</strong> ${financial_status}</p>
+            <p>Για οποιαδήποτε διόρθωση επικοινώνησε με τη Γραμματεία.</p>
+            <br>
+            <p>Στοά ΑΚΡΟΠΟΛΙΣ Υπ ΑΡΙΘΜ 84</p>
+        </body>
+        </html>
+        """,
+    ),
+}
+
+
+def get_template(name: str) -> EmailTemplate:
+    """Μεταγλωττισμένο template από το TEMPLATES"""
+    return TEMPLATES[name]
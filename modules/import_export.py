@@ -0,0 +1,480 @@
+"""
+Import / Export
+Εξαγωγή μητρώου σε Excel/CSV/Parquet με streaming από τη βάση και
+import σε chunks με έλεγχο τιμών και εγγραφή μόνο των αλλαγών
+"""
+
+import csv
+import io
+import os
+import sqlite3
+import tempfile
+from datetime import date, datetime
+from importlib.util import find_spec
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.database import get_pool
+
+# (στήλη βάσης, επικεφαλίδα, μορφή) με τη σειρά που εμφανίζονται στο αρχείο.
+# Μορφές: "int" αριθμός, "text" κείμενο που πρέπει να μείνει ως έχει
+# (ΑΦΜ, τηλέφωνα, ΤΚ — αλλιώς το Excel τρώει τα αρχικά μηδενικά), None γενικό.
+EXPORT_COLUMNS: List[Tuple[str, str, Optional[str]]] = [
+    ("member_id", "Α/Α", "int"),
+    ("lodge_reg_no", "Αρ. Μητρώου Στοάς", "text"),
+    ("grand_lodge_reg_no", "Αρ. Μητρώου Μεγάλης Στοάς", "text"),
+    ("last_name", "Επώνυμο", None),
+    ("first_name", "Όνομα", None),
+    ("fathers_name", "Πατρώνυμο", None),
+    ("birth_date", "Ημ/νία Γέννησης", "text"),
+    ("birth_place", "Τόπος Γέννησης", None),
+    ("profession", "Επάγγελμα", None),
+    ("tax_id", "ΑΦΜ", "text"),
+    ("id_number", "Αρ. Ταυτότητας", "text"),
+    ("address", "Διεύθυνση", None),
+    ("postal_code", "ΤΚ", "text"),
+    ("city", "Πόλη", None),
+    ("home_phone", "Τηλ. Οικίας", "text"),
+    ("mobile_phone", "Κινητό", "text"),
+    ("email", "Email", None),
+    ("initiation_date", "Ημ/νία Μύησης", "text"),
+    ("initiation_diploma", "Αρ. Διπλώματος", "text"),
+    ("current_degree", "Βαθμός", None),
+    ("initiation_lodge", "Στοά Μύησης", None),
+    ("sponsor", "Εισηγητής", None),
+    ("member_status", "Κατάσταση", None),
+    ("financial_status", "Οικον. Τακτοποίηση", None),
+    ("last_payment_date", "Τελ. Πληρωμή", "text"),
+    ("notes", "Παρατηρήσεις", None),
+]
+
+# Επικεφαλίδα -> στήλη βάσης (για το import του ίδιου αρχείου)
+HEADER_TO_COLUMN: Dict[str, str] = {header: column for column, header, _ in EXPORT_COLUMNS}
+
+EXPORT_FORMATS = {
+    "xlsx": ("Excel (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV (.csv)", "text/csv"),
+}
+# Parquet μόνο αν υπάρχει το (προαιρετικό) pyarrow
+if find_spec("pyarrow") is not None:
+    EXPORT_FORMATS["parquet"] = ("Parquet (.parquet)", "application/octet-stream")
+
+_COLUMN_WIDTHS = {"int": 8, "text": 16, None: 20}
+
+# Επιτρεπτές τιμές ανά πεδίο (όπως στις επιλογές των σελίδων)
+MEMBER_CHOICES: Dict[str, Tuple[str, ...]] = {
+    "current_degree": ("Μαθητής", "Εταίρος", "Δάσκαλος"),
+    "member_status": ("Ενεργό", "Ανενεργό", "Αποχωρήσαν", "Διαγραφέν"),
+    "financial_status": ("Ναι", "Όχι"),
+}
+
+REQUIRED_COLUMNS = ("last_name", "first_name")
+
+# Κλειδιά αντιστοίχισης γραμμών import (βλ. Database.upsert_keys)
+KEY_LABELS = {
+    "member_id": "Α/Α",
+    "lodge_reg_no": "Αρ. Μητρώου Στοάς",
+    "grand_lodge_reg_no": "Αρ. Μητρώου Μεγάλης Στοάς",
+    "tax_id": "ΑΦΜ",
+}
+
+
+def iter_member_rows(
+    conn: sqlite3.Connection,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = 2000,
+) -> Iterator[List[tuple]]:
+    """Γραμμές members σε chunks με fetchmany (ποτέ όλος ο πίνακας στη μνήμη)"""
+    columns = columns or [c for c, _, _ in EXPORT_COLUMNS]
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(members)")}
+    select = ", ".join(c if c in existing else f"NULL AS {c}" for c in columns)
+    cursor = conn.execute(f"SELECT {select} FROM members ORDER BY last_name, first_name, member_id")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+def write_members_xlsx(
+    path: str,
+    db_path: str = "lodge_members.db",
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Excel με xlsxwriter σε constant_memory: κάθε γραμμή γράφεται στο
+    προσωρινό αρχείο του worksheet και φεύγει από τη μνήμη.
+    Επιστρέφει πόσα μέλη γράφτηκαν.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_numbers": False})
+    try:
+        sheet = workbook.add_worksheet("Μέλη")
+        header_format = workbook.add_format({"bold": True, "bg_color": "#D9E1F2", "border": 1})
+        formats = {
+            "int": workbook.add_format({"num_format": "0"}),
+            "text": workbook.add_format({"num_format": "@"}),
+            None: None,
+        }
+
+        for col, (_, header, fmt) in enumerate(EXPORT_COLUMNS):
+            sheet.set_column(col, col, _COLUMN_WIDTHS[fmt], formats[fmt])
+            sheet.write_string(0, col, header, header_format)
+        sheet.freeze_panes(1, 0)
+
+        kinds = [fmt for _, _, fmt in EXPORT_COLUMNS]
+        count = 0
+        with get_pool(db_path).connection() as conn:
+            for rows in iter_member_rows(conn):
+                for row in rows:
+                    count += 1
+                    for col, value in enumerate(row):
+                        if value is None or value == "":
+                            continue
+                        if kinds[col] == "int" and isinstance(value, (int, float)):
+                            sheet.write_number(count, col, value, formats["int"])
+                        else:
+                            sheet.write_string(count, col, str(value), formats[kinds[col]])
+                if progress:
+                    progress(count)
+        sheet.autofilter(0, 0, max(count, 1), len(EXPORT_COLUMNS) - 1)
+    finally:
+        workbook.close()
+    return count
+
+
+def write_members_csv(
+    path: str,
+    db_path: str = "lodge_members.db",
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """CSV (utf-8-sig για σωστά ελληνικά στο Excel) γραμμή-γραμμή"""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow([header for _, header, _ in EXPORT_COLUMNS])
+        with get_pool(db_path).connection() as conn:
+            for rows in iter_member_rows(conn):
+                writer.writerows(rows)
+                count += len(rows)
+                if progress:
+                    progress(count)
+    return count
+
+
+def write_members_parquet(
+    path: str,
+    db_path: str = "lodge_members.db",
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Parquet με ένα row group ανά chunk (απαιτεί pyarrow)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (header, pa.int64() if fmt == "int" else pa.string()) for _, header, fmt in EXPORT_COLUMNS
+    ])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer, get_pool(db_path).connection() as conn:
+        for rows in iter_member_rows(conn):
+            columns = list(zip(*rows))
+            arrays = [
+                pa.array(
+                    [v if v is None or fmt == "int" else str(v) for v in values],
+                    type=schema.field(i).type,
+                )
+                for i, ((_, _, fmt), values) in enumerate(zip(EXPORT_COLUMNS, columns))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+            if progress:
+                progress(count)
+    return count
+
+
+_WRITERS = {
+    "xlsx": write_members_xlsx,
+    "csv": write_members_csv,
+    "parquet": write_members_parquet,
+}
+
+
+def export_members(fmt: str = "xlsx", db_path: str = "lodge_members.db", **kwargs) -> Tuple[str, int]:
+    """
+    Εξαγωγή μητρώου σε προσωρινό αρχείο στο δίσκο.
+    Επιστρέφει (path, πλήθος)· ο caller ανοίγει το αρχείο και το σβήνει.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Άγνωστη ή μη διαθέσιμη μορφή εξαγωγής: {fmt}")
+    fd, path = tempfile.mkstemp(prefix="mhtrwo_", suffix=f".{fmt}")
+    os.close(fd)
+    try:
+        count = _WRITERS[fmt](path, db_path=db_path, **kwargs)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, count
+
+
+# ---------------- Import ----------------
+class ImportReport:
+    """Αποτέλεσμα import: μετρητές, λάθη ανά γραμμή και οι αλλαγές ανά κελί"""
+
+    def __init__(self):
+        self.rows = 0
+        self.updated = 0
+        self.inserted = 0
+        self.unchanged = 0
+        self.not_found: List = []
+        self.errors: List[Tuple[Optional[int], object, str]] = []  # (γραμμή, κλειδί, μήνυμα)
+        self.changes: List[Tuple[int, str, object, object]] = []  # (member_id, πεδίο, παλιά, νέα)
+        self.ignored_columns: List[str] = []
+
+    @property
+    def changed_members(self) -> int:
+        return len({c[0] for c in self.changes})
+
+    def changes_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.changes, columns=["member_id", "Πεδίο", "Παλιά τιμή", "Νέα τιμή"])
+
+    def errors_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.errors, columns=["Γραμμή", "Κλειδί", "Σφάλμα"])
+
+
+def _normalize_cell(value) -> Optional[str]:
+    """Τιμή κελιού -> κείμενο όπως αποθηκεύεται στη βάση (κενό -> None)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.date() if value.time() == datetime.min.time() else value
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float):
+        if value != value:
+            return None
+        # Το Excel κάνει αριθμούς τα τηλέφωνα/ΤΚ: 6971234567.0 -> "6971234567"
+        if value.is_integer():
+            return str(int(value))
+    value = str(value).strip()
+    return value or None
+
+
+def _read_rows(fileobj, filename: str) -> Iterator[list]:
+    """Γραμμές του αρχείου ως λίστες τιμών (η πρώτη είναι οι επικεφαλίδες)"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".csv":
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        try:
+            yield from csv.reader(text)
+        finally:
+            text.detach()
+    elif ext == ".xlsx":
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    elif ext == ".xls":
+        import xlrd
+
+        book = xlrd.open_workbook(file_contents=fileobj.read(), on_demand=True)
+        sheet = book.sheet_by_index(0)
+        for r in range(sheet.nrows):
+            row = []
+            for cell in sheet.row(r):
+                if cell.ctype == xlrd.XL_CELL_DATE:
+                    row.append(xlrd.xldate.xldate_as_datetime(cell.value, book.datemode))
+                else:
+                    row.append(cell.value)
+            yield row
+        book.release_resources()
+    else:
+        raise ValueError(f"Μη υποστηριζόμενος τύπος αρχείου: {ext or filename}")
+
+
+def iter_import_chunks(
+    fileobj,
+    filename: str,
+    member_columns: Iterable[str],
+    key: str = "member_id",
+    chunk_size: int = 2000,
+    report: Optional[ImportReport] = None,
+) -> Iterator[List[Tuple[int, Dict]]]:
+    """
+    Διαβάζει το αρχείο σε chunks [(αρ. γραμμής, {στήλη: τιμή}), ...].
+    Οι επικεφαλίδες μπορεί να είναι είτε οι ελληνικές του export είτε
+    ονόματα στηλών της βάσης· άγνωστες στήλες αγνοούνται.
+    """
+    member_columns = set(member_columns)
+    rows = _read_rows(fileobj, filename)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    mapping = []
+    for h in header:
+        h = _normalize_cell(h)
+        column = HEADER_TO_COLUMN.get(h, h)
+        if column in member_columns:
+            mapping.append(column)
+        else:
+            mapping.append(None)
+            if h and report is not None:
+                report.ignored_columns.append(h)
+    if key not in mapping:
+        raise ValueError(f"Το αρχείο δεν έχει στήλη {KEY_LABELS.get(key, key)} ({key})")
+
+    chunk = []
+    for line_no, values in enumerate(rows, start=2):
+        record = {col: _normalize_cell(v) for col, v in zip(mapping, values) if col}
+        record.setdefault(key, None)
+        if not any(v is not None for v in record.values()):
+            continue  # κενή γραμμή
+        chunk.append((line_no, record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_member_row(record: Dict, key: str = "member_id", upsert: bool = False) -> List[str]:
+    """Λάθη μιας γραμμής import (κενή λίστα = έγκυρη)"""
+    errors = []
+    key_value = record.get(key)
+    if key == "member_id" and key_value is not None:
+        try:
+            if int(float(key_value)) != float(key_value):
+                raise ValueError
+        except (ValueError, OverflowError):  # "abc", "nan" / "inf", "1e400"
+            errors.append(f"Μη έγκυρο Α/Α: {key_value!r}")
+    elif key_value is None and not (upsert and key == "member_id"):
+        # Κενό Α/Α σε upsert = νέο μέλος· κενό φυσικό κλειδί όμως θα
+        # έφτιαχνε διπλότυπο σε κάθε επανάληψη του ίδιου import
+        errors.append(f"Λείπει {KEY_LABELS.get(key, key)}")
+    for column, choices in MEMBER_CHOICES.items():
+        value = record.get(column)
+        if value is not None and value not in choices:
+            errors.append(f"{column}: μη επιτρεπτή τιμή {value!r} ({' / '.join(choices)})")
+    for column in REQUIRED_COLUMNS:
+        if column in record and record[column] is None:
+            errors.append(f"{column}: υποχρεωτικό πεδίο")
+    return errors
+
+
+def _current_rows(
+    conn: sqlite3.Connection, key: str, values: List, columns: List[str]
+) -> Dict[object, Tuple[int, Dict]]:
+    """Τιμή κλειδιού -> (member_id, τρέχουσες τιμές των columns), ένα SELECT ... IN ανά 500"""
+    out = {}
+    select = ", ".join([key, "member_id"] + columns)
+    values = list(dict.fromkeys(v for v in values if v is not None))
+    for start in range(0, len(values), 500):
+        part = values[start:start + 500]
+        for row in conn.execute(
+            f"SELECT {select} FROM members WHERE {key} IN ({', '.join('?' * len(part))})", part
+        ):
+            out[_normalize_cell(row[0]) if key != "member_id" else row[0]] = (
+                row[1], {c: _normalize_cell(v) for c, v in zip(columns, row[2:])}
+            )
+    return out
+
+
+def import_members(
+    db,
+    fileobj,
+    filename: str,
+    key: str = "member_id",
+    upsert: bool = False,
+    chunk_size: int = 2000,
+    dry_run: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+) -> ImportReport:
+    """
+    Import μελών από xlsx/xls/csv:
+    ανά chunk ελέγχει τις γραμμές, φέρνει τις τρέχουσες τιμές με ένα query,
+    και γράφει (με db.bulk_update_members, ένα transaction ανά chunk) μόνο
+    τα κελιά που άλλαξαν. dry_run=True: μόνο η αναφορά, χωρίς εγγραφή.
+    key: με ποιο πεδίο ταιριάζουν οι γραμμές με τα μέλη (βλ.
+    Database.upsert_keys). upsert=True: οι γραμμές που δεν ταιριάζουν
+    γίνονται νέα μέλη (db.upsert_members) αντί για σφάλμα.
+    """
+    report = ImportReport()
+    member_columns = db.member_columns() - {"created_at", "updated_at"}
+    if key != "member_id":
+        member_columns.discard("member_id")  # τα Α/Α άλλης βάσης δεν σημαίνουν τίποτα εδώ
+
+    for chunk in iter_import_chunks(fileobj, filename, member_columns, key, chunk_size, report):
+        valid = []
+        for line_no, record in chunk:
+            report.rows += 1
+            errors = validate_member_row(record, key, upsert)
+            if errors:
+                report.errors.append((line_no, record.get(key), "; ".join(errors)))
+                continue
+            if key == "member_id" and record["member_id"] is not None:
+                record["member_id"] = int(float(record["member_id"]))
+            valid.append((line_no, record))
+
+        if not valid:
+            continue
+        columns = [c for c in valid[0][1] if c not in (key, "member_id")]
+        with db.connection() as conn:
+            current = _current_rows(conn, key, [r[key] for _, r in valid], columns)
+
+        updates, inserts, insert_lines = [], [], []
+        for line_no, record in valid:
+            match = current.get(record[key]) if record[key] is not None else None
+            if match is None:
+                if not upsert:
+                    report.not_found.append(record[key])
+                    report.errors.append((line_no, record[key], "Δεν βρέθηκε μέλος"))
+                    continue
+                missing = [c for c in REQUIRED_COLUMNS if record.get(c) is None]
+                if missing:
+                    report.errors.append((line_no, record[key], f"Νέο μέλος χωρίς {', '.join(missing)}"))
+                    continue
+                # Κενά πεδία παραλείπονται ώστε να ισχύσουν τα DEFAULT της βάσης
+                inserts.append({c: v for c, v in record.items() if v is not None})
+                insert_lines.append(line_no)
+                continue
+
+            member_id, old = match
+            changed = {c: v for c, v in record.items() if c not in (key, "member_id") and old.get(c) != v}
+            if not changed:
+                report.unchanged += 1
+                continue
+            report.changes.extend((member_id, c, old.get(c), v) for c, v in changed.items())
+            updates.append(dict(changed, member_id=member_id))
+
+        if dry_run:
+            report.updated += len(updates)
+            report.inserted += len(inserts)
+        else:
+            if updates:
+                for member_id, ok, message in db.bulk_update_members(updates):
+                    if ok:
+                        report.updated += 1
+                    else:
+                        report.errors.append((None, member_id, message))
+            if inserts:
+                results = db.upsert_members(inserts, key=key)
+                for line_no, row, (member_id, action, message) in zip(insert_lines, inserts, results):
+                    if action == "insert":
+                        report.inserted += 1
+                    elif action == "update":
+                        report.updated += 1
+                    elif action == "unchanged":
+                        report.unchanged += 1
+                    else:
+                        report.errors.append((line_no, row.get(key), message))
+
+        if progress:
+            progress(report.rows)
+
+    return report
@@ -0,0 +1,408 @@
+"""
+Instrumentation
+Χρόνοι ανά μέθοδο της Database και ανά SQL statement, γραμμές, αναμονή
+για σύνδεση του pool: ring buffer πρόσφατων γεγονότων + histograms
+(p50/p95/p99) στη μνήμη του process, και προαιρετικό trace με
+EXPLAIN QUERY PLAN για τα αργά queries
+
+Ρυθμίσεις (env):
+    DB_INSTRUMENTATION=1   ενεργοποίηση (default: ανενεργό· το app το ενεργοποιεί
+                           όταν υπάρχει DIAGNOSTICS.TOKEN, εκτός αν DB_INSTRUMENTATION=0)
+    DB_TRACE=1             EXPLAIN QUERY PLAN για τα αργά SELECT
+    DB_SLOW_MS=50          όριο "αργού" statement σε ms
+"""
+
+import functools
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+# Log-scale buckets (ms): 0.01 ms .. ~2 λεπτά, βήμα √2
+BUCKETS_MS = tuple(0.01 * 2 ** (i / 2) for i in range(48))
+
+_MAX_NAMES = 500  # όριο διαφορετικών ονομάτων ανά είδος (π.χ. SQL)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+class Histogram:
+    """Μετρητές ανά bucket + σύνολο/min/max (σταθερή μνήμη)"""
+
+    __slots__ = ("counts", "count", "total", "min", "max", "rows")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.rows = 0
+
+    def add(self, ms: float, rows: Optional[int] = None):
+        index = 0
+        if ms > BUCKETS_MS[0]:
+            index = min(len(BUCKETS_MS), int(math.log2(ms / BUCKETS_MS[0]) * 2) + 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        if rows:
+            self.rows += rows
+
+    def percentile(self, q: float) -> float:
+        """Εκτίμηση του q-ποσοστημορίου (γεωμετρική παρεμβολή μέσα στο bucket)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n and seen + n >= target:
+                low = BUCKETS_MS[index - 1] if index else 0.0
+                high = BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max
+                low, high = max(low, self.min), min(high, self.max)
+                fraction = (target - seen) / n
+                value = low * (high / low) ** fraction if low > 0 else high * fraction
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max, 3),
+            "total_ms": round(self.total, 3),
+            "avg_rows": round(self.rows / self.count, 1) if self.count else 0.0,
+        }
+
+
+class _Frame:
+    """Ό,τι χρεώνεται στην τρέχουσα μέθοδο (SQL, αναμονή pool) του thread"""
+
+    __slots__ = ("sql_count", "sql_ms", "wait_ms")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.wait_ms = 0.0
+
+
+def sql_key(sql: str) -> str:
+    """Κανονικοποιημένο SQL για ομαδοποίηση (κενά, λίστες IN (?, ?, ...))"""
+    text = " ".join(sql.split())
+    text = re.sub(r"\?(?:\s*,\s*\?)+", "?, …", text)
+    return text if len(text) <= 160 else text[:157] + "..."
+
+
+class Instrumentation:
+    """
+    Process-wide συλλογή μετρήσεων. Τα histograms κρατούνται ανά
+    (είδος, όνομα) με είδη "method", "sql" και "pool"· το ring buffer
+    κρατά τα τελευταία `capacity` γεγονότα και το slow log τα αργά SQL.
+    """
+
+    def __init__(self, enabled: bool = True, trace: bool = False, slow_ms: float = 50.0,
+                 capacity: int = 2000, slow_capacity: int = 100):
+        self.enabled = enabled
+        self.trace = trace
+        self.slow_ms = slow_ms
+        self.events: Deque[Dict] = deque(maxlen=capacity)
+        self.slow: Deque[Dict] = deque(maxlen=slow_capacity)
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started_at = datetime.now()
+
+    # ---------------- Recording ----------------
+
+    def record(self, kind: str, name: str, seconds: float, rows: Optional[int] = None, **extra):
+        ms = seconds * 1000
+        event = {"ts": time.time(), "kind": kind, "name": name, "ms": round(ms, 3), "rows": rows}
+        event.update(extra)
+        with self._lock:
+            key = (kind, name)
+            hist = self._histograms.get(key)
+            if hist is None:
+                if sum(1 for k in self._histograms if k[0] == kind) >= _MAX_NAMES:
+                    key = (kind, "(other)")
+                    hist = self._histograms.get(key)
+                if hist is None:
+                    hist = self._histograms[key] = Histogram()
+            hist.add(ms, rows)
+            self.events.append(event)
+        return event
+
+    def _frames(self) -> List[_Frame]:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    @contextmanager
+    def frame(self):
+        """Πλαίσιο μεθόδου: μαζεύει τα SQL/αναμονές που γίνονται μέσα του"""
+        frames = self._frames()
+        frame = _Frame()
+        frames.append(frame)
+        try:
+            yield frame
+        finally:
+            frames.pop()
+            if frames:
+                parent = frames[-1]
+                parent.sql_count += frame.sql_count
+                parent.sql_ms += frame.sql_ms
+                parent.wait_ms += frame.wait_ms
+
+    def record_wait(self, seconds: float):
+        """Χρόνος μέχρι να δοθεί σύνδεση από το pool"""
+        if not self.enabled:
+            return
+        frames = self._frames()
+        if frames:
+            frames[-1].wait_ms += seconds * 1000
+        self.record("pool", "checkout", seconds)
+
+    def record_sql(self, conn: sqlite3.Connection, sql: str, parameters, seconds: float,
+                   rows: Optional[int]):
+        name = sql_key(sql)
+        ms = seconds * 1000
+        frames = self._frames()
+        if frames:
+            frames[-1].sql_count += 1
+            frames[-1].sql_ms += ms
+        self.record("sql", name, seconds, rows)
+
+        if ms < self.slow_ms:
+            return
+        entry = {"ts": time.time(), "sql": name, "ms": round(ms, 3), "rows": rows, "plan": None}
+        if self.trace and sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            entry["plan"] = explain(conn, sql, parameters)
+        with self._lock:
+            self.slow.append(entry)
+
+    # ---------------- Reporting ----------------
+
+    def summary(self, kind: Optional[str] = None) -> List[Dict]:
+        """Histogram σύνοψη ανά (είδος, όνομα), ταξινομημένη κατά συνολικό χρόνο"""
+        with self._lock:
+            rows = [
+                {"kind": k, "name": n, **hist.summary()}
+                for (k, n), hist in self._histograms.items()
+                if kind is None or k == kind
+            ]
+        return sorted(rows, key=lambda r: -r["total_ms"])
+
+    def recent(self, limit: int = 200, kind: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            events = [e for e in self.events if kind is None or e["kind"] == kind]
+        return events[-limit:][::-1]
+
+    def slow_queries(self) -> List[Dict]:
+        with self._lock:
+            return list(self.slow)[::-1]
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.events.clear()
+            self.slow.clear()
+            self.started_at = datetime.now()
+
+
+def explain(conn: sqlite3.Connection, sql: str, parameters=()) -> Optional[List[str]]:
+    """EXPLAIN QUERY PLAN (ως γραμμές με εσοχή), με απλό cursor εκτός μετρήσεων"""
+    try:
+        cursor = sqlite3.Cursor(conn)
+        rows = cursor.execute("EXPLAIN QUERY PLAN " + sql, parameters or ()).fetchall()
+        cursor.close()
+    except sqlite3.Error:
+        return None
+    depth: Dict[int, int] = {0: 0}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, 0) + 1
+        lines.append("  " * (depth[node] - 1) + detail)
+    return lines
+
+
+_instrumentation = Instrumentation(
+    enabled=_env_flag("DB_INSTRUMENTATION", False),
+    trace=_env_flag("DB_TRACE", False),
+    slow_ms=float(os.getenv("DB_SLOW_MS", "50")),
+)
+
+
+def get_instrumentation() -> Instrumentation:
+    """Το κοινό (process-wide) instrumentation"""
+    return _instrumentation
+
+
+def enable_instrumentation() -> bool:
+    """
+    Ενεργοποίηση (π.χ. όταν έχει οριστεί DIAGNOSTICS.TOKEN), εκτός αν το
+    DB_INSTRUMENTATION=0 το απαγορεύει ρητά. Ισχύει για τις συνδέσεις που
+    ανοίγουν από εδώ και πέρα, άρα καλείται πριν το πρώτο get_database().
+    """
+    _instrumentation.enabled = _env_flag("DB_INSTRUMENTATION", True)
+    return _instrumentation.enabled
+
+
+# ==================== SQLITE FACTORIES ====================
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor που μετράει κάθε statement: το execute και τα fetch* μέχρι να
+    εξαντληθούν τα αποτελέσματα (ή να ξαναχρησιμοποιηθεί/κλείσει ο cursor).
+    Η διάσχιση με `for row in cursor` μετράει μόνο στο execute.
+    """
+
+    _pending = None  # [sql, parameters, seconds, rows]
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed = time.perf_counter() - start
+        if self.description is None:  # DML/DDL: τέλος εδώ
+            _instrumentation.record_sql(
+                self.connection, sql, parameters, elapsed, self.rowcount if self.rowcount >= 0 else None
+            )
+        else:
+            self._pending = [sql, parameters, elapsed, 0]
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        _instrumentation.record_sql(
+            self.connection, sql, (), time.perf_counter() - start, self.rowcount if self.rowcount >= 0 else None
+        )
+        return self
+
+    def executescript(self, sql_script):
+        self._finish()
+        start = time.perf_counter()
+        super().executescript(sql_script)
+        _instrumentation.record_sql(self.connection, sql_script, (), time.perf_counter() - start, None)
+        return self
+
+    def _fetched(self, start: float, rows: int, done: bool):
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            pending[3] += rows
+            if done:
+                self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, 0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        size = self.arraysize if size is None else size
+        rows = super().fetchmany(size)
+        self._fetched(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows), True)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            sql, parameters, seconds, rows = pending
+            _instrumentation.record_sql(self.connection, sql, parameters, seconds, rows)
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Σύνδεση της οποίας όλα τα statements περνούν από InstrumentedCursor"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connection_factory():
+    """Factory για sqlite3.connect (None = απλό sqlite3.Connection)"""
+    return InstrumentedConnection if _instrumentation.enabled else sqlite3.Connection
+
+
+# ==================== METHOD DECORATOR ====================
+
+def _row_count(result) -> Optional[int]:
+    if isinstance(result, (list, tuple)) or hasattr(result, "shape"):
+        return len(result)
+    return None
+
+
+def instrumented(fn: Callable) -> Callable:
+    """Μετράει τη μέθοδο (χρόνος, γραμμές, SQL και αναμονή pool μέσα της)"""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        instr = _instrumentation
+        if not instr.enabled:
+            return fn(*args, **kwargs)
+        error = None
+        result = None
+        start = time.perf_counter()
+        with instr.frame() as frame:
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                instr.record(
+                    "method", name, time.perf_counter() - start,
+                    rows=_row_count(result),
+                    sql=frame.sql_count,
+                    sql_ms=round(frame.sql_ms, 3),
+                    wait_ms=round(frame.wait_ms, 3),
+                    error=error,
+                )
+        return result
+
+    return wrapper
@@ -0,0 +1,350 @@
+"""
+Background Jobs
+Μακροχρόνιες εργασίες (καρτέλες PDF, export/import) εκτός του script run
+του Streamlit: ο πίνακας jobs κρατά κατάσταση και πρόοδο, ένα thread pool
+τις εκτελεί και τα αρχεία αποτελεσμάτων γράφονται στο JOBS_DIR, ώστε ο
+χρήστης να τα κατεβάσει και αργότερα (ή από άλλη σελίδα/session).
+
+Ρυθμίσεις (env):
+    JOBS_DIR=.jobs         φάκελος αρχείων αποτελεσμάτων
+    JOBS_WORKERS=2         ταυτόχρονες εργασίες
+    JOBS_TTL_HOURS=24      μετά από τόσες ώρες τα αρχεία σβήνονται
+    JOBS_STALE_SECONDS=60  εργασία χωρίς heartbeat τόσο καιρό θεωρείται χαμένη
+
+Κάθε JobManager (ένας ανά process) έχει δικό του τυχαίο instance id και
+ανανεώνει το heartbeat_at των εργασιών του· εργασίες άλλου instance που
+σταμάτησαν να ανανεώνονται (restart, crash) σημειώνονται ως αποτυχημένες.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from modules.database import Database, get_pool
+from modules.migrations import migrate
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# kind -> συνάρτηση(ctx, **params) -> dict αποτελέσματος (JSON)
+JOB_KINDS: Dict[str, Callable] = {}
+
+
+def job_kind(name: str):
+    """Καταχώριση συνάρτησης ως είδος εργασίας"""
+    def register(fn: Callable) -> Callable:
+        JOB_KINDS[name] = fn
+        return fn
+    return register
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class JobAbandoned(Exception):
+    """Η εργασία δεν είναι πια ενεργή (άλλο instance τη σημείωσε ως χαμένη)"""
+
+
+class JobContext:
+    """Ό,τι χρειάζεται μια εργασία: βάση, φάκελος αρχείων, αναφορά προόδου"""
+
+    def __init__(self, manager: "JobManager", job_id: int):
+        self.manager = manager
+        self.job_id = job_id
+        self.db_path = manager.db_path
+        self.artifact: Optional[Dict] = None
+        self._last_write = 0.0
+
+    @property
+    def workdir(self) -> str:
+        path = os.path.join(self.manager.jobs_dir, str(self.job_id))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def path(self, filename: str) -> str:
+        """Διαδρομή αρχείου μέσα στον φάκελο της εργασίας"""
+        return os.path.join(self.workdir, filename)
+
+    def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None):
+        """Πρόοδος· γράφεται στη βάση το πολύ κάθε 0.5s (και πάντα στο τέλος)"""
+        now = time.monotonic()
+        if now - self._last_write < 0.5 and not (total and done >= total):
+            return
+        self._last_write = now
+        if not self.manager._transition(self.job_id, done=done, total=total, message=message):
+            raise JobAbandoned(f"Η εργασία #{self.job_id} σημειώθηκε ως χαμένη")
+
+    def set_artifact(self, path: str, name: str, mime: str):
+        """Το αρχείο αποτελέσματος (πρέπει να βρίσκεται στο workdir)"""
+        self.artifact = {"artifact_path": path, "artifact_name": name, "artifact_mime": mime}
+
+
+class JobManager:
+    """Υποβολή, εκτέλεση και παρακολούθηση εργασιών μιας βάσης"""
+
+    def __init__(self, db_path: str = "lodge_members.db", workers: Optional[int] = None,
+                 jobs_dir: Optional[str] = None, ttl_hours: Optional[float] = None,
+                 stale_seconds: Optional[float] = None):
+        self.db_path = db_path
+        self.instance = uuid.uuid4().hex
+        self.pool = get_pool(db_path)
+        self.jobs_dir = os.path.abspath(jobs_dir or os.getenv("JOBS_DIR", ".jobs"))
+        self.ttl_hours = float(ttl_hours if ttl_hours is not None else os.getenv("JOBS_TTL_HOURS", "24"))
+        self.stale_seconds = float(
+            stale_seconds if stale_seconds is not None else os.getenv("JOBS_STALE_SECONDS", "60")
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or int(os.getenv("JOBS_WORKERS", "2")), thread_name_prefix="job"
+        )
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        with self.pool.connection() as conn:
+            migrate(conn)  # jobs
+        self._abandon_orphans()
+        self.cleanup()
+        self._stop = threading.Event()
+        threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True).start()
+
+    # ---------------- Storage ----------------
+
+    def _transition(self, job_id: int, **fields) -> bool:
+        """
+        Ενημέρωση εργασίας αυτού του instance που είναι ακόμη ενεργή. False αν
+        στο μεταξύ άλλο instance τη σημείωσε ως χαμένη (τότε δεν ξαναζωντανεύει).
+        """
+        fields = {k: v for k, v in fields.items() if v is not None}
+        if not fields:
+            return True
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        with self.pool.connection() as conn:
+            return conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ? AND owner = ? "
+                f"AND status IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                (*fields.values(), job_id, self.instance, *ACTIVE_STATUSES),
+            ).rowcount > 0
+
+    @staticmethod
+    def _row(cursor, row) -> Dict:
+        job = {d[0]: v for d, v in zip(cursor.description, row)}
+        for key in ("params", "result"):
+            job[key] = json.loads(job[key]) if job.get(key) else {}
+        return job
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        with self.pool.connection() as conn:
+            cursor = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+            row = cursor.fetchone()
+            return self._row(cursor, row) if row else None
+
+    def recent(self, kind: Optional[str] = None, limit: int = 10,
+               session_id: Optional[str] = None) -> List[Dict]:
+        """Τελευταίες εργασίες (νεότερη πρώτη), προαιρετικά ενός είδους / ενός session"""
+        query = "SELECT * FROM jobs"
+        conditions, params = [], []
+        if kind:
+            conditions.append("kind = ?")
+            params.append(kind)
+        if session_id:
+            conditions.append("session_id = ?")
+            params.append(session_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY job_id DESC LIMIT ?"
+        params.append(limit)
+        with self.pool.connection() as conn:
+            cursor = conn.execute(query, params)
+            return [self._row(cursor, row) for row in cursor.fetchall()]
+
+    def delete(self, job_id: int):
+        """Διαγραφή εργασίας που δεν τρέχει, μαζί με τα αρχεία της"""
+        with self.pool.connection() as conn:
+            conn.execute(
+                f"DELETE FROM jobs WHERE job_id = ? AND status NOT IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                (job_id, *ACTIVE_STATUSES),
+            )
+        shutil.rmtree(os.path.join(self.jobs_dir, str(job_id)), ignore_errors=True)
+
+    def heartbeat(self):
+        """Οι εργασίες αυτού του instance είναι ζωντανές"""
+        with self.pool.connection() as conn:
+            conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? "
+                f"WHERE owner = ? AND status IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                (_now(), self.instance, *ACTIVE_STATUSES),
+            )
+
+    def _abandon_orphans(self) -> int:
+        """
+        Εργασίες άλλου instance χωρίς heartbeat για stale_seconds: το process
+        τους τερματίστηκε και δεν θα ολοκληρωθούν ποτέ
+        """
+        cutoff = (datetime.now() - timedelta(seconds=self.stale_seconds)).strftime("%Y-%m-%d %H:%M:%S")
+        with self.pool.connection() as conn:
+            return conn.execute(
+                f"UPDATE jobs SET status = 'failed', error = 'Διακόπηκε (επανεκκίνηση εφαρμογής)', "
+                f"finished_at = ? WHERE status IN ({', '.join('?' * len(ACTIVE_STATUSES))}) "
+                f"AND owner IS NOT ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (_now(), *ACTIVE_STATUSES, self.instance, cutoff),
+            ).rowcount
+
+    def _heartbeat_loop(self):
+        interval = max(1.0, self.stale_seconds / 4)
+        while not self._stop.wait(interval):
+            try:
+                self.heartbeat()
+                self._abandon_orphans()
+            except sqlite3.Error:
+                pass  # π.χ. database locked: ξανά στον επόμενο γύρο
+
+    def close(self):
+        """Τέλος heartbeat (οι εργασίες του θα θεωρηθούν χαμένες μετά από stale_seconds)"""
+        self._stop.set()
+
+    def cleanup(self) -> int:
+        """Σβήνει εργασίες (και αρχεία) παλαιότερες από ttl_hours"""
+        cutoff = (datetime.now() - timedelta(hours=self.ttl_hours)).strftime("%Y-%m-%d %H:%M:%S")
+        with self.pool.connection() as conn:
+            old = [row[0] for row in conn.execute(
+                f"SELECT job_id FROM jobs WHERE created_at < ? "
+                f"AND status NOT IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                (cutoff, *ACTIVE_STATUSES),
+            )]
+        for job_id in old:
+            self.delete(job_id)
+        return len(old)
+
+    # ---------------- Execution ----------------
+
+    def submit(self, kind: str, label: Optional[str] = None, session_id: Optional[str] = None,
+               **params) -> int:
+        """
+        Νέα εργασία (params: JSON-serializable)· επιστρέφει job_id αμέσως.
+        session_id: ποιος τη ζήτησε (τα αρχεία της δείχνονται μόνο σε αυτόν)
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Άγνωστο είδος εργασίας: {kind}")
+        with self.pool.connection() as conn:
+            job_id = conn.execute(
+                "INSERT INTO jobs (kind, label, params, status, pid, owner, session_id, created_at, heartbeat_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?) RETURNING job_id",
+                (kind, label, json.dumps(params, ensure_ascii=False, default=str), os.getpid(),
+                 self.instance, session_id, _now(), _now()),
+            ).fetchone()[0]
+        self.executor.submit(self._run, job_id, kind, params)
+        return job_id
+
+    def _run(self, job_id: int, kind: str, params: Dict):
+        ctx = JobContext(self, job_id)
+        if not self._transition(job_id, status="running", started_at=_now()):
+            return  # σημειώθηκε χαμένη πριν ξεκινήσει
+        try:
+            result = JOB_KINDS[kind](ctx, **params) or {}
+        except Exception as e:
+            self._transition(
+                job_id, status="failed", error=f"{type(e).__name__}: {e}",
+                message=traceback.format_exc(limit=3), finished_at=_now(),
+            )
+            return
+        self._transition(
+            job_id, status="done", finished_at=_now(),
+            result=json.dumps(result, ensure_ascii=False, default=str),
+            **(ctx.artifact or {}),
+        )
+
+    def save_upload(self, fileobj, filename: str) -> str:
+        """Αποθήκευση ανεβασμένου αρχείου στο JOBS_DIR (είσοδος εργασίας)"""
+        folder = os.path.join(self.jobs_dir, "uploads")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{int(time.time() * 1000)}_{os.path.basename(filename)}")
+        with open(path, "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+        return path
+
+
+_managers: Dict[str, JobManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_job_manager(db_path: str = "lodge_members.db") -> JobManager:
+    """Κοινός JobManager ανά βάση (process-wide, επιβιώνει τα reruns)"""
+    with _managers_lock:
+        manager = _managers.get(db_path)
+        if manager is None:
+            manager = JobManager(db_path)
+            _managers[db_path] = manager
+        return manager
+
+
+# ==================== JOB KINDS ====================
+# Τα βαριά modules (reportlab, openpyxl, ...) φορτώνονται μέσα στην εργασία
+
+@job_kind("export_members")
+def _export_members_job(ctx: JobContext, fmt: str = "xlsx") -> Dict:
+    from modules.import_export import EXPORT_FORMATS, export_members
+
+    total = Database(ctx.db_path).count_members()
+    ctx.progress(0, total, "Εξαγωγή μελών...")
+    path, count = export_members(fmt, db_path=ctx.db_path, progress=lambda n: ctx.progress(n, total))
+    target = ctx.path(f"Μητρωο_Μελων_{datetime.now().strftime('%Y%m%d')}.{fmt}")
+    shutil.move(path, target)
+    ctx.set_artifact(target, os.path.basename(target), EXPORT_FORMATS[fmt][1])
+    return {"count": count}
+
+
+@job_kind("import_members")
+def _import_members_job(ctx: JobContext, path: str, filename: str, key: str = "member_id",
+                        upsert: bool = False) -> Dict:
+    from modules.import_export import import_members
+
+    try:
+        with open(path, "rb") as f:
+            report = import_members(
+                Database(ctx.db_path), f, filename, key=key, upsert=upsert,
+                progress=lambda rows: ctx.progress(rows, None, f"{rows} γραμμές"),
+            )
+    finally:
+        os.remove(path)
+    return {
+        "rows": report.rows,
+        "updated": report.updated,
+        "inserted": report.inserted,
+        "unchanged": report.unchanged,
+        "errors": report.errors[:500],
+        "error_count": len(report.errors),
+    }
+
+
+@job_kind("cards_zip")
+def _cards_zip_job(ctx: JobContext, member_ids: List[int], issue_date: Optional[str] = None,
+                   max_workers: Optional[int] = None) -> Dict:
+    from modules.pdf_generator import write_member_cards_zip
+
+    target = ctx.path(f"Karteles_Melon_{datetime.now().strftime('%Y%m%d_%H%M')}.zip")
+    ctx.progress(0, len(member_ids))
+    with open(target, "wb") as f:
+        count = write_member_cards_zip(
+            member_ids, f, db_path=ctx.db_path, max_workers=max_workers, issue_date=issue_date,
+            progress=lambda done, total: ctx.progress(done, total),
+        )
+    ctx.set_artifact(target, os.path.basename(target), "application/zip")
+    return {"count": count}
+
+
+@job_kind("cards_booklet")
+def _cards_booklet_job(ctx: JobContext, member_ids: List[int], issue_date: Optional[str] = None) -> Dict:
+    from modules.pdf_generator import create_member_cards_booklet
+
+    target = ctx.path(f"Karteles_Melon_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf")
+    ctx.progress(0, 1, f"Δημιουργία {len(member_ids)} καρτελών...")
+    if not create_member_cards_booklet(member_ids, target, db_path=ctx.db_path, issue_date=issue_date):
+        raise ValueError("Δεν βρέθηκαν μέλη")
+    ctx.progress(1, 1)
+    ctx.set_artifact(target, os.path.basename(target), "application/pdf")
+    return {"count": len(member_ids)}
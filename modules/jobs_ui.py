@@ -0,0 +1,92 @@
+"""
+Jobs UI
+Πάνελ εργασιών για τις σελίδες: πρόοδος (polling μόνο του πάνελ με
+st.fragment όσο κάποια εργασία τρέχει), λήψη αρχείου, διαγραφή.
+Κάθε session βλέπει μόνο τις δικές του εργασίες (τα αρχεία περιέχουν
+στοιχεία μελών)· με νέο session (π.χ. refresh) οι παλιές δεν φαίνονται.
+"""
+
+import os
+import uuid
+from typing import Callable, Dict, Optional
+
+import streamlit as st
+
+from modules.jobs import ACTIVE_STATUSES, JobManager
+
+_STATUS_LABELS = {
+    "queued": "⏳ Σε αναμονή",
+    "running": "⚙️ Σε εξέλιξη",
+    "done": "✅ Ολοκληρώθηκε",
+    "failed": "❌ Απέτυχε",
+}
+
+
+def job_session_id() -> str:
+    """Σταθερό id του τρέχοντος session για submit/render_jobs"""
+    return st.session_state.setdefault("job_session_id", uuid.uuid4().hex)
+
+
+def _render_job(manager: JobManager, job: Dict, key: str, details: Optional[Callable[[Dict], None]]):
+    job_id = job["job_id"]
+    title = job["label"] or job["kind"]
+    st.markdown(f"**#{job_id} · {title}** — {_STATUS_LABELS.get(job['status'], job['status'])}"
+                f" <span style='color:#6c757d'>({job['created_at']})</span>", unsafe_allow_html=True)
+
+    if job["status"] in ACTIVE_STATUSES:
+        total = job["total"] or 0
+        fraction = min(1.0, job["done"] / total) if total else 0.0
+        text = job["message"] or (f"{job['done']} / {total}" if total else None)
+        st.progress(fraction, text=text)
+        return
+
+    if job["status"] == "failed":
+        st.error(job["error"] or "Άγνωστο σφάλμα")
+    elif details:
+        details(job)
+
+    cols = st.columns([3, 1])
+    path = job["artifact_path"]
+    with cols[0]:
+        if job["status"] == "done" and path and os.path.exists(path):
+            with open(path, "rb") as artifact:
+                st.download_button(
+                    label=f"⬇️ Λήψη {job['artifact_name']}",
+                    data=artifact,
+                    file_name=job["artifact_name"],
+                    mime=job["artifact_mime"],
+                    type="primary",
+                    key=f"{key}_download_{job_id}",
+                    use_container_width=True,
+                )
+    with cols[1]:
+        if st.button("🗑️", key=f"{key}_delete_{job_id}", help="Διαγραφή εργασίας και αρχείου"):
+            manager.delete(job_id)
+            st.rerun()
+
+
+def render_jobs(manager: JobManager, kind, key: str, limit: int = 5,
+                details: Optional[Callable[[Dict], None]] = None, poll_seconds: float = 1.0):
+    """
+    Οι τελευταίες εργασίες του session ενός ή περισσότερων ειδών. Όσο κάποια τρέχει,
+    μόνο το πάνελ ξανασχεδιάζεται κάθε poll_seconds· όταν τελειώσουν
+    όλες, ένα πλήρες rerun σταματά το polling.
+    """
+    kinds = (kind,) if isinstance(kind, str) else tuple(kind)
+    session_id = job_session_id()
+
+    def jobs():
+        rows = [job for k in kinds for job in manager.recent(k, limit, session_id=session_id)]
+        return sorted(rows, key=lambda job: -job["job_id"])[:limit]
+
+    polling = any(job["status"] in ACTIVE_STATUSES for job in jobs())
+
+    def panel():
+        current = jobs()
+        if polling and not any(job["status"] in ACTIVE_STATUSES for job in current):
+            st.rerun()
+        for job in current:
+            with st.container(border=True):
+                _render_job(manager, job, key, details)
+
+    st.fragment(panel, run_every=poll_seconds if polling else None)()
@@ -0,0 +1,340 @@
+"""
+Schema Migrations
+Εκδόσεις σχήματος στο PRAGMA user_version: κάθε migration τρέχει μία φορά,
+σε ένα transaction, και όταν η βάση είναι ενημερωμένη δεν γίνεται κανένα DDL
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+from modules.statistics import init_stats_table
+
+# Πεδία του members που καλύπτει η αναζήτηση κειμένου (members_fts)
+FTS_COLUMNS = ("last_name", "first_name", "mobile_phone", "city", "profession", "sponsor", "notes")
+
+# Κλειδιά με partial unique index (upsert ανά φυσικό κλειδί)
+UNIQUE_KEY_COLUMNS = ("lodge_reg_no", "grand_lodge_reg_no", "tax_id")
+
+
+# ==================== MIGRATIONS ====================
+
+def _baseline(conn: sqlite3.Connection):
+    """members + tasks, και οι στήλες που προστέθηκαν σε παλιότερες βάσεις"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS members (
+            -- Προσωπικά Στοιχεία
+            member_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            last_name TEXT NOT NULL,
+            first_name TEXT NOT NULL,
+            fathers_name TEXT,
+            birth_date TEXT,
+            birth_place TEXT,
+            profession TEXT,
+            tax_id TEXT,
+            id_number TEXT,
+
+            -- Στοιχεία Επικοινωνίας
+            address TEXT,
+            postal_code TEXT,
+            city TEXT,
+            home_phone TEXT,
+            mobile_phone TEXT,
+            email TEXT,
+
+            -- Μασονικά Στοιχεία
+            initiation_date TEXT,
+            initiation_diploma TEXT,
+            second_degree_date TEXT,
+            second_degree_diploma TEXT,
+            third_degree_date TEXT,
+            third_degree_diploma TEXT,
+            current_degree TEXT DEFAULT 'Μαθητής',
+            initiation_lodge TEXT,
+            initiation_lodge_number TEXT,
+            sponsor TEXT,
+            guarantor TEXT,
+
+            -- Ιστορικό Στοάς
+            entry_date TEXT,
+            offices_held TEXT,
+            honors TEXT,
+            committees TEXT,
+
+            -- Οικογενειακά
+            marital_status TEXT,
+            spouse_name TEXT,
+            children_names TEXT,
+            emergency_contact TEXT,
+            emergency_phone TEXT,
+
+            -- Διοικητικά
+            member_status TEXT DEFAULT 'Ενεργό',
+            status_change_date TEXT,
+            status_change_reason TEXT,
+            financial_status TEXT DEFAULT 'Ναι',
+            last_payment_date TEXT,
+            notes TEXT,
+
+            -- Metadata
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+
+            -- Αριθμοί μητρώου
+            lodge_reg_no TEXT,
+            grand_lodge_reg_no TEXT,
+
+            -- Συμβατότητα για ΑΦΜ (PDF χρησιμοποιεί tax_id)
+            afm TEXT
+        )
+    """)
+
+    # Παλιότερες βάσεις χωρίς κάποιες από τις στήλες
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(members)")}
+    for name in (
+        "lodge_reg_no", "grand_lodge_reg_no",
+        "initiation_diploma", "second_degree_date", "second_degree_diploma",
+        "third_degree_date", "third_degree_diploma", "initiation_lodge_number", "sponsor",
+        "entry_date", "offices_held", "honors", "committees",
+        "marital_status", "spouse_name", "children_names", "emergency_phone", "emergency_contact",
+        "status_change_date", "status_change_reason", "last_payment_date", "notes",
+        "tax_id", "afm",
+    ):
+        if name not in existing:
+            conn.execute(f"ALTER TABLE members ADD COLUMN {name} TEXT")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            due_date TEXT,
+            priority TEXT DEFAULT 'Μεσαία',
+            status TEXT DEFAULT 'Εκκρεμής',
+            category TEXT,
+            assigned_to TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            completed_at TEXT
+        )
+    """)
+
+
+def _search_index(conn: sqlite3.Connection):
+    """
+    FTS5 index αναζήτησης (members_fts), συγχρονισμένο με triggers.
+    Αποθηκεύει τα πεδία μέσω fold_greek, άρα κάθε σύνδεση που γράφει
+    στο members πρέπει να έχει καταχωρημένη τη fold_greek (βλ. pool).
+    Χωρίς FTS5 στη SQLite δεν δημιουργείται (η αναζήτηση πέφτει σε LIKE).
+    """
+    cols = ", ".join(FTS_COLUMNS)
+    folded_new = ", ".join(f"fold_greek(new.{c})" for c in FTS_COLUMNS)
+
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'members_fts'").fetchone()
+    if not exists:
+        try:
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE members_fts USING fts5(
+                    {cols},
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return
+        # Βάρη bm25: επώνυμο/όνομα μετράνε περισσότερο από σημειώσεις
+        conn.execute(
+            "INSERT INTO members_fts(members_fts, rank) "
+            "VALUES('rank', 'bm25(10.0, 8.0, 6.0, 2.0, 2.0, 2.0, 1.0)')"
+        )
+        conn.execute(f"""
+            INSERT INTO members_fts(rowid, {cols})
+            SELECT member_id, {", ".join(f"fold_greek({c})" for c in FTS_COLUMNS)}
+            FROM members
+        """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS members_fts_ai AFTER INSERT ON members BEGIN
+            INSERT INTO members_fts(rowid, {cols}) VALUES (new.member_id, {folded_new});
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS members_fts_ad AFTER DELETE ON members BEGIN
+            DELETE FROM members_fts WHERE rowid = old.member_id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS members_fts_au AFTER UPDATE OF member_id, {cols} ON members BEGIN
+            DELETE FROM members_fts WHERE rowid = old.member_id;
+            INSERT INTO members_fts(rowid, {cols}) VALUES (new.member_id, {folded_new});
+        END
+    """)
+
+
+def _member_indexes(conn: sqlite3.Connection):
+    """Indexes για τα φίλτρα/ταξινόμηση του query_members"""
+    for name, columns in (
+        ("idx_members_name", "last_name, first_name"),
+        ("idx_members_status_name", "member_status, last_name, first_name"),
+        ("idx_members_degree_name", "current_degree, last_name, first_name"),
+        ("idx_members_financial_name", "financial_status, last_name, first_name"),
+        ("idx_members_status_degree_financial", "member_status, current_degree, financial_status"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON members({columns})")
+
+
+def _member_stats(conn: sqlite3.Connection):
+    """Πίνακας-σύνοψη member_stats (ενημερώνεται από triggers)"""
+    init_stats_table(conn)
+
+
+def _unique_keys(conn: sqlite3.Connection):
+    """
+    Partial unique indexes στα φυσικά κλειδιά (για upsert_members).
+    Αν η βάση έχει ήδη διπλότυπα σε κάποιο κλειδί, το index παραλείπεται
+    και το κλειδί δεν είναι διαθέσιμο για upsert.
+    """
+    for column in UNIQUE_KEY_COLUMNS:
+        try:
+            conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS ux_members_{column} "
+                f"ON members({column}) WHERE {column} <> ''"
+            )
+        except sqlite3.IntegrityError:
+            pass
+
+
+def _email_outbox(conn: sqlite3.Connection):
+    """Ουρά αποστολής email (βλ. modules.email.Outbox)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            outbox_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            to_email TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            next_attempt_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            claimed_at TEXT,
+            sent_at TEXT
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox(status, next_attempt_at)"
+    )
+
+
+def _outbox_dedupe(conn: sqlite3.Connection):
+    """Είδος μηνύματος + κλειδί μοναδικότητας (π.χ. μία υπενθύμιση ανά εργασία ανά ημέρα)"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(email_outbox)")}
+    for name in ("kind", "dedupe_key"):
+        if name not in existing:
+            conn.execute(f"ALTER TABLE email_outbox ADD COLUMN {name} TEXT")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_email_outbox_dedupe "
+        "ON email_outbox(dedupe_key) WHERE dedupe_key IS NOT NULL"
+    )
+
+
+def _jobs(conn: sqlite3.Connection):
+    """Background εργασίες (βλ. modules.jobs): κατάσταση, πρόοδος, αρχείο αποτελέσματος"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            label TEXT,
+            params TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            done INTEGER NOT NULL DEFAULT 0,
+            total INTEGER,
+            message TEXT,
+            artifact_path TEXT,
+            artifact_name TEXT,
+            artifact_mime TEXT,
+            result TEXT,
+            error TEXT,
+            pid INTEGER,
+            created_at TEXT,
+            started_at TEXT,
+            finished_at TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_kind_created ON jobs(kind, job_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+
+
+def _jobs_lease(conn: sqlite3.Connection):
+    """Ιδιοκτήτης (instance του JobManager) και heartbeat των εργασιών σε εξέλιξη"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for name in ("owner", "heartbeat_at"):
+        if name not in existing:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} TEXT")
+
+
+def _jobs_session(conn: sqlite3.Connection):
+    """Session που υπέβαλε κάθε εργασία (η λίστα εργασιών είναι ανά χρήστη)"""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "session_id" not in existing:
+        conn.execute("ALTER TABLE jobs ADD COLUMN session_id TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs(session_id, job_id)")
+
+
+# (έκδοση, περιγραφή, συνάρτηση) — μόνο προσθήκες στο τέλος, ποτέ αλλαγή παλιών
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "members/tasks baseline", _baseline),
+    (2, "members_fts search index", _search_index),
+    (3, "query_members indexes", _member_indexes),
+    (4, "member_stats summary table", _member_stats),
+    (5, "natural key unique indexes", _unique_keys),
+    (6, "email_outbox delivery queue", _email_outbox),
+    (7, "email_outbox dedupe keys", _outbox_dedupe),
+    (8, "background jobs", _jobs),
+    (9, "jobs owner/heartbeat lease", _jobs_lease),
+    (10, "jobs per session", _jobs_session),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """
+    Εφαρμόζει όσα migrations λείπουν, το καθένα σε δικό του BEGIN IMMEDIATE
+    transaction μαζί με την αλλαγή του user_version. Αν άλλο process τα
+    εφάρμοσε στο μεταξύ, ξαναελέγχεται η έκδοση μέσα στο lock και
+    παραλείπονται. Επιστρέφει τις εκδόσεις που εφαρμόστηκαν.
+    """
+    current = schema_version(conn)
+    if current >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    for version, _, apply in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    # python -m modules.migrations [db_path]  -> εφαρμογή/έλεγχος migrations
+    import sys
+    from modules.database import get_pool
+
+    with get_pool(sys.argv[1] if len(sys.argv) > 1 else "lodge_members.db").connection() as conn:
+        applied = migrate(conn)
+        print(f"schema version {schema_version(conn)} (applied: {applied or 'none'})")
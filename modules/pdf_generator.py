@@ -5,9 +5,17 @@ PDF Generator για Καρτέλες Μελών (ΑΚΡΟΠΟΛΙΣ Υπ ΑΡΙ
 - "Διδάσκαλος" (διορθώνει αν βρει "Δάσκαλος")
 """
 
-import sqlite3
+import copy
 import io
-from datetime import datetime
+import logging
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
@@ -17,31 +25,184 @@ from reportlab.lib.enums import TA_CENTER
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from modules.database import get_pool
+from modules.card_cache import get_card_cache
+
+log = logging.getLogger(__name__)
+
+# Αλλάζει όταν αλλάζει η εμφάνιση της καρτέλας (ακυρώνει το cache καρτελών)
+TEMPLATE_VERSION = "2"
+
 
 # ---------------- Fonts (Greek-friendly) ----------------
+# Φάκελοι όπου αναζητείται το DejaVu (Debian/Ubuntu, Fedora, Arch, macOS).
+# Το PDF_FONT_DIR (env) έχει προτεραιότητα.
+FONT_DIRS = [
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+    "/usr/share/fonts/TTF",
+    "/Library/Fonts",
+]
+
+
+def _find_font(filename: str) -> Optional[str]:
+    dirs = ([os.environ["PDF_FONT_DIR"]] if os.environ.get("PDF_FONT_DIR") else []) + FONT_DIRS
+    for d in dirs:
+        path = os.path.join(d, filename)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
 def _register_fonts():
+    regular, bold = _find_font("DejaVuSans.ttf"), _find_font("DejaVuSans-Bold.ttf")
     try:
-        pdfmetrics.registerFont(TTFont("DejaVuSans", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"))
-        pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"))
+        if not (regular and bold):
+            raise FileNotFoundError("DejaVuSans")
+        pdfmetrics.registerFont(TTFont("DejaVuSans", regular))
+        pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", bold))
         return "DejaVuSans", "DejaVuSans-Bold"
     except Exception:
         return "Helvetica", "Helvetica-Bold"
 
 
-FONT_NAME, FONT_NAME_BOLD = _register_fonts()
+# ---------------- Render context ----------------
+SECTION_TITLES = (
+    "ΠΡΟΣΩΠΙΚΑ ΣΤΟΙΧΕΙΑ",
+    "ΣΤΟΙΧΕΙΑ ΕΠΙΚΟΙΝΩΝΙΑΣ",
+    "ΤΕΚΤΟΝΙΚΕΣ ΠΛΗΡΟΦΟΡΙΕΣ",
+    "ΙΣΤΟΡΙΚΟ ΣΤΟΑΣ",
+    "ΟΙΚΟΓΕΝΕΙΑΚΑ ΣΤΟΙΧΕΙΑ",
+    "ΔΙΟΙΚΗΤΙΚΑ ΣΤΟΙΧΕΙΑ",
+    "ΠΑΡΑΤΗΡΗΣΕΙΣ",
+)
+
+
+class RenderContext:
+    """
+    Ό,τι δεν εξαρτάται από το μέλος: fonts, styles, table styles και τα
+    στατικά flowables (επικεφαλίδα, τίτλοι ενοτήτων). Χτίζεται μία φορά
+    ανά process (get_render_context)· κάθε καρτέλα παίρνει αντίγραφα των
+    στατικών flowables, αφού το platypus κρατά state layout πάνω τους.
+    """
+
+    def __init__(self, fonts: Optional[Tuple[str, str]] = None):
+        self.font_name, self.font_name_bold = fonts or _register_fonts()
+        styles = getSampleStyleSheet()
+
+        self.title_style = ParagraphStyle(
+            "Title",
+            parent=styles["Heading1"],
+            fontSize=18,
+            textColor=colors.HexColor("#1e3a8a"),
+            spaceAfter=10,
+            alignment=TA_CENTER,
+            fontName=self.font_name_bold,
+        )
+
+        self.heading_style = ParagraphStyle(
+            "Heading",
+            parent=styles["Heading2"],
+            fontSize=12,
+            textColor=colors.HexColor("#2563eb"),
+            spaceAfter=10,
+            spaceBefore=15,
+            fontName=self.font_name_bold,
+        )
+
+        self.number_style = ParagraphStyle(
+            "Number",
+            fontSize=16,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#dc2626"),
+            fontName=self.font_name_bold,
+            spaceAfter=6,
+        )
+
+        self.normal_style = styles["Normal"]
+
+        self.table_style = TableStyle(
+            [
+                ("FONTNAME", (0, 0), (0, -1), self.font_name_bold),
+                ("FONTNAME", (1, 0), (1, -1), self.font_name),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+                ("TOPPADDING", (0, 0), (-1, -1), 8),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ]
+        )
+
+        self.signature_style = TableStyle(
+            [
+                ("FONTNAME", (0, 0), (0, -1), self.font_name_bold),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+            ]
+        )
+
+        self._header = [
+            Paragraph("ΚΑΡΤΕΛΑ ΜΕΛΟΥΣ", self.title_style),
+            Paragraph("ΑΚΡΟΠΟΛΙΣ Υπ ΑΡΙΘΜ 84", self.title_style),
+            Spacer(1, 0.4 * cm),
+        ]
+        self._headings = {title: Paragraph(title, self.heading_style) for title in SECTION_TITLES}
+
+    def header(self) -> List:
+        return [copy.copy(f) for f in self._header]
+
+    def heading(self, title: str) -> Paragraph:
+        return copy.copy(self._headings[title])
+
+    def table(self, data: List, col_widths=(5 * cm, 10 * cm)) -> Table:
+        t = Table(data, colWidths=list(col_widths))
+        t.setStyle(self.table_style)
+        return t
+
+
+_render_context: Optional[RenderContext] = None
+_render_context_lock = threading.Lock()
+
+
+def get_render_context() -> RenderContext:
+    """Get or create το RenderContext του process"""
+    global _render_context
+    if _render_context is None:
+        with _render_context_lock:
+            if _render_context is None:
+                _render_context = RenderContext()
+    return _render_context
 
 
 # ---------------- DB ----------------
 def get_member(member_id: int, db_path: str = "lodge_members.db"):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM members WHERE member_id = ?", (member_id,))
-    columns = [d[0] for d in cursor.description] if cursor.description else []
-    row = cursor.fetchone()
-    conn.close()
+    with get_pool(db_path).connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM members WHERE member_id = ?", (member_id,))
+        columns = [d[0] for d in cursor.description] if cursor.description else []
+        row = cursor.fetchone()
     return dict(zip(columns, row)) if row else None
 
 
+def get_members(member_ids: List[int], db_path: str = "lodge_members.db") -> List[Dict]:
+    """Πολλά μέλη με ένα query ανά chunk (με τη σειρά των member_ids)"""
+    ids = [int(i) for i in member_ids]
+    found: Dict[int, Dict] = {}
+    with get_pool(db_path).connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(ids), 500):
+            part = ids[start:start + 500]
+            cursor.execute(
+                f"SELECT * FROM members WHERE member_id IN ({', '.join('?' * len(part))})", part
+            )
+            columns = [d[0] for d in cursor.description]
+            for row in cursor.fetchall():
+                member = dict(zip(columns, row))
+                found[member["member_id"]] = member
+    return [found[i] for i in ids if i in found]
+
+
 def _val(member: dict, key: str, fallback: str = "—") -> str:
     v = member.get(key)
     if v is None or str(v).strip() == "":
@@ -49,24 +210,58 @@ def _val(member: dict, key: str, fallback: str = "—") -> str:
     return str(v)
 
 
-def create_member_card_pdf(member_id: int, output_path: str | None = None, db_path: str = "lodge_members.db"):
+def _issue_date_str(issue_date=None) -> str:
+    """Ημερομηνία έκδοσης ως κείμενο dd/mm/yyyy (default: σήμερα)"""
+    if issue_date is None:
+        issue_date = datetime.now()
+    if isinstance(issue_date, (date, datetime)):
+        return issue_date.strftime("%d/%m/%Y")
+    return str(issue_date)
+
+
+def create_member_card_pdf(member_id: int, output_path: str | None = None, db_path: str = "lodge_members.db",
+                           issue_date=None, use_cache: bool = True):
     member = get_member(member_id, db_path=db_path)
     if not member:
         return None
 
-    # Normalize degree label
-    deg = member.get("current_degree", "Μαθητής") or "Μαθητής"
-    if str(deg).strip() == "Δάσκαλος":
-        deg = "Διδάσκαλος"
+    pdf_bytes = member_card_bytes(member, issue_date=issue_date, use_cache=use_cache)
 
-    # Only 2 registry numbers
-    lodge_no = member.get("lodge_reg_no") or "—"
-    gl_no = member.get("grand_lodge_reg_no") or "—"
+    if output_path:
+        with open(output_path, "wb") as f:
+            f.write(pdf_bytes)
+        return output_path
+
+    return io.BytesIO(pdf_bytes)
 
-    # Output buffer
-    buffer = open(output_path, "wb") if output_path else io.BytesIO()
 
-    doc = SimpleDocTemplate(
+def member_card_bytes(member: dict, issue_date=None, use_cache: bool = True) -> bytes:
+    """Η καρτέλα ενός μέλους ως bytes — από το cache αν το μέλος δεν άλλαξε"""
+    issue_date = _issue_date_str(issue_date)
+    cache = get_card_cache() if use_cache else None
+    if cache is not None:
+        key = cache.key(member, TEMPLATE_VERSION, issue_date)
+        cached = cache.get(member["member_id"], key)
+        if cached is not None:
+            return cached
+
+    buffer = io.BytesIO()
+    render_member_card(member, buffer, issue_date=issue_date)
+    pdf_bytes = buffer.getvalue()
+
+    if cache is not None:
+        cache.put(member["member_id"], key, pdf_bytes)
+    return pdf_bytes
+
+
+def render_member_card(member: dict, buffer, ctx: Optional[RenderContext] = None, issue_date=None):
+    """Σχεδίαση της καρτέλας ενός μέλους (dict γραμμής members) στο buffer"""
+    ctx = ctx or get_render_context()
+    _card_document(buffer).build(member_card_story(member, ctx, issue_date=issue_date))
+
+
+def _card_document(buffer) -> SimpleDocTemplate:
+    return SimpleDocTemplate(
         buffer,
         pagesize=A4,
         topMargin=2 * cm,
@@ -75,63 +270,67 @@ def create_member_card_pdf(member_id: int, output_path: str | None = None, db_pa
         rightMargin=2.5 * cm,
     )
 
+
+def create_member_cards_booklet(
+    member_ids: List[int],
+    output_path: str | None = None,
+    db_path: str = "lodge_members.db",
+    issue_date=None,
+):
+    """
+    Όλες οι καρτέλες σε ένα ενιαίο PDF (booklet): ένα story, ένα doc.build.
+    Οι γραμματοσειρές και τα styles ενσωματώνονται μία φορά για όλο το
+    αρχείο αντί για μία ανά μέλος, και κάθε καρτέλα ξεκινά σε νέα σελίδα.
+    Επιστρέφει το output_path ή BytesIO (None αν δεν βρέθηκαν μέλη).
+    """
+    members = get_members(member_ids, db_path=db_path)
+    if not members:
+        return None
+
+    ctx = get_render_context()
+    issue_date = _issue_date_str(issue_date)
     story = []
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        "Title",
-        parent=styles["Heading1"],
-        fontSize=18,
-        textColor=colors.HexColor("#1e3a8a"),
-        spaceAfter=10,
-        alignment=TA_CENTER,
-        fontName=FONT_NAME_BOLD,
-    )
+    for member in members:
+        if story:
+            story.append(PageBreak())
+        story.extend(member_card_story(member, ctx, issue_date=issue_date))
 
-    heading_style = ParagraphStyle(
-        "Heading",
-        parent=styles["Heading2"],
-        fontSize=12,
-        textColor=colors.HexColor("#2563eb"),
-        spaceAfter=10,
-        spaceBefore=15,
-        fontName=FONT_NAME_BOLD,
-    )
+    buffer = open(output_path, "wb") if output_path else io.BytesIO()
+    try:
+        _card_document(buffer).build(story)
+    finally:
+        if output_path:
+            buffer.close()
 
-    number_style = ParagraphStyle(
-        "Number",
-        fontSize=16,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor("#dc2626"),
-        fontName=FONT_NAME_BOLD,
-        spaceAfter=6,
-    )
+    if output_path:
+        return output_path
+    buffer.seek(0)
+    return buffer
 
-    table_style = TableStyle(
-        [
-            ("FONTNAME", (0, 0), (0, -1), FONT_NAME_BOLD),
-            ("FONTNAME", (1, 0), (1, -1), FONT_NAME),
-            ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-            ("TOPPADDING", (0, 0), (-1, -1), 8),
-            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ]
-    )
+
+def member_card_story(member: dict, ctx: Optional[RenderContext] = None, issue_date=None) -> List:
+    """Τα flowables της καρτέλας ενός μέλους (μόνο τα member-specific χτίζονται εδώ)"""
+    ctx = ctx or get_render_context()
+
+    # Normalize degree label
+    deg = member.get("current_degree", "Μαθητής") or "Μαθητής"
+    if str(deg).strip() == "Δάσκαλος":
+        deg = "Διδάσκαλος"
+
+    # Only 2 registry numbers
+    lodge_no = member.get("lodge_reg_no") or "—"
+    gl_no = member.get("grand_lodge_reg_no") or "—"
 
     # ---------------- Header ----------------
-    story.append(Paragraph("ΚΑΡΤΕΛΑ ΜΕΛΟΥΣ", title_style))
-    story.append(Paragraph("ΑΚΡΟΠΟΛΙΣ Υπ ΑΡΙΘΜ 84", title_style))
-    story.append(Spacer(1, 0.4 * cm))
+    story = ctx.header()
 
-    story.append(Paragraph(f"Αριθμός Μητρώου (Στοάς 84): {lodge_no}", number_style))
-    story.append(Paragraph(f"Αριθμός Μητρώου (Μεγάλης Στοάς): {gl_no}", number_style))
+    story.append(Paragraph(f"Αριθμός Μητρώου (Στοάς 84): {lodge_no}", ctx.number_style))
+    story.append(Paragraph(f"Αριθμός Μητρώου (Μεγάλης Στοάς): {gl_no}", ctx.number_style))
     story.append(Spacer(1, 0.6 * cm))
 
     # ---------------- Sections ----------------
-    story.append(Paragraph("ΠΡΟΣΩΠΙΚΑ ΣΤΟΙΧΕΙΑ", heading_style))
-    personal_data = [
+    story.append(ctx.heading("ΠΡΟΣΩΠΙΚΑ ΣΤΟΙΧΕΙΑ"))
+    story.append(ctx.table([
         ["Επώνυμο:", _val(member, "last_name")],
         ["Όνομα:", _val(member, "first_name")],
         ["Πατρώνυμο:", _val(member, "fathers_name")],
@@ -140,26 +339,20 @@ def create_member_card_pdf(member_id: int, output_path: str | None = None, db_pa
         ["Επάγγελμα:", _val(member, "profession")],
         ["ΑΦΜ:", _val(member, "tax_id", _val(member, "afm"))],
         ["Αρ. Ταυτότητας:", _val(member, "id_number")],
-    ]
-    t1 = Table(personal_data, colWidths=[5 * cm, 10 * cm])
-    t1.setStyle(table_style)
-    story.append(t1)
+    ]))
 
-    story.append(Paragraph("ΣΤΟΙΧΕΙΑ ΕΠΙΚΟΙΝΩΝΙΑΣ", heading_style))
-    contact_data = [
+    story.append(ctx.heading("ΣΤΟΙΧΕΙΑ ΕΠΙΚΟΙΝΩΝΙΑΣ"))
+    story.append(ctx.table([
         ["Διεύθυνση:", _val(member, "address")],
         ["ΤΚ:", _val(member, "postal_code")],
         ["Πόλη:", _val(member, "city")],
         ["Τηλ. Οικίας:", _val(member, "home_phone")],
         ["Κινητό:", _val(member, "mobile_phone")],
         ["E-mail:", _val(member, "email")],
-    ]
-    t2 = Table(contact_data, colWidths=[5 * cm, 10 * cm])
-    t2.setStyle(table_style)
-    story.append(t2)
+    ]))
 
-    story.append(Paragraph("ΤΕΚΤΟΝΙΚΕΣ ΠΛΗΡΟΦΟΡΙΕΣ", heading_style))
-    tectonic_data = [
+    story.append(ctx.heading("ΤΕΚΤΟΝΙΚΕΣ ΠΛΗΡΟΦΟΡΙΕΣ"))
+    story.append(ctx.table([
         ["Ημ/νία Μύησης:", _val(member, "initiation_date")],
         ["Αρ. Διπλ. Μύησης:", _val(member, "initiation_diploma")],
         ["Ημ/νία 2ου Βαθμού:", _val(member, "second_degree_date")],
@@ -170,75 +363,170 @@ def create_member_card_pdf(member_id: int, output_path: str | None = None, db_pa
         ["Στοά Μύησης:", _val(member, "initiation_lodge", "ΑΚΡΟΠΟΛΙΣ")],
         ["Αρ. Στοάς:", _val(member, "initiation_lodge_number")],
         ["Εισηγητής:", _val(member, "sponsor")],
-    ]
-    t3 = Table(tectonic_data, colWidths=[5 * cm, 10 * cm])
-    t3.setStyle(table_style)
-    story.append(t3)
+    ]))
 
     story.append(PageBreak())
 
-    story.append(Paragraph("ΙΣΤΟΡΙΚΟ ΣΤΟΑΣ", heading_style))
-    history_data = [
+    story.append(ctx.heading("ΙΣΤΟΡΙΚΟ ΣΤΟΑΣ"))
+    story.append(ctx.table([
         ["Ημ/νία Εισόδου:", _val(member, "entry_date")],
         ["Αξιώματα:", _val(member, "offices_held")],
         ["Παράσημα:", _val(member, "honors")],
         ["Επιτροπές:", _val(member, "committees")],
-    ]
-    t4 = Table(history_data, colWidths=[5 * cm, 10 * cm])
-    t4.setStyle(table_style)
-    story.append(t4)
+    ]))
 
-    story.append(Paragraph("ΟΙΚΟΓΕΝΕΙΑΚΑ ΣΤΟΙΧΕΙΑ", heading_style))
-    family_data = [
+    story.append(ctx.heading("ΟΙΚΟΓΕΝΕΙΑΚΑ ΣΤΟΙΧΕΙΑ"))
+    story.append(ctx.table([
         ["Οικογ. Κατάσταση:", _val(member, "marital_status")],
         ["Όνομα Συζύγου:", _val(member, "spouse_name")],
         ["Ονόματα Τέκνων:", _val(member, "children_names")],
         ["Επείγον Τηλ.:", _val(member, "emergency_phone")],
         ["Επαφή Έκτ. Ανάγκης:", _val(member, "emergency_contact")],
-    ]
-    t5 = Table(family_data, colWidths=[5 * cm, 10 * cm])
-    t5.setStyle(table_style)
-    story.append(t5)
+    ]))
 
-    story.append(Paragraph("ΔΙΟΙΚΗΤΙΚΑ ΣΤΟΙΧΕΙΑ", heading_style))
-    admin_data = [
+    story.append(ctx.heading("ΔΙΟΙΚΗΤΙΚΑ ΣΤΟΙΧΕΙΑ"))
+    story.append(ctx.table([
         ["Κατάσταση Μέλους:", _val(member, "member_status", "Ενεργό")],
         ["Ημ/νία Αλλαγής:", _val(member, "status_change_date")],
         ["Λόγος Αλλαγής:", _val(member, "status_change_reason")],
         ["Οικον. Τακτοποίηση:", _val(member, "financial_status", "Ναι")],
         ["Τελ. Πληρωμή:", _val(member, "last_payment_date")],
-    ]
-    t6 = Table(admin_data, colWidths=[5 * cm, 10 * cm])
-    t6.setStyle(table_style)
-    story.append(t6)
+    ]))
 
     if member.get("notes"):
         story.append(Spacer(1, 0.4 * cm))
-        story.append(Paragraph("ΠΑΡΑΤΗΡΗΣΕΙΣ", heading_style))
-        story.append(Paragraph(str(member.get("notes")), styles["Normal"]))
+        story.append(ctx.heading("ΠΑΡΑΤΗΡΗΣΕΙΣ"))
+        story.append(Paragraph(str(member.get("notes")), ctx.normal_style))
 
     story.append(Spacer(1, 1.6 * cm))
     sig_data = [
-        ["Ημερομηνία Έκδοσης:", datetime.now().strftime("%d/%m/%Y")],
+        ["Ημερομηνία Έκδοσης:", _issue_date_str(issue_date)],
         ["Γραμματεύς-Σφραγιδοφύλαξ:", "_____________________"],
     ]
     t_sig = Table(sig_data, colWidths=[6 * cm, 9 * cm])
-    t_sig.setStyle(
-        TableStyle(
-            [
-                ("FONTNAME", (0, 0), (0, -1), FONT_NAME_BOLD),
-                ("FONTSIZE", (0, 0), (-1, -1), 10),
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-            ]
-        )
-    )
+    t_sig.setStyle(ctx.signature_style)
     story.append(t_sig)
 
-    doc.build(story)
-
-    if output_path:
-        buffer.close()
-        return output_path
+    return story
+
+
+# ---------------- Bulk ----------------
+def _render_cards_chunk(members: List[Dict], issue_date: str) -> List[Tuple[Dict, bytes]]:
+    """Worker: καρτέλες για ένα chunk μελών (τρέχει σε ξεχωριστό process)"""
+    out = []
+    for member in members:
+        buffer = io.BytesIO()
+        render_member_card(member, buffer, issue_date=issue_date)
+        out.append((member, buffer.getvalue()))
+    return out
+
+
+def generate_member_cards(
+    member_ids: List[int],
+    db_path: str = "lodge_members.db",
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    issue_date=None,
+    use_cache: bool = True,
+) -> Iterator[Tuple[Dict, bytes]]:
+    """
+    Μαζική δημιουργία καρτελών: ένα query για όλα τα μέλη και render σε
+    ProcessPoolExecutor. Κάνει yield (member, pdf_bytes) με τη σειρά που
+    ολοκληρώνονται, ώστε ο caller να τα γράφει/μετράει αμέσως.
+    Οι καρτέλες που υπάρχουν στο cache δίνονται αμέσως, χωρίς render.
+    Σε εκκρεμότητα είναι το πολύ 2 chunks ανά worker, άρα η μνήμη μένει
+    φραγμένη σε λίγες καρτέλες όσο μεγάλη κι αν είναι η λίστα.
+    max_workers=1 (ή λίγα μέλη) -> render στο ίδιο process.
+    """
+    issue_date = _issue_date_str(issue_date)
+    cache = get_card_cache() if use_cache else None
+
+    members = []
+    for member in get_members(member_ids, db_path=db_path):
+        if cache is not None:
+            cached = cache.get(member["member_id"], cache.key(member, TEMPLATE_VERSION, issue_date))
+            if cached is not None:
+                yield member, cached
+                continue
+        members.append(member)
+
+    for member, pdf_bytes in _render_cards(members, issue_date, max_workers, chunk_size):
+        if cache is not None:
+            cache.put(member["member_id"], cache.key(member, TEMPLATE_VERSION, issue_date), pdf_bytes)
+        yield member, pdf_bytes
+
+
+def _render_cards(
+    members: List[Dict],
+    issue_date: str,
+    max_workers: Optional[int],
+    chunk_size: Optional[int],
+) -> Iterator[Tuple[Dict, bytes]]:
+    if not members:
+        return
+
+    workers = max_workers or multiprocessing.cpu_count()
+    if chunk_size is None:
+        chunk_size = max(1, min(16, len(members) // (workers * 4)))
+
+    if workers <= 1 or len(members) <= chunk_size:
+        for member in members:
+            yield from _render_cards_chunk([member], issue_date)
+        return
+
+    chunks = iter([members[i:i + chunk_size] for i in range(0, len(members), chunk_size)])
+    pending: Dict = {}  # future -> chunk
+    try:
+        # spawn: το Streamlit τρέχει πολλά threads, και το fork από multi-threaded process δεν είναι ασφαλές
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+            for chunk in chunks:
+                pending[executor.submit(_render_cards_chunk, chunk, issue_date)] = chunk
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rendered = future.result()
+                    del pending[future]
+                    yield from rendered
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending[executor.submit(_render_cards_chunk, chunk, issue_date)] = chunk
+    except (BrokenProcessPool, OSError) as e:
+        # Τα spawn workers ξαναφορτώνουν το __main__· από stdin/REPL/ορισμένους
+        # embedded runners αυτό αποτυγχάνει -> ό,τι έμεινε γίνεται εδώ
+        log.warning("process pool unavailable (%s), rendering in-process", e)
+        for chunk in [*pending.values(), *chunks]:
+            yield from _render_cards_chunk(chunk, issue_date)
+
+
+def card_filename(member: Dict) -> str:
+    return f"Kartela_{member.get('last_name')}_{member.get('first_name')}.pdf"
+
+
+def write_member_cards_zip(
+    member_ids: List[int],
+    fileobj,
+    db_path: str = "lodge_members.db",
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    issue_date=None,
+) -> int:
+    """
+    Γράφει τις καρτέλες σε ZIP στο fileobj όσο ολοκληρώνονται (streaming).
+    ZIP_STORED: τα PDF είναι ήδη συμπιεσμένα, το deflate κερδίζει ελάχιστα.
+    progress(done, total) καλείται μετά από κάθε καρτέλα.
+    Επιστρέφει πόσες καρτέλες γράφτηκαν.
+    """
+    total = len(member_ids)
+    done = 0
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_STORED) as zipf:
+        cards = generate_member_cards(member_ids, db_path=db_path, max_workers=max_workers, issue_date=issue_date)
+        for member, pdf_bytes in cards:
+            zipf.writestr(card_filename(member), pdf_bytes)
+            done += 1
+            if progress:
+                progress(done, total)
+    return done
 
-    buffer.seek(0)
-    return buffer
@@ -0,0 +1,131 @@
+"""
+Email Scheduler
+Ξεχωριστό process (εκτός Streamlit) για τις υπενθυμίσεις εργασιών:
+βάζει στο email_outbox όσες εργασίες πλησιάζουν/καθυστερούν (μία
+υπενθύμιση ανά εργασία ανά ημέρα) και στέλνει το outbox σε batches
+με όριο ρυθμού. Ό,τι έμεινε στη μέση από προηγούμενη εκτέλεση
+συνεχίζεται, και η επανεκτέλεση δεν στέλνει τίποτα δύο φορές.
+
+    python -m modules.scheduler run     [--interval 300]   # συνεχώς
+    python -m modules.scheduler once                       # μία φορά (cron)
+    python -m modules.scheduler status
+"""
+
+import argparse
+import logging
+import sys
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+from modules.database import Database
+from modules.email import DeliveryEngine, EmailManager
+
+log = logging.getLogger("scheduler")
+
+
+def queue_due_reminders(manager: EmailManager, db: Database, default_to: str, days: int = 7) -> int:
+    """Υπενθυμίσεις για εκπρόθεσμες + επόμενων `days` ημερών εργασίες· πόσες νέες μπήκαν"""
+    tasks = pd.concat([db.get_overdue_tasks(), db.get_upcoming_tasks(days)], ignore_index=True)
+    if tasks.empty:
+        return 0
+    tasks = tasks.drop_duplicates("task_id")
+    return len(manager.queue_task_reminders(tasks.to_dict("records"), default_to, wake=False))
+
+
+def send_batches(engine: DeliveryEngine, batch: int = 20, rate_per_minute: float = 30.0) -> int:
+    """
+    Αποστολή όσων είναι due, `batch` μηνύματα τη φορά (μία SMTP σύνδεση
+    ανά batch), με παύση ώστε να μην ξεπερνιούνται τα rate_per_minute.
+    Αν ο server δεν είναι διαθέσιμος (π.χ. λάθος κωδικός), σταματά και τα
+    μηνύματα μένουν στην ουρά για τον επόμενο κύκλο.
+    """
+    sent = 0
+    while engine.outbox.due_count() and not engine.paused:
+        start = time.monotonic()
+        sent += engine.drain(limit=batch)
+        if engine.paused:
+            log.warning("SMTP unavailable, retry in %.0fs: %s", engine.paused, engine.last_outage)
+            break
+        if rate_per_minute:
+            pause = batch * 60.0 / rate_per_minute - (time.monotonic() - start)
+            if pause > 0 and engine.outbox.due_count():
+                time.sleep(pause)
+    return sent
+
+
+def run_cycle(manager: EmailManager, db: Database, args) -> Dict[str, int]:
+    requeued = manager.engine.outbox.requeue_stale()
+    queued = queue_due_reminders(manager, db, args.to, args.days)
+    sent = 0 if args.dry_run else send_batches(manager.engine, args.batch, args.rate)
+    log.info("requeued %d, queued %d, sent %d, outbox %s", requeued, queued, sent, manager.engine.outbox.stats())
+    return {"requeued": requeued, "queued": queued, "sent": sent}
+
+
+def _email_config(args) -> Optional[Dict]:
+    if args.smtp:
+        host, _, port = args.smtp.partition(":")
+        return {
+            'smtp_server': host,
+            'smtp_port': int(port or 587),
+            'sender_email': args.sender,
+            'sender_password': args.password,
+            'use_tls': not args.no_tls,
+        }
+    from modules.config import get_config
+
+    return get_config().get_email_config()
+
+
+def print_status(manager: EmailManager):
+    outbox = manager.engine.outbox
+    print("outbox:", outbox.stats() or "empty", "| due now:", outbox.due_count())
+    for row in outbox.recent("failed", limit=10):
+        outbox_id, kind, to_email, subject, _, attempts, error, _ = row
+        print(f"  failed #{outbox_id} [{kind}] {to_email} '{subject}' x{attempts}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=("run", "once", "status"), default="once")
+    parser.add_argument("--db", default="lodge_members.db")
+    parser.add_argument("--days", type=int, default=7, help="υπενθύμιση για εργασίες των επόμενων ημερών")
+    parser.add_argument("--to", help="παραλήπτης όταν το assigned_to δεν είναι email (default: αποστολέας)")
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=30.0, help="μηνύματα ανά λεπτό (0 = χωρίς όριο)")
+    parser.add_argument("--interval", type=float, default=300.0, help="δευτερόλεπτα ανάμεσα στους κύκλους (run)")
+    parser.add_argument("--dry-run", action="store_true", help="μόνο καταχώριση στο outbox")
+    parser.add_argument("--smtp", help="HOST:PORT αντί για τα secrets (π.χ. τοπικός SMTP για δοκιμές)")
+    parser.add_argument("--sender", default="")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--no-tls", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    config = _email_config(args)
+    if config is None:
+        sys.exit("Email δεν είναι ρυθμισμένο ([email] στα secrets ή --smtp).")
+    args.to = args.to or config['sender_email']
+
+    db = Database(args.db)
+    manager = EmailManager(config, db_path=args.db)
+
+    if args.command == "status":
+        print_status(manager)
+        return
+    if args.command == "once":
+        run_cycle(manager, db, args)
+        return
+
+    try:
+        while True:
+            run_cycle(manager, db, args)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        log.info("stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Statistics Engine
+Όλα τα στατιστικά μελών από ένα μόνο πέρασμα στη βάση
+"""
+
+import sqlite3
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Διαστάσεις του "κύβου" (με αυτή τη σειρά στα κλειδιά των cells)
+DIMENSIONS = ("current_degree", "member_status", "financial_status")
+
+ACTIVE_STATUS = "Ενεργό"
+
+
+class MemberStatistics:
+    """
+    Συμπαγές αποτέλεσμα στατιστικών.
+    Κρατά μόνο τα counts ανά (βαθμός, κατάσταση, οικονομικά) — λίγες
+    δεκάδες γραμμές το πολύ — και από αυτά βγάζει rollups, cross-tabs
+    και ποσοστά χωρίς να ξαναδιαβάσει μέλη.
+    """
+
+    def __init__(self, cells: Dict[Tuple[Optional[str], Optional[str], Optional[str]], int]):
+        self.cells = dict(cells)
+        self.total = sum(self.cells.values())
+        self.by_degree = self._rollup(0)
+        self.by_status = self._rollup(1)
+        self.by_financial = self._rollup(2)
+        self.degree_status = self._rollup(0, 1)
+        self.degree_financial = self._rollup(0, 2)
+        self.active = self.by_status.get(ACTIVE_STATUS, 0)
+        self.inactive = self.total - self.active
+        self.pct_active = self.percent(self.active)
+
+    def _rollup(self, *dims: int) -> Dict:
+        """Άθροιση των cells στις διαστάσεις dims (grouping set)"""
+        out: Dict = {}
+        for key, n in self.cells.items():
+            group = key[dims[0]] if len(dims) == 1 else tuple(key[d] for d in dims)
+            out[group] = out.get(group, 0) + n
+        return out
+
+    def percent(self, n: int) -> float:
+        """Ποσοστό επί του συνόλου μελών (0 αν δεν υπάρχουν μέλη)"""
+        return (n / self.total * 100) if self.total else 0.0
+
+    def crosstab(self, rows: str = "current_degree", columns: str = "member_status") -> pd.DataFrame:
+        """Cross-tab δύο διαστάσεων (ίδια μορφή με pd.crosstab, χωρίς κενές τιμές)"""
+        r, c = DIMENSIONS.index(rows), DIMENSIONS.index(columns)
+        counts = self._rollup(r, c)
+        index = sorted({k[0] for k in counts if k[0] is not None})
+        cols = sorted({k[1] for k in counts if k[1] is not None})
+        return pd.DataFrame(
+            [[counts.get((i, j), 0) for j in cols] for i in index],
+            index=pd.Index(index, name=rows),
+            columns=pd.Index(cols, name=columns),
+        )
+
+    def to_dict(self) -> Dict:
+        """Η μορφή του Database.get_member_statistics()"""
+        return {
+            "total": self.total,
+            "active": self.active,
+            "by_status": dict(self.by_status),
+            "by_degree": dict(self.by_degree),
+            "by_financial": dict(self.by_financial),
+        }
+
+
+# Πίνακας-σύνοψη: ένα counter ανά συνδυασμό (βαθμός, κατάσταση, οικονομικά),
+# ενημερώνεται από triggers στο members. Τα NULL αποθηκεύονται ως ''.
+STATS_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS member_stats (
+        current_degree TEXT NOT NULL,
+        member_status TEXT NOT NULL,
+        financial_status TEXT NOT NULL,
+        member_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY ({", ".join(DIMENSIONS)})
+    ) WITHOUT ROWID
+"""
+
+
+def _key_sql(row: str) -> str:
+    return ", ".join(f"IFNULL({row}.{d}, '')" for d in DIMENSIONS)
+
+
+def _match_sql(row: str) -> str:
+    return " AND ".join(f"{d} = IFNULL({row}.{d}, '')" for d in DIMENSIONS)
+
+
+# Ξεχωριστά statements (όχι executescript, που κάνει COMMIT το τρέχον transaction)
+STATS_TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS member_stats_ai AFTER INSERT ON members BEGIN
+        INSERT OR IGNORE INTO member_stats VALUES ({_key_sql("new")}, 0);
+        UPDATE member_stats SET member_count = member_count + 1 WHERE {_match_sql("new")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS member_stats_ad AFTER DELETE ON members BEGIN
+        UPDATE member_stats SET member_count = member_count - 1 WHERE {_match_sql("old")};
+        DELETE FROM member_stats WHERE member_count <= 0 AND {_match_sql("old")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS member_stats_au AFTER UPDATE OF {", ".join(DIMENSIONS)} ON members
+    WHEN {" OR ".join(f"old.{d} IS NOT new.{d}" for d in DIMENSIONS)}
+    BEGIN
+        UPDATE member_stats SET member_count = member_count - 1 WHERE {_match_sql("old")};
+        DELETE FROM member_stats WHERE member_count <= 0 AND {_match_sql("old")};
+        INSERT OR IGNORE INTO member_stats VALUES ({_key_sql("new")}, 0);
+        UPDATE member_stats SET member_count = member_count + 1 WHERE {_match_sql("new")};
+    END
+    """,
+)
+
+
+def init_stats_table(conn: sqlite3.Connection):
+    """Δημιουργία member_stats + triggers (και αρχικό γέμισμα αν είναι νέος)"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'member_stats'"
+    ).fetchone()
+    conn.execute(STATS_TABLE_SQL)
+    for statement in STATS_TRIGGERS_SQL:
+        conn.execute(statement)
+    if not exists:
+        rebuild_stats(conn)
+
+
+def rebuild_stats(conn: sqlite3.Connection) -> int:
+    """
+    Ξαναχτίζει το member_stats από το members (διόρθωση τυχόν απόκλισης).
+    Επιστρέφει πόσοι συνδυασμοί διέφεραν από τα σωστά counts.
+    """
+    before = _read_cells(conn)
+    conn.execute("DELETE FROM member_stats")
+    conn.execute(f"""
+        INSERT INTO member_stats ({", ".join(DIMENSIONS)}, member_count)
+        SELECT {", ".join(f"IFNULL({d}, '')" for d in DIMENSIONS)}, COUNT(*)
+        FROM members
+        GROUP BY {", ".join(f"IFNULL({d}, '')" for d in DIMENSIONS)}
+    """)
+    after = _read_cells(conn)
+    return sum(1 for k in set(before) | set(after) if before.get(k) != after.get(k))
+
+
+def _read_cells(conn: sqlite3.Connection) -> Dict:
+    return {
+        tuple(v if v != "" else None for v in row[:-1]): row[-1]
+        for row in conn.execute(f"""
+            SELECT {", ".join(DIMENSIONS)}, member_count
+            FROM member_stats
+            WHERE member_count > 0
+        """)
+    }
+
+
+def compute_member_statistics(conn: sqlite3.Connection) -> MemberStatistics:
+    """
+    Διαβάζει τον "κύβο" από το member_stats (O(συνδυασμών), όχι O(μελών)).
+    Η SQLite δεν έχει GROUPING SETS/ROLLUP, οπότε τα επιμέρους σύνολα
+    βγαίνουν από τον κύβο στη μνήμη.
+    """
+    return MemberStatistics(_read_cells(conn))
+
+
+if __name__ == "__main__":
+    # python -m modules.statistics [db_path]  -> rebuild του member_stats
+    import sys
+    from modules.database import Database
+
+    db = Database(sys.argv[1] if len(sys.argv) > 1 else "lodge_members.db")
+    drift = db.rebuild_stats()
+    print(f"member_stats rebuilt ({drift} combinations corrected)")
@@ -42,7 +42,11 @@ st.markdown('<div class="main-header">📋 Μητρώο Μελών</div>', unsaf
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    search_term = st.text_input("🔍 Αναζήτηση", placeholder="Επώνυμο, Όνομα, Τηλέφωνο...")
+    search_term = st.text_input(
+        "🔍 Αναζήτηση",
+        placeholder="Επώνυμο, Όνομα, Τηλέφωνο, Πόλη...",
+        help="Αρκούν τα πρώτα γράμματα κάθε λέξης· τόνοι και κεφαλαία αγνοούνται."
+    )
 
 with col2:
     status_filter = st.selectbox("Κατάσταση", ["Όλες", "Ενεργό", "Ανενεργό", "Αποχωρήσαν"])
@@ -53,24 +57,32 @@ with col3:
 with col4:
     financial_filter = st.selectbox("Οικονομική Κατάσταση", ["Όλες", "Ναι", "Όχι"])
 
-# Get data
-if search_term:
-    df = db.search_members(search_term)
-else:
-    df = db.get_all_members()
+filters = {
+    "search": search_term or None,
+    "member_status": None if status_filter == "Όλες" else status_filter,
+    "current_degree": None if degree_filter == "Όλοι" else degree_filter,
+    "financial_status": None if financial_filter == "Όλες" else financial_filter,
+}
 
-# Apply filters
-if status_filter != "Όλες":
-    df = df[df['member_status'] == status_filter]
+# Pagination (keyset: κάθε σελίδα ξεκινά μετά την τελευταία γραμμή της προηγούμενης)
+page_size = st.session_state.get("registry_page_size", 50)
+signature = (tuple(filters.items()), page_size)
+if st.session_state.get("registry_signature") != signature:
+    st.session_state.registry_signature = signature
+    st.session_state.registry_cursors = [None]
 
-if degree_filter != "Όλοι":
-    df = df[df['current_degree'] == degree_filter]
+cursors = st.session_state.registry_cursors
+page_no = len(cursors) - 1
+total_count = db.count_members(filters)
 
-if financial_filter != "Όλες":
-    df = df[df['financial_status'] == financial_filter]
+if search_term:
+    # Με αναζήτηση: ταξινόμηση κατά συνάφεια
+    df = db.query_members(filters, sort="relevance", limit=page_size, offset=page_no * page_size)
+else:
+    df = db.query_members(filters, limit=page_size, after=cursors[-1])
 
 # Display
-st.markdown(f"**Αποτελέσματα:** {len(df)} μέλη")
+st.markdown(f"**Αποτελέσματα:** {total_count} μέλη")
 
 if len(df) > 0:
     # Rename columns for display
@@ -94,19 +106,40 @@ if len(df) > 0:
         hide_index=True
     )
     
+    total_pages = max(1, -(-total_count // page_size))
+    col1, col2, col3, col4 = st.columns([1, 1, 2, 1])
+    
+    with col1:
+        if st.button("⬅️ Προηγούμενη", disabled=page_no == 0, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    
+    with col2:
+        if st.button("Επόμενη ➡️", disabled=page_no + 1 >= total_pages, use_container_width=True):
+            last = df.iloc[-1]
+            cursors.append((last['last_name'], last['first_name'], last['member_id']))
+            st.rerun()
+    
+    with col3:
+        st.markdown(f"Σελίδα **{page_no + 1}** από **{total_pages}**")
+    
+    with col4:
+        st.selectbox("Ανά σελίδα", [25, 50, 100, 250], index=1, key="registry_page_size")
+    
     # Export options
     st.markdown("---")
     col1, col2 = st.columns([3, 1])
     
     with col2:
-        csv = df.to_csv(index=False).encode('utf-8-sig')
-        st.download_button(
-            label="📥 Λήψη CSV",
-            data=csv,
-            file_name="mhtrwo_melon.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+        if st.button("📄 Προετοιμασία CSV", use_container_width=True):
+            csv = db.query_members(filters).to_csv(index=False).encode('utf-8-sig')
+            st.download_button(
+                label="📥 Λήψη CSV",
+                data=csv,
+                file_name="mhtrwo_melon.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
 else:
     st.info("📭 Δεν βρέθηκαν μέλη με αυτά τα κριτήρια")
 
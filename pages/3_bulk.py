@@ -6,9 +6,11 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from modules.database import get_database
+from modules.changes import changes_to_rows, diff_frames, editor_changes
+from modules.import_export import EXPORT_FORMATS, KEY_LABELS, import_members
+from modules.jobs import get_job_manager
+from modules.jobs_ui import job_session_id, render_jobs
 import pandas as pd
-import io
-from datetime import datetime
 
 st.set_page_config(
     page_title="Μαζική Επεξεργασία",
@@ -24,6 +26,19 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 db = get_database()
+jobs = get_job_manager(db.db_path)
+
+
+def _import_result(job):
+    result = job["result"]
+    st.success(f"✅ Ενημερώθηκαν {result.get('updated', 0)} μέλη, προστέθηκαν {result.get('inserted', 0)} νέα!")
+    if result.get("error_count"):
+        st.warning(f"⚠️ {result['error_count']} γραμμές δεν ενημερώθηκαν")
+        with st.expander("Λεπτομέρειες"):
+            st.dataframe(
+                pd.DataFrame(result["errors"], columns=["Γραμμή", "Κλειδί", "Σφάλμα"]),
+                hide_index=True, use_container_width=True,
+            )
 
 st.markdown('<div class="main-header">✏️ Μαζική Επεξεργασία Μελών</div>', unsafe_allow_html=True)
 
@@ -37,99 +52,113 @@ with tab1:
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("📥 Λήψη Excel με Όλα τα Μέλη", type="primary", use_container_width=True):
-            conn = db.get_connection()
-            detailed_df = pd.read_sql_query("""
-                SELECT member_id, last_name, first_name, fathers_name, birth_date, birth_place, 
-                       profession, tax_id, id_number, address, postal_code, city, home_phone, 
-                       mobile_phone, email, initiation_date, initiation_diploma, current_degree,
-                       initiation_lodge, sponsor, member_status, financial_status, last_payment_date, notes
-                FROM members ORDER BY last_name, first_name
-            """, conn)
-            conn.close()
-            
-            detailed_df = detailed_df.rename(columns={
-                'member_id': 'Α/Α', 'last_name': 'Επώνυμο', 'first_name': 'Όνομα', 
-                'fathers_name': 'Πατρώνυμο', 'birth_date': 'Ημ/νία Γέννησης', 
-                'birth_place': 'Τόπος Γέννησης', 'profession': 'Επάγγελμα', 'tax_id': 'ΑΦΜ',
-                'id_number': 'Αρ. Ταυτότητας', 'address': 'Διεύθυνση', 'postal_code': 'ΤΚ',
-                'city': 'Πόλη', 'home_phone': 'Τηλ. Οικίας', 'mobile_phone': 'Κινητό',
-                'email': 'Email', 'initiation_date': 'Ημ/νία Μύησης', 
-                'initiation_diploma': 'Αρ. Διπλώματος', 'current_degree': 'Βαθμός',
-                'initiation_lodge': 'Στοά Μύησης', 'sponsor': 'Εισηγητής',
-                'member_status': 'Κατάσταση', 'financial_status': 'Οικον. Τακτοποίηση',
-                'last_payment_date': 'Τελ. Πληρωμή', 'notes': 'Παρατηρήσεις'
-            })
-            
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                detailed_df.to_excel(writer, index=False, sheet_name='Μέλη')
-            output.seek(0)
-            
-            st.download_button(
-                label="⬇️ Κατέβασμα Excel",
-                data=output,
-                file_name=f"Μητρωο_Μελων_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                type="primary",
-                use_container_width=True
+        export_format = st.radio(
+            "Μορφή αρχείου",
+            list(EXPORT_FORMATS),
+            format_func=lambda f: EXPORT_FORMATS[f][0],
+            horizontal=True,
+            key="export_format"
+        )
+        
+        if st.button("📥 Εξαγωγή Όλων των Μελών", type="primary", use_container_width=True):
+            # Στο background: streaming από τη βάση σε αρχείο στο δίσκο
+            jobs.submit(
+                "export_members", label=f"Εξαγωγή {EXPORT_FORMATS[export_format][0]}",
+                session_id=job_session_id(), fmt=export_format,
             )
-            st.success(f"✅ Έτοιμο! {len(detailed_df)} μέλη στο Excel")
+        
+        render_jobs(
+            jobs, "export_members", key="export_jobs", limit=3,
+            details=lambda job: st.caption(f"{job['result'].get('count', 0)} μέλη στο αρχείο"),
+        )
     
     with col2:
         st.markdown("### 📤 Import από Excel")
-        uploaded_file = st.file_uploader("Ανέβασε το επεξεργασμένο Excel", type=['xlsx', 'xls'])
+        uploaded_file = st.file_uploader("Ανέβασε το επεξεργασμένο Excel", type=['xlsx', 'xls', 'csv'])
+        
+        import_key = st.selectbox(
+            "Αντιστοίχιση γραμμών με βάση",
+            db.upsert_keys(),
+            format_func=lambda k: KEY_LABELS.get(k, k),
+            key="import_key"
+        )
+        import_upsert = st.checkbox("➕ Προσθήκη όσων δεν υπάρχουν ως νέα μέλη", key="import_upsert")
         
-        if uploaded_file is not None:
+        # Αρχεία που έχουν ήδη σταλεί για αποθήκευση (file_id -> job_id): όσο
+        # τρέχει ή μετά την ολοκλήρωση δεν ξαναπροσφέρεται αποθήκευση, αλλιώς
+        # ένα δεύτερο κλικ με upsert θα πρόσθετε ξανά τις γραμμές χωρίς Α/Α
+        submitted = st.session_state.setdefault("import_submitted", {})
+        submitted_job = None
+        if uploaded_file is not None and uploaded_file.file_id in submitted:
+            submitted_job = jobs.get(submitted[uploaded_file.file_id])
+            if submitted_job is not None and submitted_job["status"] == "failed":
+                del submitted[uploaded_file.file_id]  # αποτυχία: επιτρέπεται νέα προσπάθεια
+                submitted_job = None
+            elif submitted_job is None or submitted_job["status"] == "done":
+                st.info("✅ Το αρχείο αυτό έχει ήδη αποθηκευτεί. Ανέβασε νέο αρχείο για νέο import.")
+            else:
+                st.info(f"⏳ Το αρχείο αποθηκεύεται (εργασία #{submitted_job['job_id']})...")
+
+        if uploaded_file is not None and uploaded_file.file_id not in submitted:
             try:
-                df_import = pd.read_excel(uploaded_file)
-                st.success(f"✅ Διαβάστηκαν {len(df_import)} εγγραφές")
-                st.dataframe(df_import.head(5), use_container_width=True)
+                # Ανάλυση (χωρίς εγγραφή) μία φορά ανά αρχείο/ρυθμίσεις
+                preview_id = (uploaded_file.file_id, import_key, import_upsert)
+                preview = st.session_state.get("import_preview")
+                if not preview or preview[0] != preview_id:
+                    uploaded_file.seek(0)
+                    with st.spinner("Έλεγχος αρχείου..."):
+                        report = import_members(
+                            db, uploaded_file, uploaded_file.name,
+                            key=import_key, upsert=import_upsert, dry_run=True
+                        )
+                    st.session_state["import_preview"] = (preview_id, report)
+                else:
+                    report = preview[1]
                 
-                if st.button("💾 Αποθήκευση Αλλαγών στη Βάση", type="primary"):
-                    df_import = df_import.rename(columns={
-                        'Α/Α': 'member_id', 'Επώνυμο': 'last_name', 'Όνομα': 'first_name',
-                        'Πατρώνυμο': 'fathers_name', 'Ημ/νία Γέννησης': 'birth_date',
-                        'Τόπος Γέννησης': 'birth_place', 'Επάγγελμα': 'profession',
-                        'ΑΦΜ': 'tax_id', 'Αρ. Ταυτότητας': 'id_number', 'Διεύθυνση': 'address',
-                        'ΤΚ': 'postal_code', 'Πόλη': 'city', 'Τηλ. Οικίας': 'home_phone',
-                        'Κινητό': 'mobile_phone', 'Email': 'email', 'Ημ/νία Μύησης': 'initiation_date',
-                        'Αρ. Διπλώματος': 'initiation_diploma', 'Βαθμός': 'current_degree',
-                        'Στοά Μύησης': 'initiation_lodge', 'Εισηγητής': 'sponsor',
-                        'Κατάσταση': 'member_status', 'Οικον. Τακτοποίηση': 'financial_status',
-                        'Τελ. Πληρωμή': 'last_payment_date', 'Παρατηρήσεις': 'notes'
-                    })
-                    
-                    updated = 0
-                    for _, row in df_import.iterrows():
-                        member_id = row['member_id']
-                        update_data = row.drop('member_id').to_dict()
-                        update_data = {k: (None if pd.isna(v) else v) for k, v in update_data.items()}
-                        db.update_member(member_id, update_data)
-                        updated += 1
-                    
-                    st.success(f"✅ Ενημερώθηκαν {updated} μέλη επιτυχώς!")
+                st.success(
+                    f"✅ Διαβάστηκαν {report.rows} εγγραφές: "
+                    f"{report.changed_members} με αλλαγές, {report.inserted} νέα μέλη, "
+                    f"{report.unchanged} χωρίς αλλαγές"
+                )
+                if report.ignored_columns:
+                    st.caption(f"Αγνοούνται οι στήλες: {', '.join(report.ignored_columns)}")
+                if report.changes:
+                    with st.expander(f"Αλλαγές ({len(report.changes)} κελιά)"):
+                        st.dataframe(report.changes_frame(), hide_index=True, use_container_width=True)
+                if report.errors:
+                    st.warning(f"⚠️ {len(report.errors)} γραμμές με σφάλματα δεν θα ενημερωθούν")
+                    with st.expander("Λεπτομέρειες"):
+                        st.dataframe(report.errors_frame(), hide_index=True, use_container_width=True)
+                
+                if (report.changes or report.inserted) and st.button("💾 Αποθήκευση Αλλαγών στη Βάση", type="primary"):
+                    # Η εγγραφή γίνεται στο background από αντίγραφο του αρχείου
+                    uploaded_file.seek(0)
+                    submitted[uploaded_file.file_id] = jobs.submit(
+                        "import_members", label=f"Import {uploaded_file.name}", session_id=job_session_id(),
+                        path=jobs.save_upload(uploaded_file, uploaded_file.name),
+                        filename=uploaded_file.name, key=import_key, upsert=import_upsert,
+                    )
+                    st.session_state.pop("import_preview", None)
                     st.rerun()
             except Exception as e:
                 st.error(f"❌ Σφάλμα: {e}")
+        
+        render_jobs(jobs, "import_members", key="import_jobs", limit=3, details=_import_result)
 
 # Tab 2: Bulk change
 with tab2:
     st.subheader("🔄 Ομαδική Αλλαγή Πεδίων")
     
-    df = db.get_all_members()
-    
     col1, col2 = st.columns(2)
     with col1:
         filter_status_bulk = st.selectbox("Φίλτρο Κατάστασης", ["Όλα", "Ενεργό", "Ανενεργό"], key="bulk_status_filter")
     with col2:
         filter_degree_bulk = st.selectbox("Φίλτρο Βαθμού", ["Όλοι", "Μαθητής", "Εταίρος", "Δάσκαλος"], key="bulk_degree_filter")
     
-    filtered_df = df.copy()
-    if filter_status_bulk != "Όλα":
-        filtered_df = filtered_df[filtered_df['member_status'] == filter_status_bulk]
-    if filter_degree_bulk != "Όλοι":
-        filtered_df = filtered_df[filtered_df['current_degree'] == filter_degree_bulk]
+    filtered_df = db.query_members({
+        "member_status": None if filter_status_bulk == "Όλα" else filter_status_bulk,
+        "current_degree": None if filter_degree_bulk == "Όλοι" else filter_degree_bulk,
+    })
     
     st.info(f"📊 Επιλεγμένα: **{len(filtered_df)}** μέλη")
     
@@ -150,10 +179,8 @@ with tab2:
         field_name = 'initiation_lodge'
     
     if st.button("🔄 Εφαρμογή Αλλαγής σε Όλα τα Επιλεγμένα Μέλη", type="primary"):
-        updated_count = 0
-        for _, row in filtered_df.iterrows():
-            db.update_member(row['member_id'], {field_name: new_value})
-            updated_count += 1
+        results = db.bulk_set_field(filtered_df['member_id'].tolist(), field_name, new_value)
+        updated_count = sum(1 for _, ok, _ in results if ok)
         st.success(f"✅ Ενημερώθηκαν {updated_count} μέλη!")
         st.balloons()
         st.rerun()
@@ -164,9 +191,10 @@ with tab3:
     st.info("💡 Κάνε κλικ σε οποιοδήποτε κελί για επεξεργασία!")
     
     df = db.get_all_members()
+    editor_df = df[['member_id', 'last_name', 'first_name', 'mobile_phone', 'email', 'current_degree', 'member_status']]
     
     edited_df = st.data_editor(
-        df[['member_id', 'last_name', 'first_name', 'mobile_phone', 'email', 'current_degree', 'member_status']],
+        editor_df,
         column_config={
             "member_id": st.column_config.NumberColumn("Α/Α", disabled=True),
             "last_name": st.column_config.TextColumn("Επώνυμο", required=True),
@@ -177,27 +205,20 @@ with tab3:
             "member_status": st.column_config.SelectboxColumn("Κατάσταση", options=["Ενεργό", "Ανενεργό", "Αποχωρήσαν", "Διαγραφέν"])
         },
         hide_index=True,
-        use_container_width=True
+        use_container_width=True,
+        key="member_editor"
     )
     
     if st.button("💾 Αποθήκευση Όλων των Αλλαγών", type="primary"):
-        changes_made = 0
-        for idx in range(len(df)):
-            original_row = df.iloc[idx]
-            edited_row = edited_df.iloc[idx]
-            
-            if not original_row.equals(edited_row):
-                member_id = edited_row['member_id']
-                update_data = {
-                    'last_name': edited_row['last_name'],
-                    'first_name': edited_row['first_name'],
-                    'mobile_phone': edited_row['mobile_phone'],
-                    'email': edited_row['email'],
-                    'current_degree': edited_row['current_degree'],
-                    'member_status': edited_row['member_status']
-                }
-                db.update_member(member_id, update_data)
-                changes_made += 1
+        # Μόνο τα κελιά που άλλαξαν: από το delta του editor, αλλιώς diff όλου του πίνακα
+        editor_state = st.session_state.get("member_editor")
+        if editor_state is not None:
+            changes = editor_changes(editor_df, editor_state)
+        else:
+            changes = diff_frames(editor_df, edited_df)
+        
+        results = db.bulk_update_members(changes_to_rows(changes))
+        changes_made = sum(1 for _, ok, _ in results if ok)
         
         if changes_made > 0:
             st.success(f"✅ Ενημερώθηκαν {changes_made} μέλη!")
@@ -6,10 +6,10 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from modules.database import get_database
-from modules.pdf_generator import create_member_card_pdf
-import zipfile
+from modules.config import get_config
+from modules.jobs import get_job_manager
+from modules.jobs_ui import job_session_id, render_jobs
 from datetime import datetime
-import io
 
 st.set_page_config(
     page_title="Καρτέλες PDF",
@@ -18,6 +18,7 @@ st.set_page_config(
 )
 
 db = get_database()
+config = get_config()
 
 
 st.markdown("""
@@ -29,6 +30,8 @@ st.markdown("""
 
 st.markdown('<div class="main-header">📄 Καρτέλες PDF</div>', unsafe_allow_html=True)
 
+issue_date = st.date_input("Ημερομηνία Έκδοσης", value=datetime.now().date(), format="DD/MM/YYYY")
+
 tab1, tab2 = st.tabs(["📄 Μεμονωμένη Καρτέλα", "📦 Μαζική Δημιουργία"])
 
 # Tab 1: Single card
@@ -45,7 +48,9 @@ with tab1:
         member_id = member_options[selected]
         
         with st.spinner("Δημιουργία PDF..."):
-            pdf_buffer = create_member_card_pdf(member_id, None)
+            # Το ReportLab φορτώνεται μόνο όταν χρειαστεί (όχι σε κάθε άνοιγμα της σελίδας)
+            from modules.pdf_generator import create_member_card_pdf
+            pdf_buffer = create_member_card_pdf(member_id, None, issue_date=issue_date)
             
             if pdf_buffer:
                 member = db.get_member_by_id(member_id)
@@ -67,7 +72,7 @@ with tab1:
 with tab2:
     st.subheader("Μαζική Δημιουργία Καρτελών")
     
-    st.info("💡 Δημιουργία καρτελών για όλα τα μέλη σε ένα ZIP αρχείο")
+    st.info("💡 Δημιουργία καρτελών για όλα τα μέλη σε ένα ZIP αρχείο ή σε ένα ενιαίο PDF για εκτύπωση")
     
     col1, col2 = st.columns(2)
     
@@ -77,40 +82,38 @@ with tab2:
     with col2:
         filter_degree = st.selectbox("Φίλτρο Βαθμού", ["Όλοι", "Μαθητής", "Εταίρος", "Δάσκαλος"], key="pdf_degree")
     
-    df_filter = df.copy()
-    if filter_status != "Όλα":
-        df_filter = df_filter[df_filter['member_status'] == filter_status]
-    if filter_degree != "Όλοι":
-        df_filter = df_filter[df_filter['current_degree'] == filter_degree]
+    df_filter = db.query_members({
+        "member_status": None if filter_status == "Όλα" else filter_status,
+        "current_degree": None if filter_degree == "Όλοι" else filter_degree,
+    })
     
     st.markdown(f"**Θα δημιουργηθούν:** {len(df_filter)} καρτέλες")
     
-    if st.button("📦 Δημιουργία Όλων των Καρτελών", type="primary"):
-        with st.spinner(f"Δημιουργία {len(df_filter)} καρτελών..."):
-            zip_buffer = io.BytesIO()
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                progress_bar = st.progress(0)
-                
-                for idx, (_, row) in enumerate(df_filter.iterrows()):
-                    pdf_buffer = create_member_card_pdf(row['member_id'], None)
-                    if pdf_buffer:
-                        filename = f"Kartela_{row['last_name']}_{row['first_name']}.pdf"
-                        zipf.writestr(filename, pdf_buffer.getvalue())
-                    
-                    progress_bar.progress((idx + 1) / len(df_filter))
-            
-            zip_buffer.seek(0)
-            
-            st.success(f"✅ Δημιουργήθηκαν {len(df_filter)} καρτέλες!")
-            
-            st.download_button(
-                label="⬇️ Λήψη ZIP με Όλες τις Καρτέλες",
-                data=zip_buffer.getvalue(),
-                file_name=f"Karteles_Melon_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
-                mime="application/zip",
-                type="primary"
-            )
+    output_format = st.radio(
+        "Μορφή",
+        ["ZIP (ένα PDF ανά μέλος)", "Ενιαίο PDF (όλες οι καρτέλες)"],
+        horizontal=True,
+        key="pdf_format"
+    )
+    
+    # Οι καρτέλες φτιάχνονται στο background· το αρχείο μένει διαθέσιμο για λήψη
+    # και μετά από αλλαγή σελίδας (στο ίδιο session)
+    jobs = get_job_manager(db.db_path)
+    member_ids = [int(mid) for mid in df_filter['member_id']]
+    
+    if output_format.startswith("Ενιαίο") and st.button("📚 Δημιουργία Ενιαίου PDF", type="primary", disabled=not member_ids):
+        jobs.submit(
+            "cards_booklet", label=f"Ενιαίο PDF ({len(member_ids)} καρτέλες)", session_id=job_session_id(),
+            member_ids=member_ids, issue_date=issue_date.strftime("%d/%m/%Y"),
+        )
+    
+    if output_format.startswith("ZIP") and st.button("📦 Δημιουργία Όλων των Καρτελών", type="primary", disabled=not member_ids):
+        jobs.submit(
+            "cards_zip", label=f"ZIP ({len(member_ids)} καρτέλες)", session_id=job_session_id(),
+            member_ids=member_ids, issue_date=issue_date.strftime("%d/%m/%Y"), max_workers=config.pdf_workers,
+        )
+    
+    render_jobs(jobs, ("cards_zip", "cards_booklet"), key="card_jobs")
 
 st.markdown("---")
 st.info("""
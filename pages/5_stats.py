@@ -6,8 +6,6 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from modules.database import get_database
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
 
 st.set_page_config(
@@ -29,26 +27,28 @@ st.markdown("""
 
 st.markdown('<div class="main-header">📈 Στατιστικά & Αναλύσεις</div>', unsafe_allow_html=True)
 
-# Get statistics
-stats = db.get_member_statistics()
-df = db.get_all_members()
+# Get statistics (ένα πέρασμα στη βάση, χωρίς φόρτωση μελών)
+stats = db.get_statistics()
 
 # Key metrics
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Σύνολο Μελών", stats['total'], delta=None)
+    st.metric("Σύνολο Μελών", stats.total, delta=None)
 with col2:
-    st.metric("Ενεργά Μέλη", stats['active'], delta=f"{stats['active']/stats['total']*100:.0f}%")
+    st.metric("Ενεργά Μέλη", stats.active, delta=f"{stats.pct_active:.0f}%")
 with col3:
-    inactive = stats['total'] - stats['active']
-    st.metric("Ανενεργά", inactive)
+    st.metric("Ανενεργά", stats.inactive)
 with col4:
-    degrees = stats.get('by_degree', {})
+    degrees = stats.by_degree
     st.metric("Δάσκαλοι", degrees.get('Δάσκαλος', 0))
 
 st.markdown("---")
 
+# Το plotly φορτώνεται αφού σταλούν header και metrics (εμφανίζονται αμέσως)
+import plotly.express as px
+import plotly.graph_objects as go
+
 # Charts
 col1, col2 = st.columns(2)
 
@@ -71,7 +71,7 @@ with col1:
 with col2:
     st.subheader("📊 Κατάσταση Μελών")
     
-    by_status = stats.get('by_status', {})
+    by_status = stats.by_status
     status_df = pd.DataFrame(list(by_status.items()), columns=['Κατάσταση', 'Αριθμός'])
     
     fig_status = px.bar(
@@ -91,11 +91,12 @@ st.markdown("---")
 # Financial status
 st.subheader("💰 Οικονομική Τακτοποίηση")
 
-financial_counts = df['financial_status'].value_counts()
-fin_df = pd.DataFrame({
-    'Κατάσταση': financial_counts.index,
-    'Αριθμός': financial_counts.values
-})
+financial_counts = sorted(
+    ((k, v) for k, v in stats.by_financial.items() if k is not None),
+    key=lambda kv: kv[1],
+    reverse=True
+)
+fin_df = pd.DataFrame(financial_counts, columns=['Κατάσταση', 'Αριθμός'])
 
 col1, col2 = st.columns([2, 1])
 
@@ -119,7 +120,7 @@ with col1:
 with col2:
     st.markdown("<br><br>", unsafe_allow_html=True)
     for _, row in fin_df.iterrows():
-        percentage = (row['Αριθμός'] / stats['total'] * 100)
+        percentage = stats.percent(row['Αριθμός'])
         st.metric(row['Κατάσταση'], row['Αριθμός'], delta=f"{percentage:.1f}%")
 
 st.markdown("---")
@@ -130,7 +131,7 @@ st.subheader("📋 Λεπτομερής Ανάλυση")
 tab1, tab2 = st.tabs(["Βαθμοί × Κατάσταση", "Οικονομικά × Βαθμός"])
 
 with tab1:
-    cross_tab = pd.crosstab(df['current_degree'], df['member_status'])
+    cross_tab = stats.crosstab('current_degree', 'member_status')
     st.dataframe(cross_tab, use_container_width=True)
     
     fig_cross = px.bar(
@@ -144,7 +145,7 @@ with tab1:
     st.plotly_chart(fig_cross, use_container_width=True)
 
 with tab2:
-    cross_tab2 = pd.crosstab(df['current_degree'], df['financial_status'])
+    cross_tab2 = stats.crosstab('current_degree', 'financial_status')
     st.dataframe(cross_tab2, use_container_width=True)
     
     fig_cross2 = px.bar(
@@ -165,9 +166,9 @@ st.subheader("📊 Συγκεντρωτικός Πίνακας")
 summary_data = {
     'Κατηγορία': ['Σύνολο', 'Ενεργά', 'Ανενεργά', 'Μαθητές', 'Εταίροι', 'Δάσκαλοι'],
     'Αριθμός': [
-        stats['total'],
-        stats['active'],
-        stats['total'] - stats['active'],
+        stats.total,
+        stats.active,
+        stats.inactive,
         degrees.get('Μαθητής', 0),
         degrees.get('Εταίρος', 0),
         degrees.get('Δάσκαλος', 0)
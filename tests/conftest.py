@@ -0,0 +1,16 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Αντίγραφο της βάσης του repo (τα tests δεν αγγίζουν το πρωτότυπο)"""
+    path = tmp_path / "lodge_members.db"
+    shutil.copy(os.path.join(ROOT, "lodge_members.db"), path)
+    return str(path)
@@ -0,0 +1,55 @@
+"""ResponseCache (TTL/LRU) και AIAssistant πάνω στο stub backend"""
+
+import time
+
+from modules.ai import AIAssistant, ResponseCache, StubBackend, cache_key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # το a γίνεται το πιο πρόσφατο
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("a", "A")
+    assert cache.get("a") == "A"
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_key_normalizes_prompt_but_not_model_or_system():
+    key = cache_key("m", "s", "Σύνταξε πρόσκληση συνεδρίας")
+    assert cache_key("m", "s", "  σύνταξε\nΠΡΌΣΚΛΗΣΗ   συνεδρίας ") == key
+    assert cache_key("other", "s", "Σύνταξε πρόσκληση συνεδρίας") != key
+    assert cache_key("m", "other", "Σύνταξε πρόσκληση συνεδρίας") != key
+
+
+def test_assistant_serves_repeated_prompt_from_cache():
+    backend = StubBackend(first_token_ms=0, token_ms=0)
+    assistant = AIAssistant(backend, cache=ResponseCache(max_entries=10, ttl_seconds=60))
+    first = assistant.ask("Σύνταξε πρόσκληση συνεδρίας")
+    second = assistant.ask("σύνταξε  πρόσκληση συνεδρίας")
+    assert first == second and backend.calls == 1
+    stats = assistant.stats()
+    assert (stats["hits"], stats["misses"], stats["calls"]) == (1, 1, 1)
+
+
+class FailingBackend:
+    name = "failing"
+
+    def stream(self, model, system, prompt, max_tokens):
+        raise ConnectionError("offline")
+        yield  # generator
+
+
+def test_errors_are_not_cached():
+    assistant = AIAssistant(FailingBackend(), cache=ResponseCache(max_entries=10, ttl_seconds=60))
+    assert assistant.ask("γεια") == "Σφάλμα AI: offline"
+    assert assistant.cache.stats()["entries"] == 0
@@ -0,0 +1,59 @@
+"""Database.bulk_update_members: executemany ανά ομάδα, SAVEPOINT fallback ανά γραμμή"""
+
+import pytest
+
+from modules.database import Database
+
+
+@pytest.fixture
+def db(db_path):
+    return Database(db_path)
+
+
+def _ids(db, n):
+    return [int(x) for x in db.get_all_members()["member_id"].head(n)]
+
+
+def test_failing_row_does_not_roll_back_the_rest(db):
+    a, b, c = _ids(db, 3)
+    before = db.get_member_by_id(b)["last_name"]
+    db.get_all_members()  # στην cache, για να φανεί το invalidate
+
+    results = db.bulk_update_members([
+        {"member_id": a, "last_name": "ΠΡΩΤΟΣ"},
+        {"member_id": b, "last_name": None},  # NOT NULL -> αποτυγχάνει μόνο αυτή
+        {"member_id": c, "last_name": "ΤΡΙΤΟΣ"},
+    ])
+
+    assert [r[:2] for r in results] == [(a, True), (b, False), (c, True)]
+    assert "NOT NULL" in results[1][2]
+    assert db.get_member_by_id(a)["last_name"] == "ΠΡΩΤΟΣ"
+    assert db.get_member_by_id(b)["last_name"] == before
+    assert db.get_member_by_id(c)["last_name"] == "ΤΡΙΤΟΣ"
+    names = dict(zip(db.get_all_members()["member_id"], db.get_all_members()["last_name"]))
+    assert names[a] == "ΠΡΩΤΟΣ" and names[c] == "ΤΡΙΤΟΣ"
+
+
+def test_rejected_rows_keep_their_position(db):
+    a, b = _ids(db, 2)
+    missing = max(_ids(db, 10_000)) + 1
+
+    results = db.bulk_update_members([
+        {"member_id": a, "city": "ΠΑΤΡΑ"},
+        {"city": "ΛΑΡΙΣΑ"},
+        {"member_id": b, "no_such_field": 1},
+        {"member_id": missing, "city": "ΒΟΛΟΣ"},
+        {"member_id": b},
+        {"member_id": b, "city": "ΚΑΒΑΛΑ", "notes": "x"},
+    ])
+
+    assert results == [
+        (a, True, "OK"),
+        (None, False, "Λείπει member_id"),
+        (b, False, "Άγνωστα πεδία: no_such_field"),
+        (missing, False, "Δεν βρέθηκε μέλος"),
+        (b, True, "Καμία αλλαγή"),
+        (b, True, "OK"),
+    ]
+    assert db.get_member_by_id(a)["city"] == "ΠΑΤΡΑ"
+    assert db.get_member_by_id(b)["city"] == "ΚΑΒΑΛΑ"
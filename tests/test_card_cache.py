@@ -0,0 +1,35 @@
+"""CardCache: μία καρτέλα ανά (μέλος, περιεχόμενο, ημερομηνία έκδοσης)"""
+
+from modules.card_cache import CardCache
+
+MEMBER = {"member_id": 7, "last_name": "ΠΑΠΑΔΟΠΟΥΛΟΣ", "first_name": "ΓΕΩΡΓΙΟΣ"}
+
+
+def test_issue_dates_do_not_evict_each_other(tmp_path):
+    cache = CardCache(str(tmp_path))
+    today, tomorrow = cache.key(MEMBER, "v1", "17/10/2026"), cache.key(MEMBER, "v1", "18/10/2026")
+    cache.put(7, today, b"today")
+    cache.put(7, tomorrow, b"tomorrow")
+    assert cache.get(7, today) == b"today"
+    assert cache.get(7, tomorrow) == b"tomorrow"
+    assert cache.stats()["bytes"] == len(b"today") + len(b"tomorrow")
+
+
+def test_changed_member_gets_new_key_and_invalidate_drops_all_versions(tmp_path):
+    cache = CardCache(str(tmp_path))
+    key = cache.key(MEMBER, "v1", "17/10/2026")
+    assert cache.key({**MEMBER, "first_name": "ΝΙΚΟΣ"}, "v1", "17/10/2026") != key
+    cache.put(7, key, b"a")
+    cache.put(7, cache.key(MEMBER, "v1", "18/10/2026"), b"b")
+    cache.invalidate([7])
+    assert cache.get(7, key) is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path):
+    cache = CardCache(str(tmp_path), max_bytes=25)
+    for n in range(5):
+        cache.put(n, f"k{n}", b"x" * 10)
+    assert cache.stats()["bytes"] <= 25
+    assert cache.get(4, "k4") == b"x" * 10
+    assert cache.get(0, "k0") is None
@@ -0,0 +1,35 @@
+"""Μαζική δημιουργία καρτελών: process pool και fallback στο ίδιο process"""
+
+import subprocess
+import sys
+
+from modules.database import Database
+from modules.pdf_generator import generate_member_cards
+
+from conftest import ROOT
+
+
+def _ids(db_path, n=6):
+    return [int(mid) for mid in Database(db_path).get_all_members()["member_id"][:n]]
+
+
+def test_cards_render_through_process_pool(db_path):
+    ids = _ids(db_path)
+    cards = list(generate_member_cards(ids, db_path=db_path, max_workers=2, chunk_size=1, use_cache=False))
+    assert sorted(member["member_id"] for member, _ in cards) == sorted(ids)
+    assert all(pdf.startswith(b"%PDF") for _, pdf in cards)
+
+
+def test_falls_back_in_process_when_main_is_not_importable(db_path):
+    # Από stdin τα spawn workers δεν μπορούν να ξαναφορτώσουν το __main__
+    script = (
+        f"import sys; sys.path.insert(0, {ROOT!r})\n"
+        "from modules.pdf_generator import generate_member_cards\n"
+        f"cards = list(generate_member_cards({_ids(db_path)!r}, db_path={db_path!r}, "
+        "max_workers=2, chunk_size=1, use_cache=False))\n"
+        "print(len(cards))\n"
+    )
+    proc = subprocess.run([sys.executable, "-"], input=script, capture_output=True, text=True,
+                          cwd=str(db_path).rsplit("/", 1)[0], timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip().splitlines()[-1] == "6"
@@ -0,0 +1,77 @@
+"""diff_frames / editor_changes / changes_to_rows"""
+
+import numpy as np
+import pandas as pd
+
+from modules.changes import changes_to_rows, diff_frames, editor_changes
+from modules.database import Database
+
+
+def _frame():
+    return pd.DataFrame({
+        "member_id": [1, 2, 3],
+        "city": ["ΑΘΗΝΑ", None, "ΠΑΤΡΑ"],
+        "notes": [np.nan, "x", None],
+        "age": [40, 50, 60],
+    })
+
+
+def test_diff_frames_matches_rows_by_key():
+    original = _frame()
+    edited = original.iloc[::-1].reset_index(drop=True).copy()  # άλλη σειρά, ίδια δεδομένα
+    assert diff_frames(original, edited) == []
+
+    edited.loc[edited["member_id"] == 3, "city"] = "ΛΑΡΙΣΑ"
+    edited.loc[edited["member_id"] == 2, "city"] = "ΒΟΛΟΣ"
+    edited.loc[edited["member_id"] == 1, "age"] = 41
+    changes = diff_frames(original, edited)
+
+    assert sorted(changes) == [(1, "age", 41), (2, "city", "ΒΟΛΟΣ"), (3, "city", "ΛΑΡΙΣΑ")]
+    assert all(type(mid) is int for mid, _, _ in changes)
+    assert type(dict(((m, c), v) for m, c, v in changes)[(1, "age")]) is int
+
+
+def test_diff_frames_blank_to_blank_is_not_a_change():
+    original = _frame()
+    edited = original.copy()
+    edited["notes"] = [None, "x", np.nan]
+    assert diff_frames(original, edited) == []
+
+    edited.loc[0, "city"] = None
+    assert diff_frames(original, edited) == [(1, "city", None)]
+    assert diff_frames(original, edited, columns=["notes"]) == []
+    assert diff_frames(original, edited.iloc[0:0]) == []
+
+
+def test_editor_changes_uses_positions_and_skips_reverted_cells():
+    original = _frame()
+    state = {
+        "edited_rows": {
+            0: {"city": "ΑΘΗΝΑ"},              # ξαναγύρισε στην αρχική τιμή
+            "1": {"city": "ΚΑΒΑΛΑ", "notes": "x"},
+            2: {"notes": None, "member_id": 9, "missing": 1},
+        },
+        "added_rows": [], "deleted_rows": [],
+    }
+    assert editor_changes(original, state) == [(2, "city", "ΚΑΒΑΛΑ")]
+    assert editor_changes(original, {}) == []
+
+
+def test_changes_apply_as_one_row_per_member(db_path):
+    db = Database(db_path)
+    ids = [int(x) for x in db.get_all_members()["member_id"].head(3)]
+    members = [db.get_member_by_id(mid) for mid in ids]
+    original = pd.DataFrame(members)[["member_id", "city", "profession"]]
+    edited = original.copy()
+    edited.loc[0, "city"] = "ΧΑΝΙΑ"
+    edited.loc[0, "profession"] = "ΜΗΧΑΝΙΚΟΣ"
+    edited.loc[2, "city"] = "ΣΕΡΡΕΣ"
+
+    rows = changes_to_rows(diff_frames(original, edited))
+    assert sorted(rows, key=lambda r: r["member_id"]) == [
+        {"member_id": ids[0], "city": "ΧΑΝΙΑ", "profession": "ΜΗΧΑΝΙΚΟΣ"},
+        {"member_id": ids[2], "city": "ΣΕΡΡΕΣ"},
+    ]
+    assert all(ok for _, ok, _ in db.bulk_update_members(rows))
+    assert db.get_member_by_id(ids[0])["profession"] == "ΜΗΧΑΝΙΚΟΣ"
+    assert db.get_member_by_id(ids[2])["city"] == "ΣΕΡΡΕΣ"
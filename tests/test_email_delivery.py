@@ -0,0 +1,134 @@
+"""DeliveryEngine απέναντι σε τοπικό SMTP server (aiosmtpd)"""
+
+import socket
+import time
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from modules.email import DeliveryEngine, Outbox
+
+pytestmark = pytest.mark.filterwarnings("ignore:Requiring AUTH while not requiring TLS")
+
+USER, PASSWORD = "secretary@example.org", "correct-horse"
+
+
+class Handler:
+    """reject*: 550 στο RCPT, busy*: 451 την πρώτη φορά, αλλιώς παράδοση"""
+
+    def __init__(self):
+        self.delivered = []
+        self._busy_seen = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("reject"):
+            return "550 5.1.1 No such user"
+        if address.startswith("busy") and address not in self._busy_seen:
+            self._busy_seen.add(address)
+            return "451 4.3.0 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.append((list(envelope.rcpt_tos), envelope.original_content))
+        return "250 OK"
+
+
+def _authenticate(server, session, envelope, mechanism, auth_data):
+    ok = auth_data.login == USER.encode() and auth_data.password == PASSWORD.encode()
+    return AuthResult(success=ok, handled=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = Handler()
+    controller = Controller(
+        handler, hostname="127.0.0.1", port=_free_port(),
+        authenticator=_authenticate, auth_required=True, auth_require_tls=False,
+    )
+    controller.start()
+    try:
+        yield controller, handler
+    finally:
+        controller.stop()
+
+
+def _config(controller, password=PASSWORD):
+    return {
+        'smtp_server': controller.hostname,
+        'smtp_port': controller.port,
+        'sender_email': USER,
+        'sender_password': password,
+        'use_tls': False,
+        'timeout': 5,
+    }
+
+
+def _rows(outbox):
+    return {row[2]: row for row in outbox.recent(limit=50)}  # to_email -> row
+
+
+def test_success_transient_and_permanent_recipient(smtp_server, db_path):
+    controller, handler = smtp_server
+    outbox = Outbox(db_path)
+    outbox.enqueue([
+        ("ok@example.org", "Θέμα", "<p>1</p>"),
+        ("busy@example.org", "Θέμα", "<p>2</p>"),
+        ("reject@example.org", "Θέμα", "<p>3</p>"),
+    ])
+    engine = DeliveryEngine(_config(controller), outbox, backoff_base=0)
+
+    assert engine.drain() == 2
+
+    rows = _rows(outbox)
+    assert rows["ok@example.org"][4] == "sent"
+    assert rows["busy@example.org"][4] == "sent"
+    assert rows["busy@example.org"][5] == 2  # 451 -> retry
+    assert rows["reject@example.org"][4] == "failed"
+    assert "550" in rows["reject@example.org"][6]
+    assert sorted(r[0][0] for r in handler.delivered) == ["busy@example.org", "ok@example.org"]
+    assert (engine.sent, engine.retried, engine.failed, engine.outages) == (2, 1, 1, 0)
+
+
+def test_auth_failure_releases_batch_and_backs_off(smtp_server, db_path):
+    controller, handler = smtp_server
+    outbox = Outbox(db_path)
+    outbox.enqueue([(f"member{n}@example.org", "Θέμα", "<p>x</p>") for n in range(3)])
+    engine = DeliveryEngine(_config(controller, password="wrong"), outbox)
+
+    assert engine.drain() == 0
+
+    rows = _rows(outbox).values()
+    assert [row[4] for row in rows] == ["pending"] * 3
+    assert [row[5] for row in rows] == [0] * 3  # δεν χρεώθηκε προσπάθεια
+    assert all("535" in row[6] for row in rows)
+    assert engine.failed == 0 and engine.outages == 1
+    assert engine.paused > 0
+    assert outbox.due_count() == 0  # next_attempt_at στο μέλλον
+    assert not handler.delivered
+
+
+def test_workers_deliver_in_background(smtp_server, db_path):
+    controller, handler = smtp_server
+    outbox = Outbox(db_path)
+    engine = DeliveryEngine(_config(controller), outbox, workers=2, batch_size=5, poll_interval=0.1)
+    outbox.enqueue([(f"member{n}@example.org", "Θέμα", "<p>x</p>") for n in range(12)])
+    engine.wake()
+    try:
+        deadline = time.monotonic() + 10
+        while outbox.stats().get("sent", 0) < 12 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        engine.stop()
+    assert outbox.stats() == {"sent": 12}
+    assert len(handler.delivered) == 12
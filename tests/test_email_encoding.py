@@ -0,0 +1,84 @@
+"""encode_message: έγκυρο μήνυμα SMTP (μόνο CRLF) που διαβάζεται σωστά"""
+
+import re
+from email import message_from_bytes
+from email.header import decode_header, make_header
+
+import pytest
+
+from modules.email import encode_message, task_reminder_message
+from modules.email_templates import EmailTemplate, get_template
+
+BARE_LF = re.compile(rb"(?<!\r)\n")
+
+
+@pytest.mark.parametrize("subject, body", [
+    task_reminder_message("Προετοιμασία ετήσιου προϋπολογισμού και απολογισμού της Στοάς", "20/10/2026"),
+    get_template("meeting_reminder").render({"meeting_date": "20/10/2026", "agenda": "Εκλογές <Αξιωματικών>"}),
+    ("Short ASCII subject", "<p>ok</p>"),
+])
+def test_no_bare_lf_and_subject_roundtrip(subject, body):
+    data = encode_message("lodge@example.org", "member@example.org", subject, body)
+    assert not BARE_LF.search(data)
+    message = message_from_bytes(data)
+    assert str(make_header(decode_header(message["Subject"]))) == subject
+    assert message.get_payload()[0].get_payload(decode=True).decode("utf-8") == body
+
+
+def test_header_injection_rejected():
+    with pytest.raises(ValueError):
+        encode_message("lodge@example.org", "member@example.org\r\nBcc: x@example.org", "s", "b")
+
+
+def test_headers_include_date_and_message_id():
+    message = message_from_bytes(encode_message("lodge@example.org", "member@example.org", "s", "b"))
+    assert message["Date"]
+    assert message["Message-ID"].endswith("@example.org>")
+    other = message_from_bytes(encode_message("lodge@example.org", "member@example.org", "s", "b"))
+    assert other["Message-ID"] != message["Message-ID"]
+
+
+# Τα bodies όπως τα έφτιαχνε το EmailManager πριν τα templates (HTML ως έχει)
+def _baseline_task_body(task_title, due_date):
+    return f"""
+        <html>
+        <body>
+            <h2>Υπενθύμιση Εργασίας</h2>
+            <p><strong>Εργασία:</strong> {task_title}</p>
+            <p><strong>Προθεσμία:</strong> {due_date}</p>
+            <p>Η εργασία πλησιάζει την προθεσμία της.</p>
+            <br>
+            <p>Στοά ΑΚΡΟΠΟΛΙΣ</p>
+        </body>
+        </html>
+        """
+
+
+def _baseline_meeting_body(meeting_date, agenda):
+    return f"""
+        <html>
+        <body>
+            <h2>Προσεχής Συνεδρία</h2>
+            <p><strong>Ημερομηνία:</strong> {meeting_date}</p>
+            <p><strong>Θέματα Ημερήσιας Διάταξης:</strong></p>
+            <p>{agenda}</p>
+            <br>
+            <p>Στοά ΑΚΡΟΠΟΛΙΣ Υπ ΑΡΙΘΜ 84</p>
+        </body>
+        </html>
+        """
+
+
+def test_reminders_match_baseline_output():
+    agenda = "<b>1.</b> Εκλογές<br><ul><li>Προϋπολογισμός & Απολογισμός</li></ul>"
+    assert get_template("meeting_reminder").render({"meeting_date": "20/10/2026", "agenda": agenda}) == (
+        "Υπενθύμιση Συνεδρίας ΑΚΡΟΠΟΛΙΣ", _baseline_meeting_body("20/10/2026", agenda)
+    )
+    assert task_reminder_message("<i>Λογοδοσία</i>", "2026-10-20") == (
+        "Υπενθύμιση: <i>Λογοδοσία</i>", _baseline_task_body("<i>Λογοδοσία</i>", "2026-10-20")
+    )
+
+
+def test_member_fields_are_escaped():
+    template = EmailTemplate("${full_name}", "<p>${full_name}</p><p>${note}</p>").partial(note="<b>ok</b>")
+    assert template.render({"full_name": "<script>"}) == ("<script>", "<p>&lt;script&gt;</p><p><b>ok</b></p>")
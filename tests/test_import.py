@@ -0,0 +1,84 @@
+"""import_members: chunks, έλεγχος γραμμών, εγγραφή μόνο των κελιών που άλλαξαν"""
+
+import csv
+import io
+
+import pytest
+
+from modules.database import Database
+from modules.import_export import import_members, write_members_csv
+
+
+@pytest.fixture
+def db(db_path):
+    return Database(db_path)
+
+
+def _csv(rows):
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return io.BytesIO(buf.getvalue().encode("utf-8-sig"))
+
+
+def test_reimporting_an_export_changes_nothing(db, db_path, tmp_path):
+    path = tmp_path / "mhtrwo.csv"
+    count = write_members_csv(str(path), db_path=db_path)
+
+    seen = []
+    with open(path, "rb") as f:
+        report = import_members(db, f, "mhtrwo.csv", chunk_size=7, progress=seen.append)
+
+    assert report.rows == report.unchanged == count
+    assert report.updated == report.inserted == 0
+    assert report.changes == [] and report.errors == []
+    assert seen == sorted(seen) and seen[-1] == count and len(seen) == -(-count // 7)
+
+
+def test_invalid_rows_are_reported_and_only_changed_cells_written(db):
+    a, b = [int(x) for x in db.get_all_members()["member_id"].head(2)]
+    old_a = db.get_member_by_id(a)
+    old_b = db.get_member_by_id(b)
+    missing = int(db.get_all_members()["member_id"].max()) + 1
+
+    rows = [
+        ["Α/Α", "Πόλη", "Κατάσταση", "Άγνωστη στήλη"],
+        [a, "ΝΕΑ ΠΟΛΗ", old_a["member_status"], "x"],   # 2: αλλάζει μόνο η πόλη
+        [b, old_b["city"], old_b["member_status"], ""],  # 3: καμία αλλαγή
+        ["", "", "", ""],                                # κενή γραμμή
+        ["abc", "ΠΑΤΡΑ", "", ""],                        # 5
+        ["inf", "ΠΑΤΡΑ", "", ""],                        # 6
+        [b, "ΠΑΤΡΑ", "Ζωντανό", ""],                      # 7
+        [missing, "ΠΑΤΡΑ", "", ""],                      # 8
+    ]
+
+    preview = import_members(db, _csv(rows), "m.csv", chunk_size=2, dry_run=True)
+    assert db.get_member_by_id(a)["city"] == old_a["city"]
+    assert preview.updated == 1 and preview.unchanged == 1
+
+    report = import_members(db, _csv(rows), "m.csv", chunk_size=2)
+    assert report.rows == 6
+    assert report.updated == 1 and report.unchanged == 1
+    assert report.changes == [(a, "city", old_a["city"], "ΝΕΑ ΠΟΛΗ")]
+    assert report.ignored_columns == ["Άγνωστη στήλη"]
+    assert [e[0] for e in report.errors] == [5, 6, 7, 8]
+    assert report.not_found == [missing]
+    assert db.get_member_by_id(a)["city"] == "ΝΕΑ ΠΟΛΗ"
+    assert db.get_member_by_id(b)["city"] == old_b["city"]
+
+
+def test_upsert_inserts_new_members_once(db):
+    count = db.count_members()
+    rows = [
+        ["Α/Α", "Επώνυμο", "Όνομα"],
+        ["", "ΝΕΟΤΕΡΟΣ", "ΜΕΛΟΣ"],
+        ["", "ΑΝΩΝΥΜΟΣ", ""],
+    ]
+
+    report = import_members(db, _csv(rows), "m.csv", upsert=True)
+    assert report.inserted == 1
+    assert [e[0] for e in report.errors] == [3]
+    assert db.count_members() == count + 1
+
+    again = import_members(db, _csv(rows[:2]), "m.csv", upsert=True)
+    assert again.inserted == 0 and len(again.errors) == 1
+    assert db.count_members() == count + 1
@@ -0,0 +1,39 @@
+"""Instrumentation: ανενεργό εκτός αν ζητηθεί (DIAGNOSTICS.TOKEN / env)"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+from modules import instrumentation
+from modules.instrumentation import connection_factory, enable_instrumentation, get_instrumentation
+
+
+@pytest.fixture
+def instr():
+    instr = get_instrumentation()
+    enabled = instr.enabled
+    yield instr
+    instr.enabled = enabled
+
+
+def test_disabled_by_default():
+    env = {k: v for k, v in os.environ.items() if k != "DB_INSTRUMENTATION"}
+    code = "from modules.instrumentation import get_instrumentation; print(get_instrumentation().enabled)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_enable_respects_explicit_opt_out(instr, monkeypatch):
+    instr.enabled = False
+    monkeypatch.setenv("DB_INSTRUMENTATION", "0")
+    assert enable_instrumentation() is False
+    assert connection_factory() is sqlite3.Connection
+
+    monkeypatch.delenv("DB_INSTRUMENTATION")
+    assert enable_instrumentation() is True
+    assert connection_factory() is instrumentation.InstrumentedConnection
@@ -0,0 +1,93 @@
+"""JobManager: εκτέλεση, και εργασίες χαμένες από restart/άλλο process"""
+
+import threading
+import time
+
+from modules.jobs import JobManager, job_kind
+
+release = threading.Event()
+
+
+@job_kind("test_wait")
+def _wait_job(ctx, value: int = 0):
+    release.wait(10)
+    return {"value": value}
+
+
+def _wait_for(manager, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while manager.get(job_id)["status"] != status and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return manager.get(job_id)
+
+
+def _manager(db_path, tmp_path, **kwargs):
+    return JobManager(db_path, workers=1, jobs_dir=str(tmp_path / "jobs"), **kwargs)
+
+
+def test_job_runs_to_completion(db_path, tmp_path):
+    release.set()
+    manager = _manager(db_path, tmp_path)
+    job = _wait_for(manager, manager.submit("test_wait", value=3), "done")
+    assert job["result"] == {"value": 3}
+    manager.close()
+
+
+def test_live_jobs_of_other_instances_are_kept(db_path, tmp_path):
+    release.clear()
+    first = _manager(db_path, tmp_path)
+    job_id = first.submit("test_wait")
+    _wait_for(first, job_id, "running")
+
+    second = _manager(db_path, tmp_path)  # π.χ. δεύτερος worker process, ίδιο pid σε container
+    assert second._abandon_orphans() == 0
+    assert second.get(job_id)["status"] == "running"
+
+    release.set()
+    assert _wait_for(first, job_id, "done")["status"] == "done"
+    first.close()
+    second.close()
+
+
+def test_jobs_without_heartbeat_are_failed(db_path, tmp_path):
+    release.clear()
+    first = _manager(db_path, tmp_path)
+    job_id = first.submit("test_wait")
+    _wait_for(first, job_id, "running")
+    first.close()  # το "process" σταμάτησε να στέλνει heartbeat
+    with first.pool.connection() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = '2000-01-01 00:00:00' WHERE job_id = ?", (job_id,))
+
+    restarted = _manager(db_path, tmp_path)
+    job = restarted.get(job_id)
+    assert job["status"] == "failed"
+    assert "Διακόπηκε" in job["error"]
+    release.set()
+    restarted.close()
+
+
+def test_abandoned_job_is_not_revived_by_its_runner(db_path, tmp_path):
+    release.clear()
+    first = _manager(db_path, tmp_path)
+    first.close()  # χωρίς heartbeat, αλλά ο runner συνεχίζει (π.χ. database locked)
+    job_id = first.submit("test_wait")
+    _wait_for(first, job_id, "running")
+    with first.pool.connection() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = '2000-01-01 00:00:00' WHERE job_id = ?", (job_id,))
+
+    other = _manager(db_path, tmp_path)
+    assert other.get(job_id)["status"] == "failed"
+    release.set()
+    first.executor.shutdown(wait=True)
+    assert other.get(job_id)["status"] == "failed"
+    other.close()
+
+
+def test_recent_is_scoped_to_session(db_path, tmp_path):
+    release.set()
+    manager = _manager(db_path, tmp_path)
+    mine = manager.submit("test_wait", session_id="alice")
+    manager.submit("test_wait", session_id="bob")
+    assert [job["job_id"] for job in manager.recent("test_wait", session_id="alice")] == [mine]
+    assert len(manager.recent("test_wait")) == 2
+    manager.close()
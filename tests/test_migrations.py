@@ -0,0 +1,61 @@
+"""migrate(): από τη βάση του repo (user_version=0) μέχρι το SCHEMA_VERSION"""
+
+import sqlite3
+
+from modules.database import Database, get_pool
+from modules.migrations import (
+    FTS_COLUMNS, MIGRATIONS, SCHEMA_VERSION, UNIQUE_KEY_COLUMNS, migrate, schema_version,
+)
+
+
+def _schema(conn):
+    return sorted(conn.execute("SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"))
+
+
+def test_baseline_database_migrates_to_latest(db_path):
+    raw = sqlite3.connect(db_path)
+    assert schema_version(raw) == 0
+    members = raw.execute("SELECT * FROM members ORDER BY member_id").fetchall()
+    raw.close()
+
+    with get_pool(db_path).connection() as conn:
+        assert migrate(conn) == [v for v, _, _ in MIGRATIONS]
+        assert schema_version(conn) == SCHEMA_VERSION
+
+        names = {name for _, name in _schema(conn)}
+        assert {"members", "tasks", "members_fts", "member_stats", "email_outbox", "jobs"} <= names
+        assert {"members_fts_ai", "members_fts_ad", "members_fts_au"} <= names
+        assert {f"ux_members_{c}" for c in UNIQUE_KEY_COLUMNS} <= names
+
+        # Τα υπάρχοντα δεδομένα μένουν ως είχαν και μπαίνουν στο index
+        columns = [r[1] for r in conn.execute("PRAGMA table_info(members)")]
+        assert {"lodge_reg_no", "grand_lodge_reg_no", "afm"} <= set(columns)
+        after = conn.execute(f"SELECT {', '.join(columns[:len(members[0])])} FROM members ORDER BY member_id")
+        assert after.fetchall() == members
+        assert conn.execute("SELECT COUNT(*) FROM members_fts").fetchone()[0] == len(members)
+        fts = [r[1] for r in conn.execute("PRAGMA table_info(members_fts)")]
+        assert tuple(fts) == FTS_COLUMNS
+
+        # Ενημερωμένη βάση: κανένα DDL
+        before = _schema(conn)
+        assert migrate(conn) == []
+        assert _schema(conn) == before
+
+
+def test_partially_migrated_database_resumes(db_path):
+    with get_pool(db_path).connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for version, _, apply in MIGRATIONS[:5]:
+            apply(conn)
+        conn.execute("PRAGMA user_version = 5")
+        conn.commit()
+
+        assert migrate(conn) == [v for v, _, _ in MIGRATIONS[5:]]
+        assert schema_version(conn) == SCHEMA_VERSION
+
+
+def test_database_opens_baseline_file(db_path):
+    db = Database(db_path)
+    assert db.count_members() > 0
+    with db.connection() as conn:
+        assert schema_version(conn) == SCHEMA_VERSION
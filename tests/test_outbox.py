@@ -0,0 +1,135 @@
+"""email_outbox: dedupe, claim, retry/backoff, μόνιμη αποτυχία"""
+
+import smtplib
+
+from modules.email import DeliveryEngine, Outbox, is_permanent_error
+
+
+class FailingSender:
+    """SMTPSender που απορρίπτει κάθε παραλήπτη με τον ίδιο κωδικό"""
+
+    def __init__(self, code: int):
+        self.code = code
+
+    def send(self, to_email, data):
+        raise smtplib.SMTPRecipientsRefused({to_email: (self.code, b"refused")})
+
+    def close(self):
+        pass
+
+
+def _status(outbox, outbox_id):
+    return {row[0]: row for row in outbox.recent(limit=50)}[outbox_id]
+
+
+def test_enqueue_skips_duplicate_dedupe_keys(db_path):
+    outbox = Outbox(db_path)
+    first = outbox.enqueue([
+        ("a@example.org", "s", "b", "task:1:2026-10-17"),
+        ("a@example.org", "s", "b"),
+    ], kind="task_reminder")
+    again = outbox.enqueue([
+        ("a@example.org", "s", "b", "task:1:2026-10-17"),
+        ("a@example.org", "s", "b", "task:1:2026-10-18"),
+        ("a@example.org", "s", "b"),
+    ], kind="task_reminder")
+    assert all(first)
+    assert again[0] is None and again[1] and again[2]
+    assert outbox.stats() == {"pending": 4}
+
+
+def test_claim_locks_messages(db_path):
+    outbox = Outbox(db_path)
+    outbox.enqueue([(f"m{n}@example.org", "s", "b") for n in range(3)])
+    claimed = outbox.claim(2)
+    assert [item[4] for item in claimed] == [1, 1]  # attempts
+    assert len(outbox.claim(10)) == 1
+    assert outbox.claim(10) == []
+    assert outbox.stats() == {"sending": 3}
+
+
+def test_retry_later_and_release(db_path):
+    outbox = Outbox(db_path)
+    first, second = outbox.enqueue([("a@example.org", "s", "b"), ("b@example.org", "s", "b")])
+    outbox.claim(2)
+    outbox.retry_later(first, "451", delay_seconds=600)
+    outbox.release([second], "535", delay_seconds=600)
+    assert outbox.due_count() == 0
+    assert _status(outbox, first)[4:6] == ("pending", 1)
+    assert _status(outbox, second)[4:6] == ("pending", 0)  # release δεν μετράει προσπάθεια
+
+
+def test_requeue_stale(db_path):
+    outbox = Outbox(db_path)
+    outbox.enqueue([("a@example.org", "s", "b")])
+    outbox.claim(1)
+    assert outbox.requeue_stale(older_than_minutes=0) == 1
+    assert outbox.due_count() == 1
+
+
+def test_transient_errors_fail_after_max_attempts(db_path):
+    outbox = Outbox(db_path)
+    (outbox_id,) = outbox.enqueue([("a@example.org", "s", "b")])
+    engine = DeliveryEngine({'sender_email': "lodge@example.org"}, outbox, max_attempts=3, backoff_base=0)
+    sender = FailingSender(451)
+    for _ in range(3):
+        (item,) = outbox.claim(1)
+        assert engine.deliver(sender, item) is False
+    assert _status(outbox, outbox_id)[4:6] == ("failed", 3)
+    assert (engine.retried, engine.failed) == (2, 1)
+    assert outbox.claim(1) == []
+
+
+def test_permanent_recipient_error_fails_immediately(db_path):
+    outbox = Outbox(db_path)
+    (outbox_id,) = outbox.enqueue([("a@example.org", "s", "b")])
+    engine = DeliveryEngine({'sender_email': "lodge@example.org"}, outbox)
+    (item,) = outbox.claim(1)
+    engine.deliver(FailingSender(550), item)
+    assert _status(outbox, outbox_id)[4:6] == ("failed", 1)
+
+
+def test_error_classification():
+    assert is_permanent_error(smtplib.SMTPRecipientsRefused({"a": (550, b"no")}))
+    assert not is_permanent_error(smtplib.SMTPRecipientsRefused({"a": (451, b"later")}))
+    assert is_permanent_error(smtplib.SMTPDataError(554, b"rejected"))
+    assert not is_permanent_error(smtplib.SMTPDataError(452, b"full"))
+    assert not is_permanent_error(smtplib.SMTPAuthenticationError(535, b"bad credentials"))
+    assert not is_permanent_error(smtplib.SMTPSenderRefused(553, b"no", "lodge@example.org"))
+
+
+def test_backoff_grows_and_is_capped(db_path):
+    engine = DeliveryEngine({}, Outbox(db_path), backoff_base=30, backoff_max=300)
+    delays = [engine.backoff(n) for n in range(1, 7)]
+    assert 30 <= delays[0] <= 33 and 60 <= delays[1] <= 66
+    assert all(300 <= d <= 330 for d in delays[4:])
+
+
+def test_retry_failed_requeues_only_failed_messages(db_path):
+    outbox = Outbox(db_path)
+    failed_id, sent_id = outbox.enqueue([("a@example.org", "s", "b", "k1"), ("b@example.org", "s", "b", "k2")])
+    outbox.claim(2)
+    outbox.mark_failed(failed_id, "550")
+    outbox.mark_sent(sent_id)
+
+    assert outbox.enqueue([("a@example.org", "s", "b", "k1")]) == [None]
+    again = outbox.enqueue([("a@example.org", "s2", "b2", "k1"), ("b@example.org", "s", "b", "k2")], retry_failed=True)
+    assert again == [failed_id, None]
+    assert _status(outbox, failed_id)[3:6] == ("s2", "pending", 0)
+    assert _status(outbox, sent_id)[4] == "sent"
+
+
+def test_meeting_reminder_dedupes_on_content(db_path, monkeypatch):
+    from modules.email import DeliveryEngine as Engine, EmailManager
+
+    monkeypatch.setattr(Engine, "wake", lambda self: None)  # χωρίς αποστολή
+    manager = EmailManager({'sender_email': "lodge@example.org"}, db_path=db_path)
+    emails = ["a@example.org", "b@example.org"]
+
+    first = manager.send_meeting_reminder(emails, "20/10/2026", "Εκλογές")
+    assert [ok for _, ok, _ in first] == [True, True]
+    repeat = manager.send_meeting_reminder(emails, "20/10/2026", "Εκλογές")
+    assert repeat == [(email, False, "already queued/sent") for email in emails]
+    corrected = manager.send_meeting_reminder(emails, "20/10/2026", "Εκλογές και Προϋπολογισμός")
+    assert [ok for _, ok, _ in corrected] == [True, True]
+    assert manager.engine.outbox.stats() == {"pending": 4}
@@ -0,0 +1,56 @@
+"""Database.query_members: keyset pagination (after=) ανά MEMBER_SORT_KEYS"""
+
+import pytest
+
+from modules.database import MEMBER_SORT_KEYS, Database
+
+
+@pytest.fixture
+def db(db_path):
+    return Database(db_path)
+
+
+def _walk(db, filters=None, sort="name", page_size=3):
+    """Όλες οι σελίδες, με cursor τα κλειδιά της τελευταίας γραμμής"""
+    keys = MEMBER_SORT_KEYS[sort]
+    pages, after = [], None
+    while True:
+        page = db.query_members(filters, sort=sort, limit=page_size, after=after)
+        if page.empty:
+            return pages
+        pages.append([int(x) for x in page["member_id"]])
+        last = page.iloc[-1]
+        after = tuple(last[k] for k in keys)
+
+
+@pytest.mark.parametrize("sort", ["name", "id"])
+def test_pages_cover_every_member_once_in_order(db, sort):
+    # Ίδιο επώνυμο/όνομα σε πολλά μέλη: η σειρά κρίνεται από το member_id
+    ids = [int(x) for x in db.get_all_members()["member_id"]]
+    db.bulk_set_field(ids[:5], "last_name", "ΙΔΙΟΣ")
+    db.bulk_set_field(ids[:4], "first_name", "ΙΔΙΟΣ")
+
+    pages = _walk(db, sort=sort)
+    walked = [mid for page in pages for mid in page]
+    expected = [int(x) for x in db.query_members(sort=sort)["member_id"]]
+
+    assert walked == expected
+    assert len(walked) == len(set(walked)) == db.count_members()
+    assert all(len(page) == 3 for page in pages[:-1])
+
+
+def test_pages_respect_filters(db):
+    ids = [int(x) for x in db.get_all_members()["member_id"]]
+    db.bulk_set_field(ids[::2], "member_status", "Αδρανές")
+    filters = {"member_status": "Αδρανές"}
+
+    walked = [mid for page in _walk(db, filters, page_size=2) for mid in page]
+    assert sorted(walked) == sorted(ids[::2])
+    assert len(walked) == db.count_members(filters)
+
+
+def test_invalid_cursor(db):
+    with pytest.raises(ValueError):
+        db.query_members(sort="name", limit=3, after=("ΑΛΕΞΗΣ",))
+    with pytest.raises(ValueError):
+        db.query_members({"search": "αλεξ"}, sort="relevance", limit=3, after=("ΑΛΕΞΗΣ", "Α", 1))
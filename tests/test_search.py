@@ -0,0 +1,57 @@
+"""Database.search_members: FTS με κανονικοποίηση τόνων και LIKE fallback"""
+
+import pytest
+
+from modules.database import Database
+
+
+@pytest.fixture
+def db(db_path):
+    return Database(db_path)
+
+
+def test_like_fallback_does_not_share_cache_between_terms(db):
+    db._fts_enabled = False
+    upper = db.search_members("ΑΛΕΞΗΣ")
+    assert "ΑΛΕΞΗΣ" in set(upper["last_name"])
+
+    # Ίδιο FTS match, αλλά το LIKE δεν αγνοεί πεζά/τόνους στα Ελληνικά
+    lower = db.search_members("αλέξης")
+    assert "ΑΛΕΞΗΣ" not in set(lower["last_name"])
+
+
+def _ids(frame):
+    return set(int(x) for x in frame["member_id"])
+
+
+def test_search_ignores_accents_case_and_final_sigma(db):
+    (member_id, action, _), = db.upsert_members([
+        {"last_name": "ΠΑΠΑΔΟΠΟΎΛΟΣ", "first_name": "Ιωάννης", "city": "Ναύπλιο"}
+    ])
+    assert action == "insert"
+
+    for term in ("παπαδοπουλος", "Παπαδόπουλος", "ΠΑΠΑΔΟΠΟΥΛΟΣ", "παπαδοπουλοσ", "παπαδ"):
+        assert member_id in _ids(db.search_members(term)), term
+    assert member_id in _ids(db.search_members("ιωαν ναυπλ"))
+    assert member_id not in _ids(db.search_members("ιωαν πατρα"))
+
+
+def test_fts_index_follows_updates_and_deletes(db):
+    member_id = int(db.get_all_members().iloc[0]["member_id"])
+    assert member_id not in _ids(db.search_members("ΞΥΛΟΚΑΣΤΡΟ"))
+
+    db.update_member(member_id, {"city": "Ξυλόκαστρο"})
+    assert member_id in _ids(db.search_members("ξυλοκαστρο"))
+
+    db.update_member(member_id, {"city": "Κόρινθος"})
+    assert member_id not in _ids(db.search_members("ξυλοκαστρο"))
+    assert member_id in _ids(db.search_members("ΚΟΡΙΝΘΟΣ"))
+
+    with db.connection() as conn:
+        conn.execute("DELETE FROM members WHERE member_id = ?", (member_id,))
+    db._invalidate([member_id])
+    assert member_id not in _ids(db.search_members("κορινθος"))
+    with db.connection() as conn:
+        indexed = conn.execute("SELECT COUNT(*) FROM members_fts").fetchone()[0]
+        members = conn.execute("SELECT COUNT(*) FROM members").fetchone()[0]
+    assert indexed == members
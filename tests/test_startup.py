@@ -0,0 +1,16 @@
+"""Οι βαριές βιβλιοθήκες δεν φορτώνονται στο άνοιγμα των σελίδων"""
+
+import pytest
+
+from benchmarks.startup import DEFERRED, measure
+
+
+@pytest.mark.parametrize("entry", sorted(DEFERRED))
+def test_heavy_imports_are_deferred(entry, db_path):
+    # Μετράει ό,τι φορτώνει η σελίδα μετά το streamlit· ένα package που
+    # φέρνει ήδη το ίδιο το streamlit (π.χ. plotly σε νεότερες εκδόσεις)
+    # δεν κοστίζει τίποτα στη σελίδα και δεν εμφανίζεται εδώ
+    result = measure(entry, workdir=db_path.rsplit("/", 1)[0])
+    assert "error" not in result, result.get("error")
+    loaded = [package for package in DEFERRED[entry] if package in result["packages"]]
+    assert not loaded, f"{entry} imports {', '.join(loaded)} at startup"
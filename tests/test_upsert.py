@@ -0,0 +1,51 @@
+"""Database.upsert_members: κανονικοποίηση κλειδιών, διπλότυπα, unchanged"""
+
+import pytest
+
+from modules.database import Database
+
+
+@pytest.fixture
+def db(db_path):
+    return Database(db_path)
+
+
+def _member(db, member_id):
+    return db.get_member_by_id(member_id)
+
+
+def test_numeric_natural_key_matches_stored_text(db):
+    assert "tax_id" in db.upsert_keys()
+    member_id = int(db.get_all_members().iloc[0]["member_id"])
+    db.update_member(member_id, {"tax_id": "12345678"})
+    count = db.count_members()
+
+    results = db.upsert_members([{"tax_id": 12345678, "city": "ΧΑΝΙΑ"}], key="tax_id")
+    assert results == [(member_id, "update", "OK")]
+    results = db.upsert_members([{"tax_id": 12345678.0, "city": "ΧΑΝΙΑ"}], key="tax_id")
+    assert results[0][:2] == (member_id, "update")
+    assert db.count_members() == count
+    assert _member(db, member_id)["city"] == "ΧΑΝΙΑ"
+
+
+def test_string_member_id_matches(db):
+    member_id = int(db.get_all_members().iloc[0]["member_id"])
+    assert db.upsert_members([{"member_id": str(member_id), "city": "ΒΟΛΟΣ"}])[0] == (member_id, "update", "OK")
+
+
+def test_rows_without_key_are_not_inserted_twice(db):
+    row = {"last_name": "ΝΕΟΣ", "first_name": "ΜΕΛΟΣ", "fathers_name": "ΓΕΩΡΓΙΟΣ"}
+    count = db.count_members()
+    (first,) = db.upsert_members([dict(row)])
+    assert first[1] == "insert"
+
+    again = db.upsert_members([dict(row), {**row, "first_name": "ΑΛΛΟΣ"}, {**row, "first_name": "ΑΛΛΟΣ"}])
+    assert again[0] == (first[0], None, f"Υπάρχει ήδη μέλος με ίδια στοιχεία (#{first[0]})")
+    assert again[1][1] == "insert"
+    assert again[2][1] is None
+    assert db.count_members() == count + 2
+
+
+def test_row_without_changes_is_unchanged(db):
+    member_id = int(db.get_all_members().iloc[0]["member_id"])
+    assert db.upsert_members([{"member_id": member_id}]) == [(member_id, "unchanged", "Καμία αλλαγή")]